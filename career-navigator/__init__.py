@@ -4,5 +4,6 @@ from .orchestrator import Orchestrator
 from .skill_assessor import SkillAssessor
 from .recommender import Recommender
 from .monitor import Monitor
+from .pipeline import PipelineContext
 
-__all__ = ['Orchestrator', 'SkillAssessor', 'Recommender', 'Monitor']
+__all__ = ['Orchestrator', 'SkillAssessor', 'Recommender', 'Monitor', 'PipelineContext']
@@ -13,19 +13,32 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import custom modules
-from models import db, User, Resume, Plan, DailyProgress, Progress
-from resume_parser import parse_txt_resume, parse_pdf_resume
+from models import db, User, Resume, ResumeJob, IngestJob, Plan, DailyProgress, Progress
 from planner import generate_daily_plan
+import plan_store
+from plan_store import store_plan
+from db_migrations import ensure_schema
+from db_config import engine_options, configure_engine
+import tech_catalog
+from tech_monitor import get_catalog
 from tech_monitor import detect_new_technologies, should_update_plan, generate_tech_recommendations, get_technology_update_summary
 from email_service import mail, send_daily_reminder_email, send_tech_update_alert_email, send_plan_update_confirmation_email
 # Agents orchestrator
 from agents.orchestrator import Orchestrator
+from agents.pipeline import span_stats
 # Background task scheduler
 from task_scheduler import TaskScheduler
-from security_utils import sanitize_text, sanitize_list, verify_hmac_signature
+import leader_election
+from job_scheduler import JobScheduler, prune_runs, recent_runs
+from security_utils import verify_hmac_signature
 from security_utils import verify_api_key
+from batch_ingest import process_ingest_job
+import parse_cache
+import suggestion_cache
+from resume_jobs import ResumeJobQueue
 import json
 import base64
+import tempfile
 
 app = Flask(__name__)
 
@@ -33,8 +46,30 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', '8901c3ae8e48810b721c0e71c01d386dfe38b458')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///career_navigator.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite PRAGMAs / connection pool settings (see db_config)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Parse uploads in a background worker pool instead of inside the request
+app.config['RESUME_ASYNC_PARSING'] = os.getenv('RESUME_ASYNC_PARSING', 'False').lower() == 'true'
+# 'materialized' stores every day; 'derived' (opt-in) stores only touched days (see plan_store)
+app.config['PLAN_STORAGE_MODE'] = os.getenv('PLAN_STORAGE_MODE', 'materialized').lower()
+# Default and maximum page size for /api/plan/<id>/all-tasks
+app.config['TASKS_PAGE_SIZE'] = int(os.getenv('TASKS_PAGE_SIZE', 20))
+app.config['TASKS_PAGE_SIZE_MAX'] = int(os.getenv('TASKS_PAGE_SIZE_MAX', 200))
+# How often each worker checks for technology catalog updates (see tech_catalog)
+app.config['TECH_CATALOG_REFRESH_SECONDS'] = int(os.getenv('TECH_CATALOG_REFRESH_SECONDS', 30))
+# Run each background loop in one process per deployment (see leader_election)
+app.config['SCHEDULER_LEADER_ELECTION'] = os.getenv('SCHEDULER_LEADER_ELECTION', 'True').lower() == 'true'
+app.config['SCHEDULER_LEASE_SECONDS'] = int(os.getenv('SCHEDULER_LEASE_SECONDS', 30))
+# Background job worker threads, queued runs and run history retention
+app.config['JOB_SCHEDULER_WORKERS'] = int(os.getenv('JOB_SCHEDULER_WORKERS', 4))
+app.config['JOB_SCHEDULER_QUEUE_SIZE'] = int(os.getenv('JOB_SCHEDULER_QUEUE_SIZE', 16))
+app.config['JOB_RUN_RETENTION_DAYS'] = int(os.getenv('JOB_RUN_RETENTION_DAYS', 30))
+# Agent suggestions cache (see suggestion_cache) and background precomputation
+app.config['SUGGESTION_CACHE_TTL'] = int(os.getenv('SUGGESTION_CACHE_TTL', 300))
+app.config['SUGGESTION_PRECOMPUTE_LIMIT'] = int(os.getenv('SUGGESTION_PRECOMPUTE_LIMIT', 500))
+app.config['SUGGESTION_ACTIVE_HOURS'] = int(os.getenv('SUGGESTION_ACTIVE_HOURS', 24))
 # Session cookie hardening
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
@@ -57,6 +92,8 @@ if not os.path.exists(app.config['UPLOAD_FOLDER']):
 
 # Initialize database
 db.init_app(app)
+with app.app_context():
+    configure_engine(db.engine)
 
 # Initialize Flask-Mail for email notifications
 mail.init_app(app)
@@ -93,18 +130,51 @@ def set_security_headers(response):
     return response
 
 
-# Create a global orchestrator instance; started on first request
+@app.before_request
+def refresh_tech_catalog():
+    # One version lookup per interval; reloads only when the catalog changed
+    tech_catalog.maybe_refresh(app.config['TECH_CATALOG_REFRESH_SECONDS'])
+
+
+# Every periodic background job runs on this scheduler (see job_scheduler)
+background_jobs = JobScheduler(
+    app,
+    workers=app.config['JOB_SCHEDULER_WORKERS'],
+    queue_size=app.config['JOB_SCHEDULER_QUEUE_SIZE'],
+    lease_ttl=app.config['SCHEDULER_LEASE_SECONDS'] if app.config['SCHEDULER_LEADER_ELECTION'] else None
+)
+
+# Create a global orchestrator instance; its trend check runs as a job
 orchestrator = Orchestrator(poll_interval=int(os.getenv('AGENT_POLL_INTERVAL', '60')))
+orchestrator.register_jobs(background_jobs, jitter=5, timeout=30,
+                           precompute_limit=app.config['SUGGESTION_PRECOMPUTE_LIMIT'],
+                           active_within=app.config['SUGGESTION_ACTIVE_HOURS'] * 3600)
+suggestion_cache.configure(app.config['SUGGESTION_CACHE_TTL'])
 
 # Create task scheduler for background plan update checks
-task_scheduler = TaskScheduler(app, interval=int(os.getenv('TASK_SCHEDULER_INTERVAL', '3600')))
+task_scheduler = TaskScheduler(app, interval=int(os.getenv('TASK_SCHEDULER_INTERVAL', '3600')),
+                               jitter=60, timeout=int(os.getenv('TASK_SCHEDULER_TIMEOUT', '1800')))
+task_scheduler.register_jobs(background_jobs)
+
+# Keep the run history table bounded
+background_jobs.register('prune_job_runs', lambda: prune_runs(app.config['JOB_RUN_RETENTION_DAYS']), 86400)
+
+# Worker pool for asynchronous resume parsing (RESUME_ASYNC_PARSING)
+resume_job_queue = ResumeJobQueue(app, workers=int(os.getenv('RESUME_JOB_WORKERS', '2')))
+
+# Bulk imports from /api/admin/ingest-resumes, one at a time (each starts its own process pool).
+# An import interrupted by a restart has committed part of its rows, so it is failed, not re-run.
+ingest_job_queue = ResumeJobQueue(app, workers=1, stale_after=int(os.getenv('INGEST_JOB_STALE_SECONDS', '21600')),
+                                  process=process_ingest_job, model=IngestJob, requeue_stale=False)
 
 
 def _start_background_services():
     """Start background services on app startup."""
     try:
-        orchestrator.start()
-        task_scheduler.start()
+        background_jobs.start()
+        if app.config['RESUME_ASYNC_PARSING']:
+            resume_job_queue.start()
+        ingest_job_queue.start()
     except Exception as e:
         app.logger.error(f"Error starting background services: {e}")
 
@@ -112,6 +182,9 @@ def _start_background_services():
 # For Flask 2.0+, use app context instead of before_first_request
 with app.app_context():
     db.create_all()
+    ensure_schema(db.engine, db.metadata)
+    tech_catalog.seed_catalog()
+    tech_catalog.refresh(force=True)
     # Start services after app context is ready
     _start_background_services()
 
@@ -324,35 +397,37 @@ def upload_resume():
         # Get current user
         user = current_user
         
-        # Save file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Parse resume based on file type
-        file_ext = filename.rsplit('.', 1)[1].lower()
-        if file_ext == 'pdf':
-            parsed_data = parse_pdf_resume(filepath)
-        else:
-            parsed_data = parse_txt_resume(filepath)
-        
+        # Save file (content-addressed: identical uploads are stored once)
+        file_ext = file.filename.rsplit('.', 1)[1].lower()
+        content_hash, filepath = parse_cache.store_upload(file, app.config['UPLOAD_FOLDER'], file_ext)
+
+        if app.config['RESUME_ASYNC_PARSING']:
+            # Queue parsing and return immediately; poll /api/resume-jobs/<id> for the result
+            job = ResumeJob(
+                user_id=user.id,
+                filename=file.filename,
+                file_path=filepath,
+                content_hash=content_hash,
+                file_ext=file_ext
+            )
+            db.session.add(job)
+            db.session.commit()
+            resume_job_queue.submit(job.id)
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': url_for('get_resume_job', job_id=job.id)
+            }), 202
+
+        # Parse resume based on file type, reusing the cached result for known content
+        parsed_data, _cache_hit = parse_cache.get_or_parse(content_hash, filepath, file_ext)
+
         # Save resume to database
-        # Sanitize parsed text fields before saving to DB to avoid any injected HTML
-        sanitized_skills = sanitize_list(parsed_data.get('skills', []))
-        resume = Resume(
-            user_id=user.id,
-            filename=file.filename,
-            file_path=filepath,
-            skills=sanitized_skills,
-            experience_level=sanitize_text(parsed_data.get('experience_level', 'beginner')),
-            years_of_experience=int(parsed_data.get('years_of_experience', 0) or 0),
-            current_role=sanitize_text(parsed_data.get('current_role', 'Not specified')),
-            education=sanitize_text(parsed_data.get('education', 'Not specified'))
-        )
+        resume = Resume.from_parsed_data(user.id, file.filename, filepath, parsed_data)
         db.session.add(resume)
         db.session.commit()
+        suggestion_cache.invalidate(user.id)
         
         session['user_id'] = user.id
         session['resume_id'] = resume.id
@@ -368,6 +443,45 @@ def upload_resume():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route("/api/resume-jobs/<int:job_id>", methods=['GET'])
+@login_required
+def get_resume_job(job_id):
+    """Report the status of an asynchronous resume parsing job"""
+    try:
+        job = ResumeJob.query.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        if job.user_id != current_user.id:
+            return jsonify({'error': 'Unauthorized'}), 403
+
+        result = {
+            'job_id': job.id,
+            'status': job.status,
+            'filename': job.filename,
+            'created_at': job.created_at.isoformat(),
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None
+        }
+        if job.status == 'completed':
+            resume = Resume.query.get(job.resume_id)
+            session['resume_id'] = resume.id
+            result['resume_id'] = resume.id
+            result['parsed_data'] = {
+                'skills': resume.skills or [],
+                'years_of_experience': resume.years_of_experience,
+                'education': resume.education,
+                'current_role': resume.current_role,
+                'experience_level': resume.experience_level
+            }
+        elif job.status == 'failed':
+            result['error'] = job.error
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route("/api/create-plan", methods=['POST'])
 @login_required
 @csrf.exempt
@@ -399,46 +513,24 @@ def create_plan():
             experience_level=resume.experience_level
         )
         
-        # Create plan record
+        # Plan, daily rows and progress tracker are written in one transaction
         start_date = datetime.now()
         end_date = start_date + timedelta(days=plan_content['total_days'])
-        
-        plan = Plan(
+        plan_id = store_plan(
             user_id=user.id,
             resume_id=resume.id,
             goal=goal,
             duration_months=duration_months,
+            plan_content=plan_content,
             start_date=start_date,
-            end_date=end_date,
-            daily_tasks=plan_content['daily_tasks'],
-            milestones=plan_content['milestones'],
-            technologies=plan_content['technologies']
+            experience_level=resume.experience_level,
+            storage_mode=app.config['PLAN_STORAGE_MODE']
         )
-        db.session.add(plan)
-        db.session.commit()
-        
-        # Create daily progress records
-        for task in plan_content['daily_tasks']:
-            planned_date = start_date + timedelta(days=task['day'])
-            daily_progress = DailyProgress(
-                plan_id=plan.id,
-                day_number=task['day'],
-                task=task['task'],
-                planned_date=planned_date
-            )
-            db.session.add(daily_progress)
-        
-        # Create progress tracker
-        progress = Progress(
-            user_id=user.id,
-            total_days_planned=plan_content['total_days']
-        )
-        db.session.add(progress)
-        db.session.commit()
+        suggestion_cache.invalidate(user.id)
         
         return jsonify({
             'success': True,
-            'plan_id': plan.id,
+            'plan_id': plan_id,
             'plan_data': {
                 'goal': goal,
                 'duration_months': duration_months,
@@ -459,8 +551,9 @@ def agent_suggestions():
     """Get personalized learning suggestions from the orchestrator."""
     try:
         user = current_user
-        suggestions = orchestrator.get_suggestions_for_user(user.id)
-        return jsonify({'success': True, 'suggestions': suggestions}), 200
+        # Usually precomputed by the orchestrator; computed and stored on a miss
+        suggestions, cached = suggestion_cache.get_or_compute(user.id, orchestrator.get_suggestions_for_user)
+        return jsonify({'success': True, 'suggestions': suggestions, 'cached': cached}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -488,6 +581,7 @@ def agent_apply_update():
             'new_technologies': new_technologies
         }
         result = orchestrator.apply_update(user.id, update_payload)
+        suggestion_cache.invalidate(user.id)
         return jsonify({'success': True, 'result': result}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -553,11 +647,258 @@ def admin_list_users():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+@app.route('/api/admin/parse-cache', methods=['GET'])
+@csrf.exempt
+def admin_parse_cache_stats():
+    """Admin endpoint: resume parse cache hit/miss counters (protected by API key)."""
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+        return jsonify({'success': True, 'parse_cache': parse_cache.stats()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/suggestion-cache', methods=['GET'])
+@csrf.exempt
+def admin_suggestion_cache_stats():
+    """Admin endpoint: agent suggestion cache counters (protected by API key)."""
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+        return jsonify({'success': True, 'suggestion_cache': suggestion_cache.stats()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/agent-timings', methods=['GET'])
+@csrf.exempt
+def admin_agent_timings():
+    """Admin endpoint: time spent per agent step in this process (protected by API key)."""
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+        return jsonify({'success': True, 'agent_timings': span_stats()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/scheduler-leases', methods=['GET'])
+@csrf.exempt
+def admin_scheduler_leases():
+    """Admin endpoint: background job leaders, run durations and scan rows saved (protected by API key)."""
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+        return jsonify({'success': True, 'leases': leader_election.metrics()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/jobs', methods=['GET'])
+@csrf.exempt
+def admin_jobs():
+    """Admin endpoint: background job counters and recent run history (protected by API key).
+
+    Query parameters: `job` (optional) to filter the history, `limit` (default 20, max 200).
+    """
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+        return jsonify({
+            'success': True,
+            'jobs': background_jobs.stats(),
+            'runs': recent_runs(request.args.get('job'), limit)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/assess-users', methods=['POST'])
+@csrf.exempt
+def admin_assess_users():
+    """Admin endpoint: skill assessments for a cohort of users (protected by API key).
+
+    JSON body: `user_ids` (up to 10000). Returns each assessment plus counts
+    by proficiency level.
+    """
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+
+        user_ids = (request.get_json(silent=True) or {}).get('user_ids')
+        if not isinstance(user_ids, list) or not all(isinstance(uid, int) for uid in user_ids):
+            return jsonify({'error': 'user_ids must be a list of integers'}), 400
+        if len(user_ids) > 10000:
+            return jsonify({'error': 'At most 10000 user_ids per request'}), 400
+
+        assessments = orchestrator.skill_assessor.assess_users(user_ids)
+        levels = {}
+        for assessment in assessments.values():
+            level = assessment['proficiency_estimate']
+            levels[level] = levels.get(level, 0) + 1
+        return jsonify({
+            'success': True,
+            'total_users': len(assessments),
+            'by_proficiency': levels,
+            'assessments': {str(uid): assessment for uid, assessment in assessments.items()}
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/ingest-resumes', methods=['POST'])
+@csrf.exempt
+def admin_ingest_resumes():
+    """Admin endpoint: queue a bulk import of an archive of resumes (protected by API key).
+
+    Multipart form fields:
+    - `archive`: .zip or .tar(.gz) of .pdf/.txt resumes
+    - `user_id`: assign every resume to this user, or
+    - `match_email=true`: file name (without extension) is the owner's email
+    - `workers` (optional): number of parser processes
+
+    Returns 202 with a `status_url`; the import runs on the ingest job queue.
+    Archives larger than MAX_CONTENT_LENGTH should be imported with `python batch_ingest.py`.
+    """
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+
+        archive = request.files.get('archive')
+        if not archive or archive.filename == '':
+            return jsonify({'error': 'No archive provided'}), 400
+
+        user_id = request.form.get('user_id', type=int)
+        match_email = request.form.get('match_email', 'false').lower() == 'true'
+        if user_id is None and not match_email:
+            return jsonify({'error': 'Provide user_id or match_email=true'}), 400
+        if user_id is not None and not User.query.get(user_id):
+            return jsonify({'error': 'User not found'}), 404
+
+        # Kept in its own directory until the job has run (process_ingest_job removes it)
+        ingest_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'ingest')
+        os.makedirs(ingest_dir, exist_ok=True)
+        archive_path = os.path.join(tempfile.mkdtemp(dir=ingest_dir), secure_filename(archive.filename) or 'archive')
+        archive.save(archive_path)
+
+        job = IngestJob(
+            archive_path=archive_path,
+            user_id=user_id,
+            match_email=match_email,
+            workers=request.form.get('workers', type=int)
+        )
+        db.session.add(job)
+        db.session.commit()
+        ingest_job_queue.submit(job.id)
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': url_for('admin_ingest_job', job_id=job.id)
+        }), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/ingest-jobs/<int:job_id>', methods=['GET'])
+def admin_ingest_job(job_id):
+    """Admin endpoint: status of a bulk import, with its stats once completed (protected by API key)."""
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+
+        job = IngestJob.query.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        result = {
+            'job_id': job.id,
+            'status': job.status,
+            'created_at': job.created_at.isoformat(),
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None
+        }
+        if job.status == 'completed':
+            result['stats'] = job.stats
+        elif job.status == 'failed':
+            result['error'] = job.error
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/repair-plan-counters', methods=['POST'])
+@csrf.exempt
+def admin_repair_plan_counters():
+    """Admin endpoint: recompute every plan's progress counters (protected by API key)."""
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+        repaired = plan_store.repair_plan_counters()
+        db.session.commit()
+        return jsonify({'success': True, 'plans_repaired': repaired}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/tech-catalog', methods=['POST'])
+@csrf.exempt
+def admin_update_tech_catalog():
+    """Admin endpoint: add, update or remove trending technologies (protected by API key).
+
+    JSON body:
+    - `technologies`: [{"name", "category", "relevance", "professions"}, ...] to insert or update
+    - `remove` (optional): names to delete
+
+    Every worker picks up the change within TECH_CATALOG_REFRESH_SECONDS.
+    """
+    try:
+        api_key = os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')
+        if not verify_api_key(dict(request.headers), api_key):
+            return jsonify({'error': 'Unauthorized: invalid or missing API key'}), 401
+
+        data = request.get_json(silent=True) or {}
+        technologies = data.get('technologies', [])
+        remove = data.get('remove', [])
+        if not isinstance(technologies, list) or not isinstance(remove, list):
+            return jsonify({'error': 'technologies and remove must be lists'}), 400
+        for tech in technologies:
+            if not isinstance(tech, dict) or not isinstance(tech.get('name'), str) or not tech['name'].strip():
+                return jsonify({'error': 'Each technology needs a name'}), 400
+            if 'relevance' in tech and not isinstance(tech['relevance'], (int, float)):
+                return jsonify({'error': f"Invalid relevance for {tech['name']}"}), 400
+            if 'professions' in tech and not isinstance(tech['professions'], list):
+                return jsonify({'error': f"professions must be a list for {tech['name']}"}), 400
+
+        version = tech_catalog.upsert_technologies(technologies, remove)
+        return jsonify({
+            'success': True,
+            'version': version,
+            'total_technologies': len(get_catalog())
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route("/api/plan/<int:plan_id>")
 @login_required
 def get_plan(plan_id):
-    """Get plan details with daily tasks"""
+    """Get plan details with daily tasks (`fields=` selects task fields)"""
     try:
+        fields = _task_fields(('id', 'day', 'task', 'completed', 'date', 'hours_spent', 'notes'))
         plan = Plan.query.get(plan_id)
         if not plan:
             return jsonify({'error': 'Plan not found'}), 404
@@ -565,12 +906,9 @@ def get_plan(plan_id):
         if plan.user_id != current_user.id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Get all daily tasks for this plan
-        daily_tasks = DailyProgress.query.filter_by(plan_id=plan_id).all()
-        
         # Calculate progress
-        completed_tasks = sum(1 for task in daily_tasks if task.is_completed)
-        total_tasks = len(daily_tasks)
+        completed_tasks = plan_store.completed_count(plan)
+        total_tasks = plan_store.day_count(plan)
         completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         return jsonify({
@@ -586,28 +924,47 @@ def get_plan(plan_id):
                 'completed_days': completed_tasks,
                 'completion_percentage': completion_percentage
             },
-            'daily_tasks': [{
-                'id': task.id,
-                'day': task.day_number,
-                'task': task.task,
-                'completed': task.is_completed,
-                'date': task.planned_date.isoformat(),
-                'hours_spent': task.hours_spent,
-                'notes': task.notes
-            } for task in daily_tasks[:30]]  # Return first 30 tasks
+            'daily_tasks': plan_store.plan_days(plan, 0, 30, fields)  # Return first 30 tasks
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _task_fields(default):
+    """Task fields requested with `fields=a,b,c`; 'day' is always included."""
+    requested = request.args.get('fields')
+    if not requested:
+        return default
+    fields = [f.strip() for f in requested.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in plan_store.DAY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown task fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(['day'] + fields))
+
+
 @app.route("/api/plan/<int:plan_id>/all-tasks")
 @login_required
 def get_all_tasks(plan_id):
-    """Get all daily tasks for a plan (paginated)"""
+    """Get daily tasks for a plan, one page at a time.
+
+    Query parameters:
+    - `after_day`: return days after this day number (cursor; use `next_after_day` from the previous page)
+    - `page`: page number, when `after_day` is not given (default 1)
+    - `limit`: page size (default TASKS_PAGE_SIZE, capped at TASKS_PAGE_SIZE_MAX)
+    - `fields`: comma-separated task fields, e.g. `id,day,completed`
+    """
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = 20
+        limit = request.args.get('limit', app.config['TASKS_PAGE_SIZE'], type=int)
+        limit = min(max(limit, 1), app.config['TASKS_PAGE_SIZE_MAX'])
+        after_day = request.args.get('after_day', type=int)
+        page = None
+        if after_day is None:
+            page = max(request.args.get('page', 1, type=int), 1)
+            after_day = (page - 1) * limit  # Days are numbered 1..N without gaps
+        fields = _task_fields(plan_store.DAY_FIELDS)
         
         plan = Plan.query.get(plan_id)
         if not plan:
@@ -616,28 +973,23 @@ def get_all_tasks(plan_id):
         if plan.user_id != current_user.id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Get paginated tasks
-        tasks = DailyProgress.query.filter_by(plan_id=plan_id).paginate(
-            page=page, 
-            per_page=per_page
-        )
+        total_tasks = plan_store.day_count(plan)
+        tasks = plan_store.plan_days(plan, max(after_day, 0), limit, fields)
+        last_day = tasks[-1]['day'] if tasks else None
         
-        return jsonify({
-            'total_tasks': tasks.total,
-            'current_page': page,
-            'total_pages': tasks.pages,
-            'daily_tasks': [{
-                'id': task.id,
-                'day': task.day_number,
-                'task': task.task,
-                'completed': task.is_completed,
-                'date': task.planned_date.isoformat(),
-                'hours_spent': task.hours_spent,
-                'notes': task.notes,
-                'completed_date': task.completed_date.isoformat() if task.completed_date else None
-            } for task in tasks.items]
-        }), 200
+        result = {
+            'total_tasks': total_tasks,
+            'limit': limit,
+            'next_after_day': last_day if last_day is not None and last_day < total_tasks else None,
+            'daily_tasks': tasks
+        }
+        if page is not None:
+            result['current_page'] = page
+            result['total_pages'] = (total_tasks + limit - 1) // limit
+        return jsonify(result), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -647,10 +999,9 @@ def get_all_tasks(plan_id):
 @csrf.exempt
 @require_json_and_csrf({'is_completed': None})
 def update_progress(daily_progress_id):
-    """Mark a daily task as completed and track hours/notes"""
+    """Mark a daily task as completed and track hours/notes (`fields=` selects next_task fields)"""
     try:
-        data = request.get_json()
-        
+        fields = _task_fields(NEXT_TASK_FIELDS)
         progress = DailyProgress.query.get(daily_progress_id)
         if not progress:
             return jsonify({'error': 'Progress not found'}), 404
@@ -659,50 +1010,95 @@ def update_progress(daily_progress_id):
         if progress.plan.user_id != current_user.id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Update task progress
-        is_completed = data.get('is_completed', False)
-        progress.is_completed = is_completed
-        progress.hours_spent = float(data.get('hours_spent', 0))
-        progress.notes = data.get('notes', '')
+        return _apply_progress_update(progress.plan, progress, request.get_json(), fields)
         
-        if is_completed and not progress.completed_date:
-            progress.completed_date = datetime.now()
-        elif not is_completed:
-            progress.completed_date = None
-        
-        db.session.commit()
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route("/api/plan/<int:plan_id>/day/<int:day_number>/progress", methods=['POST'])
+@login_required
+@csrf.exempt
+@require_json_and_csrf({'is_completed': None})
+def update_day_progress(plan_id, day_number):
+    """Same as update_progress, addressed by day so untouched derived days need no row"""
+    try:
+        fields = _task_fields(NEXT_TASK_FIELDS)
+        plan = Plan.query.get(plan_id)
+        if not plan:
+            return jsonify({'error': 'Plan not found'}), 404
         
-        # Update overall plan progress
-        plan = progress.plan
-        completed_tasks = DailyProgress.query.filter_by(plan_id=plan.id, is_completed=True).count()
-        total_tasks = DailyProgress.query.filter_by(plan_id=plan.id).count()
-        completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+        if plan.user_id != current_user.id:
+            return jsonify({'error': 'Unauthorized'}), 403
         
-        user_progress = Progress.query.filter_by(user_id=plan.user_id).first()
-        if user_progress:
-            user_progress.total_days_completed = completed_tasks
-            user_progress.completion_percentage = completion_percentage
-            user_progress.last_updated = datetime.now()
-            db.session.commit()
+        progress = plan_store.get_or_create_day(plan, day_number)
+        if not progress:
+            return jsonify({'error': 'Day not found'}), 404
         
-        # Get next upcoming task
-        next_task = DailyProgress.query.filter_by(
-            plan_id=plan.id, 
-            is_completed=False
-        ).order_by(DailyProgress.day_number).first()
+        return _apply_progress_update(plan, progress, request.get_json(), fields)
         
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+# Fields of next_task in progress update responses, unless `fields=` is given
+NEXT_TASK_FIELDS = ('id', 'day', 'task')
+
+
+def _apply_progress_update(plan, progress, data, fields=NEXT_TASK_FIELDS):
+    """Update one day's progress, the plan counters and its Progress summary in one commit"""
+    # Update task progress; record_toggle sets is_completed itself
+    is_completed = bool(data.get('is_completed', False))
+    progress.hours_spent = float(data.get('hours_spent', 0))
+    progress.notes = data.get('notes', '')
+    
+    if is_completed and not progress.completed_date:
+        progress.completed_date = datetime.now()
+    elif not is_completed:
+        progress.completed_date = None
+    
+    plan_store.record_toggle(plan, progress, is_completed)
+    db.session.commit()
+    
+    # Overall plan progress from the counters
+    completed_tasks = plan_store.completed_count(plan)
+    total_tasks = plan_store.day_count(plan)
+    completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    
+    # Get next upcoming task
+    next_task = plan_store.next_open_day(plan)
+    
+    return jsonify({
+        'success': True,
+        'completion_percentage': completion_percentage,
+        'completed_tasks': completed_tasks,
+        'total_tasks': total_tasks,
+        'next_task': {field: next_task[field] for field in fields} if next_task else None
+    }), 200
+
+
+@app.route("/api/progress/summary")
+@login_required
+def progress_summary():
+    """Progress of each of the user's plans, plus totals across them"""
+    try:
+        plans = plan_store.progress_summary(current_user.id)
+        planned = sum(p['total_days_planned'] or 0 for p in plans)
+        completed = sum(p['total_days_completed'] or 0 for p in plans)
         return jsonify({
-            'success': True,
-            'completion_percentage': completion_percentage,
-            'completed_tasks': completed_tasks,
-            'total_tasks': total_tasks,
-            'next_task': {
-                'id': next_task.id,
-                'day': next_task.day_number,
-                'task': next_task.task
-            } if next_task else None
+            'plans': plans,
+            'total_days_planned': planned,
+            'total_days_completed': completed,
+            'completion_percentage': (completed / planned * 100) if planned > 0 else 0
         }), 200
-        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -809,6 +1205,7 @@ def update_plan_tech(plan_id):
         summary = get_technology_update_summary(old_technologies, new_technologies)
         
         db.session.commit()
+        suggestion_cache.invalidate(current_user.id)
         
         return jsonify({
             'success': True,
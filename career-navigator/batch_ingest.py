@@ -0,0 +1,354 @@
+"""Bulk resume ingestion for cohort onboarding.
+
+Parses a directory or archive (.zip, .tar, .tar.gz) of resumes across a
+process pool and writes Resume rows in bulk commits. PDF extraction and spaCy
+are CPU-bound and hold the GIL, so worker processes rather than threads. Each
+worker gets a chunk of files and runs spaCy over the chunk's texts in one
+nlp.pipe batch (resume_parser.parse_resume_texts). When scikit-learn is
+installed, skills are also matched fuzzily against a skill_index.SkillIndex
+built in each worker from the taxonomy of the catalog this process serves.
+
+Workers are started with the 'spawn' method: the web process that calls
+ingest_resumes runs scheduler and job-queue threads, and forking a threaded
+process can copy held locks into the child. Archives are checked against
+BATCH_INGEST_MAX_FILES entries and BATCH_INGEST_MAX_BYTES uncompressed bytes
+before anything is extracted.
+
+The admin upload endpoint does not parse inside the request: it saves the
+archive, records an IngestJob and returns; process_ingest_job runs it on the
+app's ingest job queue.
+
+Usage:
+    python batch_ingest.py <dir-or-archive> --user-id 1
+    python batch_ingest.py <dir-or-archive> --match-email   # file name = user email, e.g. jane@x.com.pdf
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from werkzeug.utils import secure_filename
+
+import nlp_loader
+
+ALLOWED_EXTENSIONS = {'txt', 'pdf'}
+
+# Add fuzzy skill-index matches to keyword skills (needs scikit-learn)
+FUZZY_SKILLS = os.getenv('BATCH_INGEST_FUZZY_SKILLS', 'true').lower() in ('1', 'true', 'yes')
+
+# Archive limits, checked against the archive's member list before extraction
+MAX_ARCHIVE_FILES = int(os.getenv('BATCH_INGEST_MAX_FILES', '20000'))
+MAX_ARCHIVE_BYTES = int(os.getenv('BATCH_INGEST_MAX_BYTES', str(2 * 1024 ** 3)))
+
+
+def _allowed(name):
+    return '.' in name and name.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def _check_archive_limits(members, max_files, max_bytes):
+    """Raise ValueError if the archive has too many entries or too many uncompressed bytes.
+
+    ``members`` is (name, uncompressed size) for every regular file. Both zip
+    and tar readers stop a member at its declared size, so the declared sizes
+    bound what extraction writes.
+    """
+    if len(members) > max_files:
+        raise ValueError(f"Archive has {len(members)} files; the limit is {max_files}")
+    total = sum(size for name, size in members if _allowed(os.path.basename(name)))
+    if total > max_bytes:
+        raise ValueError(f"Archive expands to {total} bytes of resumes; the limit is {max_bytes}")
+
+
+def _extract_archive(archive_path, dest_dir, max_files=None, max_bytes=None):
+    """Extract resume files from an archive into ``dest_dir``.
+
+    Only regular files with an allowed extension are written, under a flattened,
+    sanitized name, so archive members cannot escape ``dest_dir``. Archives over
+    ``max_files`` entries or ``max_bytes`` uncompressed resume bytes are refused
+    with ValueError before anything is written.
+    Returns a list of (original_name, extracted_path).
+    """
+    max_files = MAX_ARCHIVE_FILES if max_files is None else max_files
+    max_bytes = MAX_ARCHIVE_BYTES if max_bytes is None else max_bytes
+    extracted = []
+
+    def write_member(index, name, fileobj):
+        base = os.path.basename(name)
+        if not _allowed(base):
+            return
+        target = os.path.join(dest_dir, f"{index:06d}_{secure_filename(base)}")
+        with open(target, 'wb') as out:
+            shutil.copyfileobj(fileobj, out)
+        extracted.append((base, target))
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as zf:
+            _check_archive_limits([(info.filename, info.file_size) for info in zf.infolist() if not info.is_dir()],
+                                  max_files, max_bytes)
+            for index, info in enumerate(zf.infolist()):
+                if not info.is_dir():
+                    with zf.open(info) as fileobj:
+                        write_member(index, info.filename, fileobj)
+    elif tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path) as tf:
+            _check_archive_limits([(member.name, member.size) for member in tf.getmembers() if member.isfile()],
+                                  max_files, max_bytes)
+            for index, member in enumerate(tf.getmembers()):
+                if member.isfile():
+                    write_member(index, member.name, tf.extractfile(member))
+    else:
+        raise ValueError(f"Unsupported archive: {archive_path}")
+    return extracted
+
+
+def collect_resume_files(source, work_dir):
+    """Return (original_name, path) for every resume in a directory or archive."""
+    if os.path.isdir(source):
+        files = []
+        for root, _dirs, names in os.walk(source):
+            for name in sorted(names):
+                if _allowed(name):
+                    files.append((name, os.path.join(root, name)))
+        return files
+    return _extract_archive(source, work_dir)
+
+
+# Worker process's skill index, built by _init_worker
+_worker_skill_index = None
+
+
+def _init_worker(taxonomy):
+    """Build the worker's skill index from the parent's taxonomy (workers don't load the DB catalog)."""
+    global _worker_skill_index
+    from multiprocessing.util import Finalize
+    from resume_parser import shutdown_pdf_workers
+    # Pool processes skip atexit; stop their PDF extraction process when they exit
+    Finalize(None, shutdown_pdf_workers, exitpriority=10)
+    if taxonomy:
+        from skill_index import SkillIndex
+        _worker_skill_index = SkillIndex(taxonomy)
+
+
+def _skill_taxonomy():
+    """Skill names for the workers' index, or None when fuzzy matching is off or unavailable."""
+    if not FUZZY_SKILLS:
+        return None
+    import skill_index
+    return skill_index.build_skill_taxonomy() if skill_index.is_available() else None
+
+
+def _parse_worker(tasks):
+    """Copy a chunk of resumes into the upload folder and parse them (runs in a worker process).
+
+    Returns (results in task order, stage timings for the chunk).
+    """
+    from resume_parser import extract_resume_text, parse_resume_texts
+
+    timings = {'copy': 0.0, 'extract': 0.0, 'parse': 0.0}
+    results = []
+    texts = []
+    for original_name, src_path, dest_path in tasks:
+        result = {'name': original_name, 'path': dest_path}
+        results.append(result)
+        try:
+            start = time.perf_counter()
+            shutil.copyfile(src_path, dest_path)
+            timings['copy'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            texts.append((result, extract_resume_text(src_path)))
+            timings['extract'] += time.perf_counter() - start
+        except Exception as e:
+            result['error'] = str(e)
+
+    start = time.perf_counter()
+    try:
+        parsed_texts = parse_resume_texts((text for _result, text in texts), skill_index=_worker_skill_index)
+        for (result, _text), parsed in zip(texts, parsed_texts):
+            result['parsed'] = parsed
+    except Exception as e:
+        for result, _text in texts:
+            result['error'] = str(e)
+    timings['parse'] += time.perf_counter() - start
+    return results, timings
+
+
+def _resolve_owners(names, user_id, match_email):
+    """Map each file name to the owning user id (None if no owner)."""
+    if user_id is not None:
+        return {name: user_id for name in names}
+    if not match_email:
+        return {}
+
+    from models import User
+    stems = {name: name.rsplit('.', 1)[0].lower() for name in names}
+    emails = sorted(set(stems.values()))
+    by_email = {}
+    for i in range(0, len(emails), 500):
+        chunk = emails[i:i + 500]
+        for uid, email in User.query.with_entities(User.id, User.email).filter(User.email.in_(chunk)):
+            by_email[email.lower()] = uid
+    return {name: by_email.get(stem) for name, stem in stems.items()}
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def ingest_resumes(source, upload_folder, user_id=None, match_email=False, workers=None, commit_every=200,
+                   chunk_size=None):
+    """Parse every resume in ``source`` and insert Resume rows.
+
+    Must be called inside an app context. Workers parse ``chunk_size`` files
+    per nlp.pipe batch (default RESUME_NLP_BATCH_SIZE). Returns a stats dict
+    with counts, throughput (resumes/sec) and per-stage timings in seconds;
+    worker stages (copy/extract/parse) are summed across processes.
+    """
+    from models import db, Resume
+    from security_utils import sanitize_text, sanitize_list
+
+    started = time.perf_counter()
+    stats = {
+        'files': 0, 'inserted': 0, 'failed': 0, 'skipped_no_owner': 0,
+        'stage_seconds': {'collect': 0.0, 'copy': 0.0, 'extract': 0.0, 'parse': 0.0, 'db': 0.0},
+        'errors': []
+    }
+
+    os.makedirs(upload_folder, exist_ok=True)
+    with tempfile.TemporaryDirectory() as work_dir:
+        start = time.perf_counter()
+        files = collect_resume_files(source, work_dir)
+        owners = _resolve_owners([name for name, _ in files], user_id, match_email)
+        stats['stage_seconds']['collect'] = time.perf_counter() - start
+        stats['files'] = len(files)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+        tasks = []
+        for index, (name, path) in enumerate(files):
+            if owners.get(name) is None:
+                stats['skipped_no_owner'] += 1
+                continue
+            dest = os.path.join(upload_folder, f"{timestamp}{index:06d}_{secure_filename(name)}")
+            tasks.append((name, path, dest))
+
+        rows = []
+
+        def flush():
+            if not rows:
+                return
+            start = time.perf_counter()
+            db.session.execute(db.insert(Resume), rows)
+            db.session.commit()
+            stats['stage_seconds']['db'] += time.perf_counter() - start
+            stats['inserted'] += len(rows)
+            rows.clear()
+
+        # Spawned, not forked: this may run in a web worker with live threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(_skill_taxonomy(),)) as pool:
+            # map() yields chunks in order as they complete, so rows stream into the DB
+            for results, timings in pool.map(_parse_worker, _chunks(tasks, chunk_size or nlp_loader.batch_size())):
+                for stage, seconds in timings.items():
+                    stats['stage_seconds'][stage] += seconds
+                for result in results:
+                    if 'error' in result:
+                        stats['failed'] += 1
+                        if len(stats['errors']) < 20:
+                            stats['errors'].append({'file': result['name'], 'error': result['error']})
+                        continue
+
+                    parsed = result['parsed']
+                    rows.append({
+                        'user_id': owners[result['name']],
+                        'filename': result['name'],
+                        'file_path': result['path'],
+                        'skills': sanitize_list(parsed.get('skills', [])),
+                        'experience_level': sanitize_text(parsed.get('experience_level', 'beginner')),
+                        'years_of_experience': int(parsed.get('years_of_experience', 0) or 0),
+                        'current_role': sanitize_text(parsed.get('current_role', 'Not specified')),
+                        'education': sanitize_text(parsed.get('education', 'Not specified'))
+                    })
+                    if len(rows) >= commit_every:
+                        flush()
+            flush()
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed_seconds'] = round(elapsed, 3)
+    stats['resumes_per_sec'] = round(stats['inserted'] / elapsed, 2) if elapsed > 0 else 0.0
+    stats['stage_seconds'] = {k: round(v, 3) for k, v in stats['stage_seconds'].items()}
+    return stats
+
+
+def process_ingest_job(job_id):
+    """Run one queued IngestJob and remove its archive. Requires an app context."""
+    from flask import current_app
+    from models import db, IngestJob
+
+    # Claim the job atomically so two processes never import the same archive
+    claimed = IngestJob.query.filter_by(id=job_id, status='queued').update(
+        {'status': 'running', 'started_at': datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    if not claimed:
+        return
+
+    job = IngestJob.query.get(job_id)
+    archive_path = job.archive_path
+    try:
+        stats = ingest_resumes(archive_path, current_app.config['UPLOAD_FOLDER'], user_id=job.user_id,
+                               match_email=job.match_email, workers=job.workers)
+        job.stats = stats
+        job.status = 'completed'
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        IngestJob.query.filter_by(id=job_id).update(
+            {'status': 'failed', 'error': str(e), 'finished_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+    finally:
+        shutil.rmtree(os.path.dirname(archive_path), ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-import resumes from a directory or archive.')
+    parser.add_argument('source', help='Directory, .zip or .tar(.gz) of .pdf/.txt resumes')
+    owner = parser.add_mutually_exclusive_group(required=True)
+    owner.add_argument('--user-id', type=int, help='Assign every resume to this user')
+    owner.add_argument('--match-email', action='store_true', help='File name (without extension) is the owner email')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--commit-every', type=int, default=200, help='Rows per bulk commit')
+    args = parser.parse_args(argv)
+
+    from app import app
+
+    with app.app_context():
+        stats = ingest_resumes(
+            args.source,
+            app.config['UPLOAD_FOLDER'],
+            user_id=args.user_id,
+            match_email=args.match_email,
+            workers=args.workers,
+            commit_every=args.commit_every
+        )
+
+    print(f"Files: {stats['files']}  inserted: {stats['inserted']}  failed: {stats['failed']}  "
+          f"skipped (no owner): {stats['skipped_no_owner']}")
+    print(f"Elapsed: {stats['elapsed_seconds']}s  throughput: {stats['resumes_per_sec']} resumes/sec")
+    for stage, seconds in stats['stage_seconds'].items():
+        print(f"  {stage:>8}: {seconds}s")
+    for err in stats['errors']:
+        print(f"  error in {err['file']}: {err['error']}")
+    return stats
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark: single-pass field extraction vs. the previous four regex sweeps.
+
+Run: python bench_field_extractor.py
+The baseline below is the pre-extractor implementation of
+extract_years_of_experience / extract_education / extract_role plus the
+skill scan, kept here only for comparison.
+"""
+import random
+import re
+import time
+
+from field_extractor import ResumeFieldExtractor
+from resume_parser import ROLE_TITLES, SKILL_KEYWORDS, _SKILL_MATCHER
+
+
+def legacy_fields(text):
+    text_lower = text.lower()
+    skills = _SKILL_MATCHER.find(text)
+
+    years = 0.0
+    for pattern in [r'(\d+)\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)',
+                    r'(?:experience|exp).*?(\d+)\s*(?:years?|yrs?)',
+                    r'total experience.*?(\d+)\s*(?:year|yrs?)']:
+        match = re.search(pattern, text_lower)
+        if match:
+            years = float(match.group(1))
+            break
+
+    education = 'Not specified'
+    for pattern in [r'(?:bachelor|b\.?s\.?|bs)', r'(?:master|m\.?s\.?|ms)', r'(?:phd|ph\.?d\.?)', r'(?:diploma|certification)']:
+        if re.search(pattern, text_lower):
+            section = re.search(pattern + r'[^,\n]*(?:in|of)?[^,\n]*', text_lower)
+            if section:
+                education = section.group(0).title()
+                break
+
+    role = next((t.title() for t in ROLE_TITLES if t in text_lower), 'Not specified')
+    return skills, years, education, role
+
+
+def make_resume(rng, words=800):
+    filler = ['developed', 'team', 'project', 'using', 'with', 'built', 'systems', 'and', 'the', 'data',
+              'years', 'experience', '2019', 'led', 'delivered', 'customers']
+    keywords = SKILL_KEYWORDS + ROLE_TITLES + ['master of science', '3 years of experience']
+    lines = []
+    for _ in range(words // 10):
+        lines.append(' '.join(rng.choice(keywords if rng.random() < 0.1 else filler) for _ in range(10)))
+    return '\n'.join(lines)
+
+
+def timeit(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(3)
+    extractor = ResumeFieldExtractor(SKILL_KEYWORDS, ROLE_TITLES)
+    resumes = [make_resume(rng) for _ in range(200)]
+
+    legacy_s = timeit(lambda: [legacy_fields(t) for t in resumes])
+    single_s = timeit(lambda: [extractor.extract(t) for t in resumes])
+    print(f"typical resumes ({len(resumes)} x ~{len(resumes[0])} chars)")
+    print(f"  four sweeps:   {legacy_s * 1000 / len(resumes):7.3f} ms/resume")
+    print(f"  single pass:   {single_s * 1000 / len(resumes):7.3f} ms/resume")
+
+    print("pathological line: 'experience 1 ' * n (no 'years')")
+    print(f"{'n':>8} {'four sweeps ms':>15} {'single pass ms':>15}")
+    for n in (500, 1000, 2000, 4000):
+        text = 'experience 1 ' * n
+        legacy_ms = timeit(lambda: legacy_fields(text), repeat=1) * 1000
+        single_ms = timeit(lambda: extractor.extract(text)) * 1000
+        print(f"{n:>8} {legacy_ms:>15.1f} {single_ms:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark: plans/sec for generate_daily_plan.
+
+Run: python bench_planner.py
+'per-day rebuild' emulates the previous planner, which constructed the task
+template dict once per day and re-parsed the 'weeks_N_M' keys on every call.
+'tables, cold' uses the precomputed phase tables with the skeleton cache
+cleared before every plan; 'tables, cached' is the steady state.
+"""
+import time
+
+import planner
+from planner import PROFESSION_PATHS, TASK_TEMPLATES, calculate_difficulty, generate_daily_plan
+
+PROFESSIONS = list(PROFESSION_PATHS)
+SKILLS = ['Python', 'SQL', 'Git']
+
+
+def legacy_plan(profession, duration_months, current_skills, experience_level):
+    profession_data = PROFESSION_PATHS[profession.lower()]
+    total_days = duration_months * 30
+    daily_tasks = []
+    current_day = 0
+    for week_range, week_data in profession_data['daily_distribution'].items():
+        parts = week_range.split('_')
+        start_week, end_week = int(parts[1]), int(parts[2])
+        for day in range((end_week - start_week + 1) * 7):
+            current_day += 1
+            templates = {k: list(v) for k, v in TASK_TEMPLATES.items()}
+            focus = week_data['focus']
+            tasks = templates.get(focus) or next(
+                (t for k, t in templates.items() if k.lower() in focus.lower() or focus.lower() in k.lower()), None)
+            task = tasks[day % len(tasks)] if tasks else f"Work on {focus} - Day {day + 1}"
+            daily_tasks.append({'day': current_day, 'task': task, 'focus_area': focus,
+                                'recommended_hours': week_data['daily_hours'],
+                                'difficulty': calculate_difficulty(current_day, total_days)})
+    return {'total_days': total_days, 'daily_tasks': daily_tasks[:total_days],
+            'technologies': [s for s in profession_data['skills_required'] if s not in current_skills],
+            'milestones': profession_data['milestones']}
+
+
+def cold_plan(*args):
+    planner._plan_skeleton.cache_clear()
+    return generate_daily_plan(*args)
+
+
+def plans_per_second(fn, duration_months, seconds=1.5):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for profession in PROFESSIONS:
+            fn(profession, duration_months, SKILLS, 'beginner')
+        count += len(PROFESSIONS)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'months':>6} {'per-day rebuild':>16} {'tables, cold':>13} {'tables, cached':>15}   (plans/sec)")
+    for months in (3, 6, 12):
+        legacy = plans_per_second(legacy_plan, months)
+        cold = plans_per_second(cold_plan, months)
+        warm = plans_per_second(generate_daily_plan, months)
+        print(f"{months:>6} {legacy:>16,.0f} {cold:>13,.0f} {warm:>15,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark: update_progress latency under load, recount vs. plan counters.
+
+Run: python bench_progress_load.py [--users 1000] [--threads 32] [--database-url ...]
+Each simulated user owns one materialized plan and completes random days
+from a thread pool. 'recount' is the previous update path (commit, COUNT the
+plan's rows twice, look up the next open day, commit Progress); 'counters'
+is the current one (record_toggle, which also maintains the plan's Progress
+row, + a single commit). Defaults to a
+temporary SQLite file; the tables are dropped and recreated.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import Flask
+
+from models import db, User, Resume, Plan, DailyProgress, Progress
+import plan_store
+from planner import generate_daily_plan
+
+
+def recount_update(plan_id, day_number):
+    plan = db.session.get(Plan, plan_id)
+    row = DailyProgress.query.filter_by(plan_id=plan_id, day_number=day_number).first()
+    row.is_completed = True
+    row.completed_date = datetime.now()
+    db.session.commit()
+    completed = DailyProgress.query.filter_by(plan_id=plan_id, is_completed=True).count()
+    total = DailyProgress.query.filter_by(plan_id=plan_id).count()
+    DailyProgress.query.filter_by(plan_id=plan_id, is_completed=False).order_by(DailyProgress.day_number).first()
+    progress = Progress.query.filter_by(user_id=plan.user_id).first()
+    progress.total_days_completed = completed
+    progress.completion_percentage = completed / total * 100
+    db.session.commit()
+
+
+def counter_update(plan_id, day_number):
+    plan = db.session.get(Plan, plan_id)
+    row = DailyProgress.query.filter_by(plan_id=plan_id, day_number=day_number).first()
+    row.completed_date = datetime.now()
+    plan_store.record_toggle(plan, row, True)  # Also updates the plan's Progress row
+    db.session.commit()
+    plan_store.next_open_day(plan)
+
+
+def run_load(app, fn, plans, requests, threads):
+    rng = random.Random(7)
+    work = [(rng.choice(plans), rng.randint(1, 180)) for _ in range(requests)]
+
+    def one(item):
+        with app.app_context():
+            start = time.perf_counter()
+            fn(*item)
+            elapsed = (time.perf_counter() - start) * 1000
+            db.session.remove()
+            return elapsed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        timings = sorted(pool.map(one, work))
+    wall = time.perf_counter() - start
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1], requests / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=32)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    url = args.database_url or 'sqlite:///' + os.path.join(tmp_dir, 'bench.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    engine_options = {'pool_size': args.threads, 'max_overflow': 0}
+    if url.startswith('sqlite'):
+        engine_options['connect_args'] = {'timeout': 60}
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        content = generate_daily_plan('Software Engineer', 6, [], 'beginner')
+        plans = []
+        for i in range(args.users):
+            user = User(name=f'User {i}', email=f'user{i}@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.flush()
+            resume = Resume(user_id=user.id, filename='cv.txt', file_path='cv.txt')
+            db.session.add(resume)
+            db.session.flush()
+            plans.append(plan_store.store_plan(user.id, resume.id, 'Software Engineer', 6, content))
+        print(f"database: {db.engine.url.get_backend_name()}, {args.users} users, "
+              f"{args.requests} updates, {args.threads} threads")
+
+    print(f"{'path':>10} {'p50 ms':>8} {'p99 ms':>8} {'updates/s':>10}")
+    for name, fn in (('recount', recount_update), ('counters', counter_update)):
+        p50, p99, rate = run_load(app, fn, plans, args.requests, args.threads)
+        print(f"{name:>10} {p50:>8.1f} {p99:>8.1f} {rate:>10.0f}")
+        with app.app_context():
+            DailyProgress.query.update({'is_completed': False, 'completed_date': None})
+            plan_store.repair_plan_counters()
+            db.session.commit()
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark: "already known" checks, substring scan vs. canonical skill sets.
+
+Run: python bench_skill_canon.py [--techs 2000] [--skills 50 500 5000]
+Times detect_new_technologies + generate_tech_recommendations for one
+profession over a synthetic catalog, with growing lists of user skills.
+'scan' is the previous any(skill in tech or tech in skill ...) test.
+"""
+import argparse
+import random
+import time
+
+import tech_monitor
+from tech_monitor import detect_new_technologies, generate_tech_recommendations, get_trending_technologies
+
+
+def scan_detect(current_skills, profession, threshold=80):
+    trending = get_trending_technologies(profession, min_relevance=threshold)
+    current_skills_lower = [skill.lower() for skill in current_skills]
+    return [t for t in trending
+            if not any(s in t['name'].lower() or t['name'].lower() in s for s in current_skills_lower)]
+
+
+def scan_recommend(profession, current_technologies):
+    trending = get_trending_technologies(profession, min_relevance=75)
+    current_lower = [t.lower() for t in current_technologies]
+    return [t for t in trending
+            if not any(s in t['name'].lower() or t['name'].lower() in s for s in current_lower)]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--techs', type=int, default=2000)
+    parser.add_argument('--skills', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    words = ['data', 'cloud', 'stream', 'graph', 'vector', 'edge', 'query', 'flow', 'mesh', 'lake', 'ops', 'kit']
+    catalog = {
+        f'{rng.choice(words).title()}{rng.choice(words)} {i}.{rng.randint(0, 9)}': {
+            'category': 'Synthetic', 'relevance': rng.randint(75, 100), 'professions': ['Backend Engineer']
+        }
+        for i in range(args.techs)
+    }
+    original = tech_monitor.get_catalog()
+    tech_monitor.use_catalog(catalog)
+    names = list(catalog)
+    try:
+        print(f"{args.techs} trending technologies for the profession")
+        print(f"{'skills':>7} {'scan ms':>9} {'canonical ms':>13} {'speedup':>8}")
+        for count in args.skills:
+            skills = [rng.choice(names) if rng.random() < 0.3 else f'skill-{i}' for i in range(count)]
+            repeat = max(1, args.repeat if count <= 500 else 1)
+            scan = timed(lambda: (scan_detect(skills, 'Backend Engineer'),
+                                  scan_recommend('Backend Engineer', skills)), repeat)
+            canon = timed(lambda: (detect_new_technologies(skills, 'Backend Engineer'),
+                                   generate_tech_recommendations('Backend Engineer', skills)), repeat)
+            print(f"{count:>7} {scan:>9.1f} {canon:>13.1f} {scan / canon:>7.0f}x")
+    finally:
+        tech_monitor.use_catalog(original)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Benchmark: single-pass skill matcher vs. one regex search per keyword.
+
+Run: python bench_skill_matcher.py
+The matcher's scan time should stay roughly flat as the vocabulary grows,
+while the per-keyword loop grows linearly with the number of skills.
+"""
+import random
+import re
+import string
+import time
+
+from skill_matcher import SkillMatcher
+from resume_parser import SKILL_KEYWORDS
+
+
+def make_vocabulary(size, rng):
+    vocab = list(SKILL_KEYWORDS)
+    while len(vocab) < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        if rng.random() < 0.3:
+            word += ' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+        vocab.append(word)
+    return vocab
+
+
+def make_resume(rng, words=1200):
+    filler = ['developed', 'team', 'project', 'using', 'with', 'built', 'systems', 'and', 'the', 'data']
+    tokens = [rng.choice(filler if rng.random() < 0.9 else SKILL_KEYWORDS) for _ in range(words)]
+    return ' '.join(tokens)
+
+
+def naive_scan(text, vocab):
+    text_lower = text.lower()
+    return {kw for kw in vocab if re.search(r'\b' + re.escape(kw) + r'\b', text_lower)}
+
+
+def timeit(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    text = make_resume(rng)
+    print(f"Resume length: {len(text)} chars")
+    print(f"{'vocab':>8} {'compile ms':>11} {'matcher ms':>11} {'per-keyword ms':>15}")
+    for size in (24, 250, 1000, 2500, 5000):
+        vocab = make_vocabulary(size, rng)
+        start = time.perf_counter()
+        matcher = SkillMatcher(vocab)
+        compile_ms = (time.perf_counter() - start) * 1000
+        matcher_ms = timeit(lambda: matcher.find(text)) * 1000
+        naive_ms = timeit(lambda: naive_scan(text, vocab), repeat=1 if size > 1000 else 3) * 1000
+        print(f"{size:>8} {compile_ms:>11.1f} {matcher_ms:>11.2f} {naive_ms:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Startup benchmark: import time and RSS of resume_parser with eager vs lazy spaCy.
+
+Run: python bench_startup.py
+"Eager" reproduces the old behaviour (model loaded at import) via
+RESUME_NLP_PRELOAD=true; "lazy" is the default.
+"""
+import os
+import subprocess
+import sys
+
+PROBE = (
+    "import time, resource\n"
+    "start = time.perf_counter()\n"
+    "import resume_parser\n"
+    "elapsed = time.perf_counter() - start\n"
+    "rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(f'{elapsed:.3f} {rss_kb}')\n"
+)
+
+
+def measure(preload, runs=3):
+    env = dict(os.environ, RESUME_NLP_PRELOAD='true' if preload else 'false')
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        results.append((float(out[0]), int(out[1])))
+    return min(r[0] for r in results), max(r[1] for r in results)
+
+
+def main():
+    for label, preload in (('eager (before)', True), ('lazy (after)', False)):
+        seconds, rss_kb = measure(preload)
+        print(f"{label:>15}: import {seconds * 1000:8.1f} ms, max RSS {rss_kb / 1024:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
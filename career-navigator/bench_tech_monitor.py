@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark: get_trending_technologies calls/sec, linear scan vs. TrendIndex.
+
+Run: python bench_tech_monitor.py [--entries 10000] [--calls 2000]
+Builds a synthetic catalog (50 professions, 1-4 per technology, relevance
+50-100) and times the same random (profession, min_relevance) queries,
+including profession=None, against both implementations.
+"""
+import argparse
+import random
+import time
+
+from tech_monitor import TrendIndex
+
+
+def scan(catalog, profession=None, min_relevance=75):
+    """The previous get_trending_technologies body."""
+    trending = []
+    for tech, data in catalog.items():
+        if data['relevance'] >= min_relevance:
+            if profession is None or profession.lower() in [p.lower() for p in data.get('professions', [])]:
+                trending.append({
+                    'name': tech,
+                    'category': data['category'],
+                    'relevance': data['relevance'],
+                    'professions': data.get('professions', [])
+                })
+    trending.sort(key=lambda x: x['relevance'], reverse=True)
+    return trending
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    professions = [f'Profession {i}' for i in range(50)]
+    catalog = {
+        f'Technology {i}': {'category': 'Synthetic', 'relevance': rng.randint(50, 100),
+                            'professions': rng.sample(professions, rng.randint(1, 4))}
+        for i in range(args.entries)
+    }
+    queries = [(rng.choice(professions + [None]), rng.choice([75, 80, 85, 90])) for _ in range(args.calls)]
+
+    start = time.perf_counter()
+    index = TrendIndex(catalog)
+    build = time.perf_counter() - start
+
+    results = {}
+    for name, fn in (('scan', lambda p, m: scan(catalog, p, m)), ('index', index.lookup)):
+        calls = args.calls if name == 'index' else max(args.calls // 20, 20)
+        start = time.perf_counter()
+        for profession, min_relevance in queries[:calls]:
+            fn(profession, min_relevance)
+        results[name] = calls / (time.perf_counter() - start)
+
+    assert all(index.lookup(p, m) == scan(catalog, p, m) for p, m in queries[:20])
+    print(f"{args.entries} technologies, index built in {build * 1000:.1f} ms")
+    for name, rate in results.items():
+        print(f"{name:>6}: {rate:>10.0f} calls/s")
+    print(f"speedup: {results['index'] / results['scan']:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
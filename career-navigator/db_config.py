@@ -0,0 +1,78 @@
+"""Database engine settings for production deployments.
+
+The web workers, the orchestrator thread and the task scheduler all share
+one database. With SQLite's default rollback journal a writer blocks every
+reader and a second writer fails at once with "database is locked", so
+SQLite connections are switched to WAL (readers no longer wait for the
+writer), synchronous=NORMAL, a busy timeout (writers queue instead of
+failing) and memory-mapped reads. Server databases get connection-pool
+settings instead. Everything is read from the environment:
+
+SQLite: SQLITE_JOURNAL_MODE (WAL), SQLITE_SYNCHRONOUS (NORMAL),
+SQLITE_BUSY_TIMEOUT_MS (5000), SQLITE_MMAP_SIZE (268435456 bytes).
+Others: DB_POOL_SIZE (5), DB_MAX_OVERFLOW (10), DB_POOL_TIMEOUT (30 s),
+DB_POOL_RECYCLE (1800 s), DB_POOL_PRE_PING (true).
+"""
+import logging
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+
+def _is_sqlite(url):
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def _is_memory(url):
+    return make_url(url).database in (None, '', ':memory:')
+
+
+def sqlite_pragmas(url):
+    """PRAGMA statements to run on each new SQLite connection, in order."""
+    pragmas = [f"PRAGMA busy_timeout = {int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))}"]
+    if not _is_memory(url):
+        # WAL and mmap only apply to database files
+        pragmas.append(f"PRAGMA journal_mode = {os.getenv('SQLITE_JOURNAL_MODE', 'WAL')}")
+        pragmas.append(f"PRAGMA mmap_size = {int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}")
+    # NORMAL is durable in WAL mode except for the last commits before a power loss
+    pragmas.append(f"PRAGMA synchronous = {os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}")
+    return pragmas
+
+
+def engine_options(url):
+    """SQLALCHEMY_ENGINE_OPTIONS for ``url``."""
+    if _is_sqlite(url):
+        # The driver's own lock timeout, in seconds; the PRAGMA covers the rest
+        return {'connect_args': {'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000}}
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    }
+
+
+def configure_engine(engine):
+    """Apply the SQLite PRAGMAs to every new connection of ``engine``.
+
+    Call before the engine hands out its first connection. A no-op for other
+    databases, whose settings are all in engine_options().
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(engine.url)
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite connections use: {'; '.join(pragmas)}")
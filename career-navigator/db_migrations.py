@@ -0,0 +1,81 @@
+"""Additive schema migrations for existing databases.
+
+db.create_all() creates missing tables but never alters existing ones.
+ensure_schema() adds the columns introduced after a table was first
+created, and the indexes declared in the models' __table_args__, so
+deployments without a migration tool pick them up on start. Only
+additive, nullable-or-defaulted changes belong here.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+# table -> [(column, DDL type and default)]
+ADDED_COLUMNS = {
+    'plans': [
+        ('storage_mode', "VARCHAR(20) DEFAULT 'materialized'"),
+        ('experience_level', 'VARCHAR(50)'),
+        ('template_version', 'INTEGER'),
+        ('completed_count', 'INTEGER'),
+        ('total_count', 'INTEGER'),
+        ('next_day_number', 'INTEGER'),
+    ],
+    'progress': [
+        ('plan_id', 'INTEGER'),
+    ],
+    'tech_trends': [
+        ('professions', 'JSON'),
+    ],
+}
+
+
+def ensure_schema(engine, metadata=None):
+    """Add missing columns from ADDED_COLUMNS, then missing indexes declared in ``metadata``.
+
+    Returns the names added ('table.column' for columns, index names for indexes).
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    added = []
+    for table, columns in ADDED_COLUMNS.items():
+        if table not in tables:
+            continue
+        existing = {c['name'] for c in inspector.get_columns(table)}
+        for name, ddl in columns:
+            if name in existing:
+                continue
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+                added.append(f'{table}.{name}')
+            except Exception as e:
+                # Another worker may have added it first
+                logger.warning(f"Could not add column {table}.{name}: {e}")
+    if metadata is not None:
+        added.extend(ensure_indexes(engine, metadata))
+    if added:
+        logger.info(f"Schema additions: {', '.join(added)}")
+    return added
+
+
+def ensure_indexes(engine, metadata):
+    """Create indexes declared in ``metadata`` that existing tables are missing."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    added = []
+    for table in metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            if index.name in existing:
+                continue
+            try:
+                index.create(bind=engine)
+                added.append(index.name)
+            except Exception as e:
+                # Concurrent creation, or duplicate rows blocking a unique index
+                logger.warning(f"Could not create index {index.name}: {e}")
+    return added
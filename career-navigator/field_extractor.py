@@ -0,0 +1,126 @@
+"""Single-pass resume field extraction.
+
+Skills, role, education and years of experience used to be found by four
+independent sweeps over the lowercased resume, one of them with an unbounded
+``.*?``. ``ResumeFieldExtractor`` puts every keyword (skills, job titles,
+degrees, 'experience') into one trie-shaped regular expression alongside a
+bounded 'N years' pattern, so the text is lowercased once and walked once.
+Each hit is dispatched to its field with a dict lookup, and every repetition
+is bounded, so the cost stays linear even on pathological input.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from skill_matcher import _trie_pattern
+
+# Degree spellings in priority order: the first kind found anywhere wins
+DEGREE_KEYWORDS = [
+    ['bachelor', 'bachelors', "bachelor's", 'bs', 'bs.', 'b.s', 'b.s.'],
+    ['master', 'masters', "master's", 'ms', 'ms.', 'm.s', 'm.s.'],
+    ['phd', 'phd.', 'ph.d', 'ph.d.'],
+    ['diploma', 'certification'],
+]
+EXPERIENCE_KEYWORDS = ['experience', 'exp']
+
+# Longest degree clause kept ('Bachelor of Science in ...'), cut at a comma or newline
+EDUCATION_WINDOW = 96
+# Max distance between an 'experience' keyword and a later 'N years' on the same line
+EXPERIENCE_WINDOW = 80
+
+_YEARS_RE = r'(\d{1,2}(?:\.\d{1,2})?)\s{0,3}\+?\s{0,3}(?:years?|yrs?)(?!\w)(\s{1,3}(?:of\s{1,3})?(?:experience|exp)(?!\w))?'
+_WORD_CHAR = re.compile(r'\w')
+_CLAUSE_END = re.compile(r'[,\n]')
+
+
+class ResumeFields(NamedTuple):
+    skills: Set[str]
+    years_of_experience: float
+    education: Optional[str]
+    role: Optional[str]
+
+
+class ResumeFieldExtractor:
+    """Extract skills, role, education and years of experience in one scan."""
+
+    def __init__(self, skill_keywords: Iterable[str], role_titles: Iterable[str]):
+        self.skill_keywords = tuple(dict.fromkeys(kw.lower().strip() for kw in skill_keywords if kw and kw.strip()))
+        self.role_titles = tuple(dict.fromkeys(t.lower().strip() for t in role_titles if t and t.strip()))
+
+        # keyword -> [(field, rank)]; rank orders roles and degrees by priority
+        kinds: Dict[str, List[Tuple[str, int]]] = {}
+        for kw in self.skill_keywords:
+            kinds.setdefault(kw, []).append(('skill', 0))
+        for rank, title in enumerate(self.role_titles):
+            kinds.setdefault(title, []).append(('role', rank))
+        for rank, spellings in enumerate(DEGREE_KEYWORDS):
+            for kw in spellings:
+                kinds.setdefault(kw, []).append(('edu', rank))
+        for kw in EXPERIENCE_KEYWORDS:
+            kinds.setdefault(kw, []).append(('exp', 0))
+
+        # The trie reports the longest keyword at each word start. Shorter keywords
+        # ending on a word boundary inside it ('machine learning' in 'machine
+        # learning engineer') matched at the same position, so expand them here.
+        self._actions: Dict[str, Tuple[Tuple[str, str, int], ...]] = {}
+        for kw in kinds:
+            self._actions[kw] = tuple(
+                (field, prefix, rank)
+                for prefix in kinds
+                if kw.startswith(prefix) and (len(prefix) == len(kw) or not _WORD_CHAR.match(kw[len(prefix)]))
+                for field, rank in kinds[prefix]
+            )
+
+        self._pattern = re.compile(
+            r'(?<!\w)(?=(' + _trie_pattern(kinds) + r')(?!\w)|' + _YEARS_RE + ')'
+        )
+
+    def extract(self, text: str) -> ResumeFields:
+        """Scan ``text`` once and return every field.
+
+        Skills are lowercased keywords. Years come from the first
+        'N years of experience', otherwise from the first 'N years' within
+        EXPERIENCE_WINDOW characters after 'experience' on the same line.
+        """
+        text_lower = (text or '').lower()
+        skills: Set[str] = set()
+        role = role_rank = None
+        education_at = education_rank = None
+        years = weak_years = None
+        last_exp = None
+
+        for m in self._pattern.finditer(text_lower):
+            keyword = m.group(1)
+            if keyword is None:
+                if years is None:
+                    if m.group(3):
+                        years = float(m.group(2))
+                    elif (weak_years is None and last_exp is not None
+                          and m.start() - last_exp <= EXPERIENCE_WINDOW
+                          and '\n' not in text_lower[last_exp:m.start()]):
+                        weak_years = float(m.group(2))
+                continue
+
+            for field, name, rank in self._actions[keyword]:
+                if field == 'skill':
+                    skills.add(name)
+                elif field == 'role':
+                    if role is None or rank < role_rank:
+                        role, role_rank = name, rank
+                elif field == 'edu':
+                    if education_at is None or rank < education_rank:
+                        education_at, education_rank = m.start(), rank
+                else:
+                    last_exp = m.start()
+
+        if years is None:
+            years = weak_years if weak_years is not None else 0.0
+        education = None
+        if education_at is not None:
+            clause = text_lower[education_at:education_at + EDUCATION_WINDOW]
+            education = _CLAUSE_END.split(clause, 1)[0].strip().title()
+        return ResumeFields(
+            skills=skills,
+            years_of_experience=years,
+            education=education,
+            role=role.title() if role else None
+        )
@@ -0,0 +1,20 @@
+"""Gunicorn configuration for Career Navigator.
+
+The spaCy model is loaded once in the master before workers are forked, so
+all workers share its memory pages copy-on-write instead of each loading
+their own copy. The app itself is not preloaded because it starts background
+threads at import, which would not survive the fork.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+bind = '0.0.0.0:' + os.getenv('PORT', '5000')
+
+
+def on_starting(server):
+    import nlp_loader
+    if nlp_loader.is_enabled():
+        nlp_loader.preload()
@@ -0,0 +1,275 @@
+"""One scheduler for every periodic background job.
+
+Jobs register with their own interval, jitter, timeout and max concurrency.
+A dispatcher thread puts due jobs on a bounded queue, and a small worker
+pool runs them. A job never has more than max_concurrency runs queued or
+running, so a slow job holds at most that many workers and queue slots and
+cannot starve the others. When the queue is full, the run is skipped and
+counted rather than piling up.
+
+Each run is recorded in the job_runs table (start, duration, rows processed,
+status, error). With a lease TTL, every job also gets a leader_election lease
+of its own name, so across the deployment only one process runs it.
+
+Python threads cannot be interrupted, so timeouts are cooperative. Long jobs
+call keep_going() between batches; it returns False once the run is past its
+timeout or has lost its lease. A run that ends after its timeout is recorded
+as 'timeout'.
+"""
+import logging
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from leader_election import LeaderLease, default_holder
+
+logger = logging.getLogger(__name__)
+
+# The job and deadline of the run executing on this worker thread, for keep_going()
+_local = threading.local()
+
+
+class Job:
+    """A registered job and its per-process counters."""
+
+    def __init__(self, name, func, interval, jitter=0, timeout=None, max_concurrency=1, lease=None):
+        self.name = name
+        self.func = func  # Returns the number of rows it processed, or None
+        self.interval = interval
+        self.jitter = jitter  # Up to this many seconds added to each interval
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.lease = lease
+        self.next_run = 0.0  # time.monotonic(); 0 = run as soon as the scheduler starts
+        self.active = 0  # Runs queued or running
+        self.counters = {'runs': 0, 'failed': 0, 'timeout': 0, 'skipped_busy': 0, 'skipped_queue_full': 0,
+                         'total_seconds': 0.0, 'last_seconds': None, 'last_status': None}
+
+
+class JobScheduler:
+    """Dispatcher thread plus a worker pool fed through a bounded queue."""
+
+    def __init__(self, app=None, workers=4, queue_size=16, lease_ttl=None, tick=1.0):
+        self.app = app
+        self.workers = workers
+        self.lease_ttl = lease_ttl  # Seconds; None = every process runs every job
+        self.tick = tick  # Seconds between dispatcher passes
+        self.holder = default_holder()
+        self.jobs = {}
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stop_event = threading.Event()
+
+    def register(self, name, func, interval, jitter=0, timeout=None, max_concurrency=1, leader_only=True):
+        """Add a job. ``leader_only`` jobs take a lease named after the job when lease_ttl is set."""
+        if name in self.jobs:
+            raise ValueError(f"Job {name} is already registered")
+        lease = None
+        if leader_only and self.lease_ttl and self.app is not None:
+            lease = LeaderLease(self.app, name, ttl=self.lease_ttl, holder=self.holder)
+        job = self.jobs[name] = Job(name, func, interval, jitter, timeout, max_concurrency, lease)
+        return job
+
+    def start(self):
+        """Start the dispatcher and worker threads."""
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop_event.clear()
+        self._threads = [threading.Thread(target=self._dispatch_loop, name='job-dispatcher', daemon=True)]
+        self._threads += [
+            threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Job scheduler started: {', '.join(self.jobs)} on {self.workers} workers")
+
+    def stop(self):
+        """Stop dispatching, let workers finish their current run and release leases."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        for job in self.jobs.values():
+            if job.lease is not None and job.lease.is_leader:
+                job.lease.release()
+        logger.info("Job scheduler stopped")
+
+    def join(self):
+        """Block until every queued run finished (used by tests)."""
+        self._queue.join()
+
+    def _dispatch_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.dispatch()
+            except Exception as e:
+                logger.error(f"Job dispatcher error: {e}")
+            self._stop_event.wait(self.tick)
+
+    def dispatch(self, now=None):
+        """Queue every job that is due. Returns the names queued."""
+        now = now if now is not None else time.monotonic()
+        queued = []
+        for job in list(self.jobs.values()):
+            if now < job.next_run:
+                continue
+            if job.lease is not None:
+                # Check (and renew) the lease every poll interval; the lease row tracks the job interval
+                job.next_run = now + job.lease.poll_interval(job.interval)
+                with self.app.app_context():
+                    if job.active >= job.max_concurrency:
+                        job.lease.acquire()
+                        continue
+                    if not job.lease.due(job.interval):
+                        continue
+            else:
+                job.next_run = now + job.interval
+                if job.active >= job.max_concurrency:
+                    self._count(job, 'skipped_busy')
+                    continue
+            job.next_run += random.uniform(0, job.jitter) if job.jitter else 0
+            with self._lock:
+                job.active += 1
+            try:
+                self._queue.put_nowait(job)
+                queued.append(job.name)
+            except queue.Full:
+                with self._lock:
+                    job.active -= 1
+                self._count(job, 'skipped_queue_full')
+                logger.warning(f"Job queue full, skipped a {job.name} run")
+        return queued
+
+    def _count(self, job, key):
+        with self._lock:
+            job.counters[key] += 1
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            try:
+                job = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                self._execute(job)
+            except Exception as e:
+                logger.error(f"Job {job.name} crashed: {e}")
+            finally:
+                with self._lock:
+                    job.active -= 1
+                self._queue.task_done()
+
+    def _execute(self, job):
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        _local.job = job
+        _local.deadline = start + job.timeout if job.timeout else None
+        status, error, rows = 'succeeded', None, None
+        try:
+            if self.app is not None:
+                with self.app.app_context():
+                    result = job.func()
+            else:
+                result = job.func()
+            rows = result if isinstance(result, int) else None
+        except Exception as e:
+            status, error = 'failed', str(e)
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            _local.job = _local.deadline = None
+        seconds = time.perf_counter() - start
+        if status == 'succeeded' and job.timeout and seconds > job.timeout:
+            status = 'timeout'
+            logger.warning(f"Job {job.name} took {seconds:.1f}s, over its {job.timeout}s timeout")
+
+        with self._lock:
+            job.counters['runs'] += 1
+            job.counters['total_seconds'] += seconds
+            job.counters['last_seconds'] = seconds
+            job.counters['last_status'] = status
+            if status != 'succeeded':
+                job.counters[status] += 1
+        if self.app is not None:
+            with self.app.app_context():
+                if job.lease is not None:
+                    # Also after failures, so a failing job waits for its interval like any other
+                    job.lease.record_run(seconds, rows or 0)
+                record_run(job.name, self.holder, started_at, seconds, rows, status, error)
+
+    def stats(self):
+        """Per-job counters for this process."""
+        with self._lock:
+            return {
+                name: dict(job.counters, active=job.active, interval=job.interval,
+                           leader=job.lease.is_leader if job.lease is not None else None)
+                for name, job in self.jobs.items()
+            }
+
+
+def keep_going():
+    """Called by long jobs between batches. False once the run timed out or lost its lease.
+
+    Renews the job's lease. Outside a scheduled run it always returns True.
+    """
+    job = getattr(_local, 'job', None)
+    if job is None:
+        return True
+    if _local.deadline is not None and time.perf_counter() > _local.deadline:
+        logger.warning(f"Job {job.name} stopping early: past its {job.timeout}s timeout")
+        return False
+    if job.lease is not None:
+        return job.lease.acquire()
+    return True
+
+
+def record_run(name, holder, started_at, seconds, rows, status, error=None):
+    """Append a row to job_runs. Needs an app context."""
+    from models import db, JobRun
+
+    try:
+        db.session.add(JobRun(
+            job_name=name,
+            holder=holder,
+            started_at=started_at,
+            finished_at=started_at + timedelta(seconds=seconds),
+            duration_seconds=seconds,
+            rows_processed=rows,
+            status=status,
+            error=error[:2000] if error else None
+        ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error recording {name} run: {e}")
+
+
+def recent_runs(name=None, limit=20):
+    """Latest job_runs rows, newest first. Needs an app context."""
+    from models import JobRun
+
+    query = JobRun.query
+    if name:
+        query = query.filter_by(job_name=name)
+    return [{
+        'job': run.job_name,
+        'holder': run.holder,
+        'started_at': run.started_at.isoformat(),
+        'duration_seconds': run.duration_seconds,
+        'rows_processed': run.rows_processed,
+        'status': run.status,
+        'error': run.error
+    } for run in query.order_by(JobRun.started_at.desc(), JobRun.id.desc()).limit(limit)]
+
+
+def prune_runs(days=30):
+    """Delete job_runs rows older than ``days``. Needs an app context. Returns rows deleted."""
+    from models import db, JobRun
+
+    deleted = JobRun.query.filter(
+        JobRun.started_at < datetime.utcnow() - timedelta(days=days)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
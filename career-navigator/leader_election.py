@@ -0,0 +1,203 @@
+"""Database leases so only one process runs each periodic background job.
+
+Every gunicorn worker imports app.py and starts the Orchestrator and
+TaskScheduler loops, so N workers ran N identical plan scans per interval and
+raced on the same Plan.status updates. Each job now goes through a named row
+in scheduler_leases (job_scheduler creates one per job). The holder renews
+expires_at every ttl/3 seconds and runs the job when it is due. Every other
+process only tries to take the lease over, which succeeds once the holder has
+stopped renewing it, so failover happens within one lease period
+(SCHEDULER_LEASE_SECONDS). Taking and renewing are a single conditional
+UPDATE, so two processes never hold a lease at once.
+
+The row also records when the job last ran, so a new leader keeps the
+deployment-wide interval instead of running at once, plus how long the run took
+and how many rows it scanned. Followers add those rows up as scan rows saved.
+
+Expiry is compared in UTC against each host's clock, so clocks must agree to
+well within the lease period.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+
+from models import db, SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+# Leases created in this process, by name, for metrics()
+_leases = {}
+_leases_lock = threading.Lock()
+
+
+def default_holder():
+    """Identity of this process: host, pid and a nonce (pids are reused)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """A named lease in scheduler_leases that one process at a time may hold."""
+
+    def __init__(self, app, name, ttl=30, holder=None):
+        self.app = app
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or default_holder()
+        self.is_leader = False
+        self._next_local_run = None  # When this process would have run the job without a lease
+        self._lock = threading.Lock()
+        self._metrics = {
+            'acquired': 0,
+            'lost': 0,
+            'runs': 0,
+            'last_run_seconds': None,
+            'total_run_seconds': 0.0,
+            'rows_scanned': 0,
+            'skipped_runs': 0,
+            'rows_saved': 0
+        }
+        with _leases_lock:
+            _leases[name] = self
+
+    def poll_interval(self, interval):
+        """Seconds between ticks: often enough to renew the lease before it expires."""
+        return min(interval, max(self.ttl / 3, 1))
+
+    def acquire(self, now=None):
+        """Take or renew the lease. Needs an app context. Returns True while held."""
+        now = now or datetime.utcnow()
+        leases = SchedulerLease.__table__
+        expires = now + timedelta(seconds=self.ttl)
+        try:
+            # acquired_at first: MySQL applies SET clauses left to right
+            result = db.session.execute(
+                leases.update()
+                .where(leases.c.name == self.name,
+                       (leases.c.holder == self.holder) | (leases.c.expires_at < now))
+                .ordered_values(
+                    (leases.c.acquired_at, case((leases.c.holder == self.holder, leases.c.acquired_at), else_=now)),
+                    (leases.c.holder, self.holder),
+                    (leases.c.heartbeat_at, now),
+                    (leases.c.expires_at, expires)
+                )
+            )
+            held = result.rowcount == 1
+            if not held and db.session.query(SchedulerLease.name).filter_by(name=self.name).first() is None:
+                db.session.add(SchedulerLease(name=self.name, holder=self.holder, acquired_at=now,
+                                              heartbeat_at=now, expires_at=expires))
+                db.session.flush()
+                held = True
+            db.session.commit()
+        except IntegrityError:
+            # Another process created the row first
+            db.session.rollback()
+            held = False
+        self._set_leader(held)
+        return held
+
+    def _set_leader(self, held):
+        with self._lock:
+            if held and not self.is_leader:
+                self._metrics['acquired'] += 1
+                logger.info(f"{self.holder} is now the leader for {self.name}")
+            elif self.is_leader and not held:
+                self._metrics['lost'] += 1
+                logger.warning(f"{self.holder} lost the {self.name} lease")
+            self.is_leader = held
+
+    def due(self, interval, now=None):
+        """acquire(), then whether any holder last ran the job ``interval``+ seconds ago."""
+        now = now or datetime.utcnow()
+        if not self.acquire(now):
+            self._count_skip(interval, now)
+            return False
+        last_run = db.session.query(SchedulerLease.last_run_at).filter_by(name=self.name).scalar()
+        return last_run is None or (now - last_run).total_seconds() >= interval
+
+    def _count_skip(self, interval, now):
+        # Count each run this process would have made on its own schedule
+        if self._next_local_run is not None and now < self._next_local_run:
+            return
+        self._next_local_run = now + timedelta(seconds=interval)
+        rows = db.session.query(SchedulerLease.last_run_rows).filter_by(name=self.name).scalar()
+        with self._lock:
+            self._metrics['skipped_runs'] += 1
+            self._metrics['rows_saved'] += rows or 0
+
+    def record_run(self, seconds, rows=0, now=None):
+        """Store the finished run on the lease row. Returns False if the lease was lost meanwhile."""
+        now = now or datetime.utcnow()
+        leases = SchedulerLease.__table__
+        updated = db.session.execute(
+            leases.update()
+            .where(leases.c.name == self.name, leases.c.holder == self.holder)
+            .values(last_run_at=now, last_run_seconds=seconds, last_run_rows=rows)
+        ).rowcount
+        db.session.commit()
+        with self._lock:
+            self._metrics['runs'] += 1
+            self._metrics['last_run_seconds'] = seconds
+            self._metrics['total_run_seconds'] += seconds
+            self._metrics['rows_scanned'] += rows
+        if not updated:
+            logger.warning(f"{self.name} run finished after {self.holder} lost the lease ({seconds:.1f}s)")
+        return bool(updated)
+
+    def tick(self, interval, job):
+        """One loop iteration: hold the lease and run ``job()`` if it is due.
+
+        ``job`` returns the number of rows it scanned (or None). Returns the
+        seconds to wait before the next tick.
+        """
+        with self.app.app_context():
+            if self.due(interval):
+                started = time.perf_counter()
+                rows = job()
+                self.record_run(time.perf_counter() - started, rows or 0)
+        return self.poll_interval(interval)
+
+    def release(self):
+        """Give the lease up so another process takes over at its next tick."""
+        try:
+            with self.app.app_context():
+                leases = SchedulerLease.__table__
+                db.session.execute(
+                    leases.update()
+                    .where(leases.c.name == self.name, leases.c.holder == self.holder)
+                    .values(expires_at=datetime.utcnow())
+                )
+                db.session.commit()
+        except Exception as e:
+            logger.error(f"Error releasing {self.name} lease: {e}")
+        self._set_leader(False)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._metrics, holder=self.holder, is_leader=self.is_leader, ttl=self.ttl)
+
+
+def metrics():
+    """Lease rows (deployment-wide) plus this process's counters per lease. Needs an app context."""
+    now = datetime.utcnow()
+    with _leases_lock:
+        local = dict(_leases)
+    result = {}
+    for row in SchedulerLease.query.order_by(SchedulerLease.name):
+        result[row.name] = {
+            'holder': row.holder,
+            'expired': row.expires_at < now,
+            'heartbeat_at': row.heartbeat_at.isoformat(),
+            'last_run_at': row.last_run_at.isoformat() if row.last_run_at else None,
+            'last_run_seconds': row.last_run_seconds,
+            'last_run_rows': row.last_run_rows
+        }
+    for name, lease in local.items():
+        result.setdefault(name, {})['process'] = lease.stats()
+    return result
@@ -31,6 +31,10 @@ class User(UserMixin, db.Model):
 
 class Resume(db.Model):
     __tablename__ = 'resumes'
+    __table_args__ = (
+        # Latest resume per user: filter_by(user_id).order_by(uploaded_at.desc())
+        db.Index('ix_resumes_user_uploaded', 'user_id', 'uploaded_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -47,9 +51,66 @@ class Resume(db.Model):
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @classmethod
+    def from_parsed_data(cls, user_id, filename, file_path, parsed_data):
+        """Build a Resume from parser output, sanitizing text fields to avoid injected HTML"""
+        from security_utils import sanitize_text, sanitize_list
+        return cls(
+            user_id=user_id,
+            filename=filename,
+            file_path=file_path,
+            skills=sanitize_list(parsed_data.get('skills', [])),
+            experience_level=sanitize_text(parsed_data.get('experience_level', 'beginner')),
+            years_of_experience=int(parsed_data.get('years_of_experience', 0) or 0),
+            current_role=sanitize_text(parsed_data.get('current_role', 'Not specified')),
+            education=sanitize_text(parsed_data.get('education', 'Not specified'))
+        )
+
+
+class ResumeJob(db.Model):
+    __tablename__ = 'resume_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)  # Original upload name
+    file_path = db.Column(db.String(255), nullable=False)  # Stored (content-addressed) file
+    content_hash = db.Column(db.String(64), nullable=False)
+    file_ext = db.Column(db.String(10), nullable=False)
+
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'))
+    error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+
+class IngestJob(db.Model):
+    __tablename__ = 'ingest_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    archive_path = db.Column(db.String(255), nullable=False)  # Saved upload, removed when the job ends
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))  # Owner of every resume, unless match_email
+    match_email = db.Column(db.Boolean, default=False)
+    workers = db.Column(db.Integer)  # Parser processes (None = CPU count)
+
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    stats = db.Column(db.JSON)  # ingest_resumes() result
+    error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
 
 class Plan(db.Model):
     __tablename__ = 'plans'
+    __table_args__ = (
+        db.Index('ix_plans_user_status', 'user_id', 'status'),
+        # Scheduler scans: status == 'active' and last_updated older than a cutoff
+        db.Index('ix_plans_status_updated', 'status', 'last_updated'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -69,18 +130,41 @@ class Plan(db.Model):
     status = db.Column(db.String(50), default='active')  # active, completed, paused, updated
     last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     version = db.Column(db.Integer, default=1)  # Track plan versions for updates
+
+    # 'materialized': every day stored in daily_tasks and as a DailyProgress row.
+    # 'derived': the schedule is regenerated from goal/duration/experience_level
+    # and only days the user touched have DailyProgress rows (see plan_store).
+    storage_mode = db.Column(db.String(20), default='materialized', server_default='materialized')
+    experience_level = db.Column(db.String(50))
+    template_version = db.Column(db.Integer)  # planner.TEMPLATE_VERSION the plan was created with
+
+    # Denormalized progress, updated with each toggle (plan_store.record_toggle).
+    # NULL until initialized; plan_store.repair_plan_counters recomputes them.
+    completed_count = db.Column(db.Integer)
+    total_count = db.Column(db.Integer)
+    next_day_number = db.Column(db.Integer)  # First day not completed; NULL when all are done
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     daily_progress = db.relationship('DailyProgress', backref='plan', lazy=True, cascade='all, delete-orphan')
+    progress = db.relationship('Progress', backref='plan', uselist=False, cascade='all, delete-orphan')
 
 
 class Progress(db.Model):
+    # One summary row per plan, kept in step with the plan counters (plan_store)
     __tablename__ = 'progress'
+    __table_args__ = (
+        db.Index('ix_progress_user', 'user_id'),
+        db.Index('ux_progress_plan', 'plan_id', unique=True),
+        # Recently active users for suggestion precomputation
+        db.Index('ix_progress_last_updated', 'last_updated'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # NULL only on legacy per-user rows; plan_store.sync_progress_summaries replaces those
+    plan_id = db.Column(db.Integer, db.ForeignKey('plans.id'))
     
     total_days_planned = db.Column(db.Integer, default=0)
     total_days_completed = db.Column(db.Integer, default=0)
@@ -91,6 +175,12 @@ class Progress(db.Model):
 
 class DailyProgress(db.Model):
     __tablename__ = 'daily_progress'
+    __table_args__ = (
+        # Completion counts and the next open day: filter_by(plan_id, is_completed).order_by(day_number)
+        db.Index('ix_daily_progress_plan_completed_day', 'plan_id', 'is_completed', 'day_number'),
+        # One row per plan day; also serves plan_id-only scans ordered by day
+        db.Index('ux_daily_progress_plan_day', 'plan_id', 'day_number', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     plan_id = db.Column(db.Integer, db.ForeignKey('plans.id'), nullable=False)
@@ -118,3 +208,78 @@ class TechTrend(db.Model):
     last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     description = db.Column(db.Text)
     learn_resources = db.Column(db.JSON, default=list)  # Links to learning resources
+    professions = db.Column(db.JSON, default=list)  # Professions the technology is trending for
+
+
+class CatalogVersion(db.Model):
+    # Bumped with every catalog write so workers know to reload (see tech_catalog)
+    __tablename__ = 'catalog_versions'
+
+    name = db.Column(db.String(50), primary_key=True)  # 'tech_trends'
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SchedulerLease(db.Model):
+    # One row per periodic job; only the holder runs it (see leader_election)
+    __tablename__ = 'scheduler_leases'
+
+    name = db.Column(db.String(50), primary_key=True)  # 'task_scheduler', 'orchestrator'
+    holder = db.Column(db.String(120), nullable=False)  # host:pid:nonce of the leader
+    acquired_at = db.Column(db.DateTime, nullable=False)
+    heartbeat_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    last_run_at = db.Column(db.DateTime)
+    last_run_seconds = db.Column(db.Float)
+    last_run_rows = db.Column(db.Integer)  # Rows the last run scanned
+
+
+class JobRun(db.Model):
+    # Run history of the periodic jobs (see job_scheduler)
+    __tablename__ = 'job_runs'
+    __table_args__ = (
+        db.Index('ix_job_runs_job_started', 'job_name', 'started_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(50), nullable=False)
+    holder = db.Column(db.String(120))  # Process that ran it
+    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    finished_at = db.Column(db.DateTime)
+    duration_seconds = db.Column(db.Float)
+    rows_processed = db.Column(db.Integer)
+    status = db.Column(db.String(20), nullable=False)  # succeeded, failed, timeout
+    error = db.Column(db.Text)
+
+
+class SuggestionCache(db.Model):
+    # Cached /api/agent/suggestions result per user (see suggestion_cache)
+    __tablename__ = 'suggestion_cache'
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    # What the suggestions were computed from; any change is a miss
+    resume_id = db.Column(db.Integer)
+    plan_id = db.Column(db.Integer)
+    plan_version = db.Column(db.Integer)
+    catalog_version = db.Column(db.Integer)
+    suggestions = db.Column(db.JSON, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class ResumeParseCache(db.Model):
+    __tablename__ = 'resume_parse_cache'
+    __table_args__ = (
+        db.UniqueConstraint('content_hash', 'parser_version', name='uq_parse_cache_hash_version'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of the file bytes
+    parser_version = db.Column(db.String(20), nullable=False)
+    file_path = db.Column(db.String(255), nullable=False)  # Content-addressed copy in uploads/
+
+    result = db.Column(db.JSON, nullable=False)  # Output of parse_pdf_resume / parse_txt_resume
+    hit_count = db.Column(db.Integer, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_hit_at = db.Column(db.DateTime)
@@ -9,7 +9,10 @@ from tech_monitor import get_trending_technologies
 class Monitor:
     """Wraps tech_monitor functions for orchestrator use."""
 
-    def check_trends(self, profession: str = None, min_relevance: int = 80) -> Dict[str, Any]:
-        # Use existing tech_monitor.get_trending_technologies
-        trending = get_trending_technologies(profession, min_relevance)
+    def check_trends(self, profession: str = None, min_relevance: int = 80, context=None) -> Dict[str, Any]:
+        # Use existing tech_monitor.get_trending_technologies, through the pipeline context if given
+        if context is not None:
+            trending = context.trending(profession, min_relevance)
+        else:
+            trending = get_trending_technologies(profession, min_relevance)
         return {'trending': trending}
@@ -0,0 +1,107 @@
+"""Lazy, thread-safe spaCy model loader for resume parsing.
+
+The model is loaded on first use instead of at import, so processes that never
+parse a resume (scheduler, tests, idle workers) don't pay for it.
+
+Configuration (environment variables):
+    RESUME_NLP_ENABLED   - 'false' disables spaCy entirely (regex-only parsing)
+    RESUME_NLP_MODEL     - spaCy model name (default: en_core_web_sm)
+    RESUME_NLP_DISABLE   - comma-separated pipeline components to skip
+                           (default: parser,lemmatizer; only tokens are used)
+    RESUME_NLP_BATCH_SIZE - batch size for nlp.pipe (default: 32)
+    RESUME_NLP_PRELOAD   - 'true' loads the model at import time
+
+Call ``preload()`` in the gunicorn master (see gunicorn.conf.py) so forked
+workers share the model's memory pages copy-on-write.
+"""
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_nlp = None
+_loaded = False
+
+
+def _env_flag(name, default):
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
+def is_enabled():
+    """Whether spaCy should be used at all."""
+    return _env_flag('RESUME_NLP_ENABLED', 'true')
+
+
+def batch_size():
+    return int(os.getenv('RESUME_NLP_BATCH_SIZE', '32'))
+
+
+def _load():
+    """Load the configured spaCy pipeline; returns None if unavailable."""
+    try:
+        import spacy
+    except Exception:
+        return None
+
+    model = os.getenv('RESUME_NLP_MODEL', 'en_core_web_sm')
+    disable = [c.strip() for c in os.getenv('RESUME_NLP_DISABLE', 'parser,lemmatizer').split(',') if c.strip()]
+    try:
+        nlp = spacy.load(model, disable=disable)
+        logger.info(f"Loaded spaCy model {model} (disabled: {disable or 'none'})")
+        return nlp
+    except Exception as e:
+        # Model not installed; fallback to None
+        logger.warning(f"spaCy model {model} unavailable: {e}")
+        return None
+
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loading it on first use.
+
+    Returns None when spaCy is disabled, not installed or the model is missing.
+    """
+    global _nlp, _loaded
+    if _loaded:
+        return _nlp
+    if not is_enabled():
+        return None
+    with _lock:
+        if not _loaded:
+            _nlp = _load()
+            _loaded = True
+    return _nlp
+
+
+def is_loaded():
+    """Whether a load has been attempted (without triggering one)."""
+    return _loaded
+
+
+def preload():
+    """Eagerly load the model, e.g. in a pre-fork master process."""
+    return get_nlp()
+
+
+def pipe(texts):
+    """Yield spaCy docs for ``texts`` using batched ``nlp.pipe``; yields None per text without a model."""
+    nlp = get_nlp()
+    if nlp is None:
+        for _ in texts:
+            yield None
+        return
+    for doc in nlp.pipe((t or '' for t in texts), batch_size=batch_size()):
+        yield doc
+
+
+def reset():
+    """Forget the loaded model (used by tests and benchmarks)."""
+    global _nlp, _loaded
+    with _lock:
+        _nlp = None
+        _loaded = False
+
+
+if _env_flag('RESUME_NLP_PRELOAD', 'false'):
+    preload()
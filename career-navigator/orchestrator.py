@@ -1,21 +1,25 @@
 import threading
-import time
 from typing import Any, Dict
 
 from .skill_assessor import SkillAssessor
 from .recommender import Recommender
 from .monitor import Monitor
+from .pipeline import PipelineContext
 
 
 class Orchestrator:
     """Orchestrator to coordinate agents and manage real-time skill evolution.
 
-    - Runs a periodic loop to check for tech trends and suggest updates
+    - Checks tech trends periodically (run_once), as a job_scheduler job or in its own loop
     - Provides API to get suggestions and apply updates
+
+    Each orchestration shares one PipelineContext between the agents, so
+    lookups are memoized across them and every agent step is timed.
     """
 
     def __init__(self, poll_interval: int = 60):
         self.poll_interval = poll_interval
+        self.last_trends = None
         self._thread = None
         self._stop_event = threading.Event()
 
@@ -26,16 +30,43 @@ class Orchestrator:
     def _run_loop(self):
         while not self._stop_event.is_set():
             try:
-                # Check for tech trends periodically
-                trends = self.monitor.check_trends()
-                # Real-time logic: could fetch active users and update suggestions
-                time.sleep(0.1)
+                self.run_once()
             except Exception:
                 pass
             self._stop_event.wait(self.poll_interval)
 
+    def run_once(self) -> int:
+        """Check tech trends once and keep them in last_trends. Returns the number checked."""
+        context = PipelineContext()
+        with context.span('monitor'):
+            self.last_trends = self.monitor.check_trends(context=context)
+        context.log_timings('Trend check')
+        # Real-time logic: could fetch active users and update suggestions
+        return len(self.last_trends['trending'])
+
+    def precompute_suggestions(self, active_within: int = 86400, limit: int = 500) -> int:
+        """Refresh cached suggestions of recently active users. Needs an app context."""
+        import job_scheduler
+        import suggestion_cache
+
+        return suggestion_cache.precompute(
+            self.get_suggestions_for_users, active_within, limit,
+            refresh_within=self.poll_interval, keep_going=job_scheduler.keep_going
+        )
+
+    def register_jobs(self, scheduler, jitter: float = 0, timeout: float = None,
+                      precompute_limit: int = 0, active_within: int = 86400):
+        """Register run_once (and precompute_suggestions) on a job_scheduler.JobScheduler."""
+        scheduler.register('orchestrator', self.run_once, self.poll_interval, jitter=jitter, timeout=timeout)
+        if precompute_limit:
+            scheduler.register(
+                'precompute_suggestions',
+                lambda: self.precompute_suggestions(active_within, precompute_limit),
+                self.poll_interval, jitter=jitter, timeout=timeout
+            )
+
     def start(self):
-        """Start the orchestrator background thread."""
+        """Start the orchestrator's own background thread (without a JobScheduler)."""
         if self._thread and self._thread.is_alive():
             return
         self._stop_event.clear()
@@ -53,12 +84,15 @@ class Orchestrator:
         
         Orchestrates: Skill Assessment -> Recommendations
         """
+        context = PipelineContext(user_id)
         try:
             # Assess current skills
-            assessment = self.skill_assessor.assess_user(user_id)
+            with context.span('skill_assessor'):
+                assessment = self.skill_assessor.assess_user(user_id, context)
             
             # Generate recommendations
-            recommendations = self.recommender.recommend_for_user(user_id, assessment)
+            with context.span('recommender'):
+                recommendations = self.recommender.recommend_for_user(user_id, assessment, context)
             
             return {
                 'assessment': assessment,
@@ -66,6 +100,28 @@ class Orchestrator:
             }
         except Exception as e:
             return {'error': str(e)}
+        finally:
+            context.log_timings(f"Suggestions for user {user_id}")
+
+    def get_suggestions_for_users(self, user_ids) -> Dict[int, Dict[str, Any]]:
+        """get_suggestions_for_user() for many users, assessed in batches. Errors are raised.
+
+        The whole batch shares one PipelineContext, so users with the same
+        plan goal and technologies share their catalog work.
+        """
+        context = PipelineContext()
+        with context.span('skill_assessor'):
+            assessments = self.skill_assessor.assess_users(user_ids, context)
+        with context.span('recommender'):
+            results = {
+                user_id: {
+                    'assessment': assessment,
+                    'recommendations': self.recommender.recommend_for_user(user_id, assessment, context)
+                }
+                for user_id, assessment in assessments.items()
+            }
+        context.log_timings(f"Suggestions for {len(results)} users")
+        return results
 
     def apply_update(self, user_id: int, update_payload: Dict[str, Any]) -> Dict[str, Any]:
         """Apply an update to the user's plan.
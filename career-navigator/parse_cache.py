@@ -0,0 +1,127 @@
+"""Content-addressed resume storage and parse cache.
+
+Uploaded files are stored once under ``<upload_folder>/<hash[:2]>/<hash>.<ext>``
+and parse results are cached in ``ResumeParseCache`` keyed on the SHA-256 of
+the file bytes plus ``resume_parser.PARSER_VERSION``. Re-uploading the same
+resume skips pdfplumber and skill extraction entirely. Failed parses and PDFs
+cut short by the page time budget are not cached.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, ResumeParseCache
+from resume_parser import PARSER_VERSION, parse_pdf_resume, parse_txt_resume
+
+_CHUNK_SIZE = 64 * 1024
+
+# Per-process counters; ResumeParseCache.hit_count holds the deployment-wide total
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(key):
+    with _counters_lock:
+        _counters[key] += 1
+
+
+def content_path(upload_folder, content_hash, ext):
+    """Path of the content-addressed copy of a file."""
+    return os.path.join(upload_folder, content_hash[:2], f"{content_hash}.{ext}")
+
+
+def store_upload(file_storage, upload_folder, ext):
+    """Hash an uploaded file while writing it, storing each distinct file once.
+
+    Returns (content_hash, path).
+    """
+    os.makedirs(upload_folder, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file_storage.stream.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+
+        content_hash = digest.hexdigest()
+        path = content_path(upload_folder, content_hash, ext)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return content_hash, path
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _parse_file(path, ext):
+    return parse_pdf_resume(path) if ext == 'pdf' else parse_txt_resume(path)
+
+
+def get_or_parse(content_hash, path, ext):
+    """Return (parsed_data, cache_hit) for a stored file."""
+    cached = ResumeParseCache.query.filter_by(
+        content_hash=content_hash, parser_version=PARSER_VERSION
+    ).first()
+    if cached:
+        _count('hits')
+        result = dict(cached.result)
+        ResumeParseCache.query.filter_by(id=cached.id).update({
+            'hit_count': ResumeParseCache.hit_count + 1,
+            'last_hit_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        return result, True
+
+    _count('misses')
+    parsed = _parse_file(path, ext)
+    # Errors and time-truncated PDFs may parse fully next time
+    if 'error' not in parsed and not parsed.get('truncated'):
+        try:
+            db.session.add(ResumeParseCache(
+                content_hash=content_hash,
+                parser_version=PARSER_VERSION,
+                file_path=path,
+                result=parsed
+            ))
+            db.session.commit()
+        except IntegrityError:
+            # Another worker cached the same file concurrently
+            db.session.rollback()
+    return parsed, False
+
+
+def stats():
+    """Hit/miss counters for this process plus totals from the cache table."""
+    with _counters_lock:
+        hits, misses = _counters['hits'], _counters['misses']
+    lookups = hits + misses
+    entries, total_hits = db.session.query(
+        db.func.count(ResumeParseCache.id),
+        db.func.coalesce(db.func.sum(ResumeParseCache.hit_count), 0)
+    ).filter(ResumeParseCache.parser_version == PARSER_VERSION).one()
+    return {
+        'parser_version': PARSER_VERSION,
+        'process_hits': hits,
+        'process_misses': misses,
+        'process_hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+        'cached_entries': entries,
+        'total_hits': int(total_hits)
+    }
+
+
+def reset_counters():
+    with _counters_lock:
+        _counters['hits'] = 0
+        _counters['misses'] = 0
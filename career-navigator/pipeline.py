@@ -0,0 +1,105 @@
+"""Per-orchestration context shared by the agents.
+
+One PipelineContext lives for one Orchestrator call (a user's suggestions,
+a precompute batch, a trend check). The SkillAssessor, Recommender and
+Monitor read through it, so a catalog lookup, a DB entity or an
+intermediate result is computed once per orchestration however many agents
+ask for it. Trending lookups for a profession are served from the
+lowest-threshold list fetched so far; 80 and 85 are filtered from the 75
+list instead of being looked up again.
+
+span() times each agent step. Spans are kept on the context and added to
+per-process totals that span_stats() reports.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tech_monitor import get_trending_technologies
+
+logger = logging.getLogger(__name__)
+
+# span name -> [count, total ms, max ms], for this process
+_span_totals = {}
+_span_lock = threading.Lock()
+
+
+class PipelineContext:
+    """Memoized lookups and timing spans for one orchestration."""
+
+    def __init__(self, user_id: int = None):
+        self.user_id = user_id
+        self.spans = []  # (name, milliseconds) in completion order
+        self._memo = {}
+        self._trending = {}  # profession -> (min_relevance, trending list)
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """compute() the first time ``key`` is asked for, the stored value after that."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """The memoized value for ``key`` without computing it."""
+        return self._memo.get(key, default)
+
+    def trending(self, profession: str = None, min_relevance: int = 75) -> list:
+        """get_trending_technologies(profession, min_relevance), looked up once per profession."""
+        cached = self._trending.get(profession)
+        if cached is None or min_relevance < cached[0]:
+            cached = self._trending[profession] = (min_relevance, get_trending_technologies(profession, min_relevance))
+        threshold, trending = cached
+        if min_relevance == threshold:
+            return trending
+        # Sorted by relevance: the stricter list is a prefix
+        return [tech for tech in trending if tech['relevance'] >= min_relevance]
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed agent step."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.spans.append((name, elapsed))
+            with _span_lock:
+                totals = _span_totals.setdefault(name, [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += elapsed
+                totals[2] = max(totals[2], elapsed)
+
+    def timings(self) -> Dict[str, float]:
+        """Milliseconds per span name in this orchestration."""
+        result = {}
+        for name, elapsed in self.spans:
+            result[name] = result.get(name, 0.0) + elapsed
+        return result
+
+    def log_timings(self, what: str):
+        logger.debug(f"{what}: " + ', '.join(f"{name} {ms:.1f} ms" for name, ms in self.timings().items()))
+
+
+def span_stats() -> Dict[str, Dict[str, float]]:
+    """Count, total, average and maximum milliseconds per span name in this process."""
+    with _span_lock:
+        totals = {name: list(values) for name, values in _span_totals.items()}
+    return {
+        name: {
+            'count': count,
+            'total_ms': round(total, 3),
+            'avg_ms': round(total / count, 3) if count else 0.0,
+            'max_ms': round(longest, 3)
+        }
+        for name, (count, total, longest) in totals.items()
+    }
+
+
+def reset_span_stats():
+    with _span_lock:
+        _span_totals.clear()
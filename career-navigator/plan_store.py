@@ -0,0 +1,496 @@
+"""Persisting generated plans and reading their day-by-day schedule.
+
+Plans are stored in one of two modes (Plan.storage_mode):
+
+* ``materialized`` - the full day list is kept in Plan.daily_tasks and as
+  one DailyProgress row per day. The rows go in with a single executemany
+  INSERT, and the whole plan is written in one transaction.
+* ``derived`` - only the plan parameters are stored. The schedule is
+  regenerated from (goal, duration_months, experience_level,
+  template_version) through the planner's cached skeleton, and a
+  DailyProgress row is written only when the user touches a day (completes
+  it, logs hours or notes). Reads merge the derived schedule with these
+  sparse rows. template_version pins the planner tables the plan was
+  created from, so a template change only affects new plans.
+
+Plans keep the mode they were created with; PLAN_STORAGE_MODE picks the
+mode for new plans.
+
+Plan.completed_count / total_count / next_day_number are kept up to date by
+record_toggle() in the same transaction as each progress change, so progress
+reads and updates do not count rows. repair_plan_counters() recomputes them
+in bulk (for plans created before the counters existed, or after drift).
+Each plan's Progress row mirrors its counters (completed/planned days and
+percentage) and is updated by the same statements, so a user's summary
+across plans is one indexed query.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, case, exists, func, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Plan, DailyProgress, Progress
+from planner import TEMPLATE_VERSION, get_plan_days, plan_length
+
+STORAGE_MATERIALIZED = 'materialized'
+STORAGE_DERIVED = 'derived'
+STORAGE_MODES = (STORAGE_MATERIALIZED, STORAGE_DERIVED)
+
+
+def daily_progress_rows(plan_id, daily_tasks, start_date, now=None):
+    """Column dicts for the DailyProgress rows of a plan."""
+    now = now or datetime.utcnow()
+    return [
+        {
+            'plan_id': plan_id,
+            'day_number': task['day'],
+            'task': task['task'],
+            'planned_date': start_date + timedelta(days=task['day']),
+            'is_completed': False,
+            'hours_spent': 0,
+            'created_at': now,
+            'updated_at': now
+        }
+        for task in daily_tasks
+    ]
+
+
+def store_plan(user_id, resume_id, goal, duration_months, plan_content, start_date=None,
+               experience_level=None, storage_mode=STORAGE_MATERIALIZED):
+    """Insert a generated plan and its progress tracker in one transaction.
+
+    Materialized plans also get every daily row; derived plans get none.
+    Returns the new plan's id. Rolls back and re-raises on failure, so a plan is
+    never left without its daily rows.
+    """
+    if storage_mode not in STORAGE_MODES:
+        raise ValueError(f'Unknown plan storage mode: {storage_mode}')
+    materialized = storage_mode == STORAGE_MATERIALIZED
+    start_date = start_date or datetime.now()
+    try:
+        plan = Plan(
+            user_id=user_id,
+            resume_id=resume_id,
+            goal=goal,
+            duration_months=duration_months,
+            start_date=start_date,
+            end_date=start_date + timedelta(days=plan_content['total_days']),
+            daily_tasks=plan_content['daily_tasks'] if materialized else [],
+            milestones=plan_content['milestones'],
+            technologies=plan_content['technologies'],
+            storage_mode=storage_mode,
+            experience_level=experience_level,
+            template_version=TEMPLATE_VERSION,
+            completed_count=0,
+            total_count=len(plan_content['daily_tasks']),
+            next_day_number=1 if plan_content['daily_tasks'] else None
+        )
+        db.session.add(plan)
+        db.session.flush()  # Assigns plan.id without committing
+        plan_id = plan.id
+
+        if materialized:
+            rows = daily_progress_rows(plan_id, plan_content['daily_tasks'], start_date)
+            if rows:
+                db.session.execute(db.insert(DailyProgress), rows)
+
+        db.session.add(Progress(
+            user_id=user_id,
+            plan_id=plan_id,
+            total_days_planned=len(plan_content['daily_tasks']),
+            total_days_completed=0,
+            completion_percentage=0.0
+        ))
+        db.session.commit()
+        return plan_id
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def is_derived(plan):
+    return plan.storage_mode == STORAGE_DERIVED
+
+
+def _template_version(version):
+    # Derived plans always record their version; 1 is the only one older rows can have
+    return version or 1
+
+
+def _schedule(plan, start_day=1, count=None):
+    """Days of a derived plan, regenerated from its stored parameters and template version."""
+    # The user's skills only affect 'technologies', not the schedule
+    return get_plan_days(plan.goal, plan.duration_months, plan.experience_level, start_day, count,
+                         version=_template_version(plan.template_version))
+
+
+def _length(goal, duration_months, experience_level, template_version):
+    return plan_length(goal, duration_months, experience_level, version=_template_version(template_version))
+
+
+# Fields of a day entry, and the DailyProgress column each one is read from
+DAY_FIELDS = ('id', 'day', 'task', 'completed', 'date', 'hours_spent', 'notes', 'completed_date')
+_FIELD_COLUMNS = {
+    'id': 'id',
+    'day': 'day_number',
+    'task': 'task',
+    'completed': 'is_completed',
+    'date': 'planned_date',
+    'hours_spent': 'hours_spent',
+    'notes': 'notes',
+    'completed_date': 'completed_date'
+}
+_DATE_FIELDS = frozenset(['date', 'completed_date'])
+
+
+def _row_entry(row, fields=DAY_FIELDS):
+    """Entry for a DailyProgress row (or a Row holding the fields' columns)."""
+    entry = {}
+    for field in fields:
+        value = getattr(row, _FIELD_COLUMNS[field])
+        entry[field] = value.isoformat() if field in _DATE_FIELDS and value else value
+    return entry
+
+
+def _derived_entry(plan, day, fields=DAY_FIELDS):
+    entry = {
+        'id': None,
+        'day': day['day'],
+        'task': day['task'],
+        'completed': False,
+        'date': (plan.start_date + timedelta(days=day['day'])).isoformat(),
+        'hours_spent': 0,
+        'notes': None,
+        'completed_date': None
+    }
+    return {field: entry[field] for field in fields}
+
+
+def _day_rows(plan, fields):
+    """Query over the plan's rows selecting only the columns ``fields`` need."""
+    columns = {'day_number'} | {_FIELD_COLUMNS[f] for f in fields}
+    return db.session.query(*(getattr(DailyProgress, c) for c in sorted(columns))).filter(
+        DailyProgress.plan_id == plan.id
+    )
+
+
+def plan_days(plan, after_day=0, limit=None, fields=DAY_FIELDS):
+    """Day entries after ``after_day`` in day order (keyset pagination on day_number).
+
+    Stored rows are merged over the derived schedule. Only the columns behind
+    ``fields`` are loaded.
+    """
+    if not is_derived(plan):
+        query = _day_rows(plan, fields).filter(DailyProgress.day_number > after_day).order_by(DailyProgress.day_number)
+        if limit is not None:
+            query = query.limit(limit)
+        return [_row_entry(row, fields) for row in query]
+
+    window = _schedule(plan, after_day + 1, limit)
+    if not window:
+        return []
+    overrides = {
+        row.day_number: row
+        for row in _day_rows(plan, fields).filter(
+            DailyProgress.day_number.between(window[0]['day'], window[-1]['day'])
+        )
+    }
+    return [
+        _row_entry(overrides[day['day']], fields) if day['day'] in overrides else _derived_entry(plan, day, fields)
+        for day in window
+    ]
+
+
+def day_entry(plan, day_number):
+    """One day's entry, or None if the day is not part of the plan."""
+    row = DailyProgress.query.filter_by(plan_id=plan.id, day_number=day_number).first()
+    if row:
+        return _row_entry(row)
+    if is_derived(plan):
+        days = _schedule(plan, day_number, 1)
+        return _derived_entry(plan, days[0]) if days and day_number >= 1 else None
+    return None
+
+
+def _counters_ready(plan):
+    return plan.total_count is not None and plan.completed_count is not None
+
+
+def day_count(plan):
+    if _counters_ready(plan):
+        return plan.total_count
+    if is_derived(plan):
+        return _length(plan.goal, plan.duration_months, plan.experience_level, plan.template_version)
+    return DailyProgress.query.filter_by(plan_id=plan.id).count()
+
+
+def completed_count(plan):
+    if _counters_ready(plan):
+        return plan.completed_count
+    return DailyProgress.query.filter_by(plan_id=plan.id, is_completed=True).count()
+
+
+def _next_open_query(plan, day_number):
+    """Scalar subquery: smallest day after ``day_number`` that is not completed, or NULL.
+
+    Derived plans only have rows for touched days, so an open day need not
+    have a row: the answer is day_number + 1 or the day after a completed
+    one, whichever is smallest without a completed row of its own.
+    """
+    rows = DailyProgress.__table__
+    done = (rows.c.plan_id == plan.id) & (rows.c.is_completed == True)  # noqa: E712
+    candidates = union_all(
+        select(literal(day_number + 1).label('day_number')),
+        select((rows.c.day_number + 1).label('day_number')).where(done, rows.c.day_number > day_number)
+    ).subquery()
+    return select(func.min(candidates.c.day_number)).where(
+        candidates.c.day_number <= day_count(plan),
+        candidates.c.day_number.not_in(select(rows.c.day_number).where(done))
+    ).scalar_subquery()
+
+
+def _next_open_after(plan, day_number):
+    """Smallest day after ``day_number`` that is not completed, or None."""
+    return db.session.execute(select(_next_open_query(plan, day_number))).scalar()
+
+
+def next_open_day(plan):
+    """First day (by day number) that is not completed, or None."""
+    if _counters_ready(plan):
+        return day_entry(plan, plan.next_day_number) if plan.next_day_number else None
+    next_day = _next_open_after(plan, 0)
+    return day_entry(plan, next_day) if next_day else None
+
+
+def record_toggle(plan, progress, is_completed):
+    """Set one day's completion and apply the change to the plan counters.
+
+    The day is flipped with a conditional UPDATE and the counters only move
+    when that UPDATE changed the row, so two requests toggling the same day
+    at once count it once. Runs in the caller's transaction; the caller
+    commits. Returns whether the day changed.
+    """
+    is_completed = bool(is_completed)
+    db.session.flush()
+    rows = DailyProgress.__table__
+    flipped = db.session.execute(
+        rows.update().where(rows.c.id == progress.id, func.coalesce(rows.c.is_completed, False) != is_completed)
+        .values(is_completed=is_completed)
+    ).rowcount == 1
+    db.session.expire(progress, ['is_completed'])
+    if not _counters_ready(plan):
+        repair_plan_counters([plan.id])
+        return flipped
+    if not flipped:
+        return False
+
+    day_number = progress.day_number
+    plans = Plan.__table__
+    progress = Progress.__table__
+    delta = 1 if is_completed else -1
+    completed = progress.c.total_days_completed + delta
+    db.session.execute(
+        progress.update().where(progress.c.plan_id == plan.id).values(
+            total_days_completed=completed,
+            completion_percentage=_percentage(completed, progress.c.total_days_planned)
+        )
+    )
+    # Keep last_updated: it tracks tech-update checks, not progress
+    if is_completed:
+        # The next open day moves on only if it was this day, as stored now
+        db.session.execute(
+            plans.update().where(plans.c.id == plan.id)
+            .values(
+                completed_count=plans.c.completed_count + 1,
+                next_day_number=case(
+                    (plans.c.next_day_number == day_number, _next_open_query(plan, day_number)),
+                    else_=plans.c.next_day_number
+                ),
+                last_updated=plans.c.last_updated
+            )
+        )
+    else:
+        db.session.execute(
+            plans.update().where(plans.c.id == plan.id)
+            .values(
+                completed_count=plans.c.completed_count - 1,
+                next_day_number=case(
+                    (plans.c.next_day_number.is_(None) | (plans.c.next_day_number > day_number), day_number),
+                    else_=plans.c.next_day_number
+                ),
+                last_updated=plans.c.last_updated
+            )
+        )
+    db.session.expire(plan, ['completed_count', 'next_day_number'])
+    return True
+
+
+def repair_plan_counters(plan_ids=None, only_missing=False, chunk_size=500):
+    """Recompute completed/total/next-day counters in bulk. Returns plans updated.
+
+    Works through plans in id order, chunk_size at a time, with one grouped
+    query per chunk for the counts and one executemany UPDATE.
+    """
+    plans = Plan.__table__
+    updated = 0
+    last_id = 0
+    while True:
+        query = db.session.query(
+            Plan.id, Plan.storage_mode, Plan.goal, Plan.duration_months, Plan.experience_level,
+            Plan.template_version
+        ).filter(Plan.id > last_id)
+        if plan_ids is not None:
+            query = query.filter(Plan.id.in_(plan_ids))
+        if only_missing:
+            query = query.filter(Plan.total_count.is_(None) | Plan.completed_count.is_(None))
+        chunk = query.order_by(Plan.id).limit(chunk_size).all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+        ids = [p.id for p in chunk]
+
+        stats = {
+            plan_id: (rows or 0, done or 0)
+            for plan_id, rows, done in db.session.query(
+                DailyProgress.plan_id,
+                func.count(DailyProgress.id),
+                func.sum(case((DailyProgress.is_completed == True, 1), else_=0))  # noqa: E712
+            ).filter(DailyProgress.plan_id.in_(ids)).group_by(DailyProgress.plan_id)
+        }
+        first_open = dict(
+            db.session.query(DailyProgress.plan_id, func.min(DailyProgress.day_number))
+            .filter(DailyProgress.plan_id.in_(ids), DailyProgress.is_completed == False)  # noqa: E712
+            .group_by(DailyProgress.plan_id)
+        )
+        completed_days = {}
+        for plan_id, day in db.session.query(DailyProgress.plan_id, DailyProgress.day_number).filter(
+            DailyProgress.plan_id.in_([p.id for p in chunk if p.storage_mode == STORAGE_DERIVED]),
+            DailyProgress.is_completed == True  # noqa: E712
+        ):
+            completed_days.setdefault(plan_id, set()).add(day)
+
+        values = []
+        for p in chunk:
+            rows, done = stats.get(p.id, (0, 0))
+            if p.storage_mode == STORAGE_DERIVED:
+                total = _length(p.goal, p.duration_months, p.experience_level, p.template_version)
+                done_days = completed_days.get(p.id, set())
+                next_day = next((d for d in range(1, total + 1) if d not in done_days), None)
+            else:
+                total = rows
+                next_day = first_open.get(p.id)
+            values.append({'pid': p.id, 'done': done, 'total': total, 'next_day': next_day})
+
+        db.session.execute(
+            plans.update().where(plans.c.id == bindparam('pid')).values(
+                completed_count=bindparam('done'),
+                total_count=bindparam('total'),
+                next_day_number=bindparam('next_day'),
+                last_updated=plans.c.last_updated
+            ),
+            values
+        )
+        sync_progress_summaries(ids)
+        updated += len(values)
+    if updated:
+        db.session.expire_all()
+    return updated
+
+
+def _percentage(completed, total):
+    return case((total > 0, completed * 100.0 / total), else_=0.0)
+
+
+def sync_progress_summaries(plan_ids=None, refresh=True):
+    """Bring Progress rows in line with the plan counters. Returns the number of rows created.
+
+    Creates the missing row of any plan with counters and, when called for all
+    plans, deletes legacy per-user rows (plan_id NULL). With ``refresh``,
+    existing rows are also rewritten from the counters. Runs in the caller's
+    transaction; the caller commits.
+    """
+    plans = Plan.__table__
+    progress = Progress.__table__
+    has_summary = exists().where(progress.c.plan_id == plans.c.id)
+    missing = select(
+        plans.c.user_id, plans.c.id, plans.c.total_count, plans.c.completed_count,
+        _percentage(plans.c.completed_count, plans.c.total_count), func.now()
+    ).where(plans.c.total_count.isnot(None), plans.c.completed_count.isnot(None), ~has_summary)
+    if plan_ids is not None:
+        missing = missing.where(plans.c.id.in_(plan_ids))
+    created = db.session.execute(progress.insert().from_select(
+        ['user_id', 'plan_id', 'total_days_planned', 'total_days_completed', 'completion_percentage', 'last_updated'],
+        missing
+    )).rowcount
+
+    if plan_ids is None:
+        db.session.execute(progress.delete().where(progress.c.plan_id.is_(None)))
+    if not refresh:
+        return created
+
+    def plan_value(column):
+        return select(column).where(plans.c.id == progress.c.plan_id).scalar_subquery()
+
+    update = progress.update().where(
+        progress.c.plan_id.isnot(None),
+        exists().where(plans.c.id == progress.c.plan_id, plans.c.total_count.isnot(None))
+    ).values(
+        total_days_planned=plan_value(plans.c.total_count),
+        total_days_completed=plan_value(plans.c.completed_count),
+        completion_percentage=plan_value(_percentage(plans.c.completed_count, plans.c.total_count))
+    )
+    if plan_ids is not None:
+        update = update.where(progress.c.plan_id.in_(plan_ids))
+    db.session.execute(update)
+    return created
+
+
+def progress_summary(user_id):
+    """Per-plan progress of a user's plans, from their Progress rows in one query."""
+    rows = db.session.query(
+        Plan.id, Plan.goal, Plan.status, Plan.next_day_number,
+        Progress.total_days_planned, Progress.total_days_completed,
+        Progress.completion_percentage, Progress.last_updated
+    ).join(Plan, Plan.id == Progress.plan_id).filter(Progress.user_id == user_id).order_by(Plan.id)
+    return [
+        {
+            'plan_id': row.id,
+            'goal': row.goal,
+            'status': row.status,
+            'next_day': row.next_day_number,
+            'total_days_planned': row.total_days_planned,
+            'total_days_completed': row.total_days_completed,
+            'completion_percentage': row.completion_percentage,
+            'last_updated': row.last_updated.isoformat() if row.last_updated else None
+        }
+        for row in rows
+    ]
+
+
+def get_or_create_day(plan, day_number):
+    """DailyProgress row for a day, created on first touch for derived plans.
+
+    Returns None if the day is not part of the plan. A new row is flushed in a
+    savepoint but not committed; if a concurrent request created the same day
+    first, its row is returned instead.
+    """
+    row = DailyProgress.query.filter_by(plan_id=plan.id, day_number=day_number).first()
+    if row or not is_derived(plan):
+        return row
+
+    days = _schedule(plan, day_number, 1) if day_number >= 1 else []
+    if not days:
+        return None
+    row = DailyProgress(
+        plan_id=plan.id,
+        day_number=day_number,
+        task=days[0]['task'],
+        planned_date=plan.start_date + timedelta(days=day_number)
+    )
+    try:
+        with db.session.begin_nested():
+            db.session.add(row)
+    except IntegrityError:
+        # Lost the race on ux_daily_progress_plan_day
+        return DailyProgress.query.filter_by(plan_id=plan.id, day_number=day_number).first()
+    return row
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 import json
 
 # Profession-specific learning paths
@@ -406,6 +407,135 @@ PROFESSION_PATHS = {
 
 
 
+# Version of the schedule tables new plans are generated from. To change a
+# schedule, add a new entry to SCHEDULE_TABLES (see the end of this module) and
+# bump this; never edit the tables of a version already in use, because
+# derived plans are rebuilt on every read from the version they were stored with.
+TEMPLATE_VERSION = 1
+
+# Task suggestions per focus area; a phase cycles through its list day by day
+TASK_TEMPLATES = {
+    'Python Fundamentals': [
+        'Learn variables, data types, and basic operations',
+        'Practice control flow: if/else statements',
+        'Master loops: for and while loops with exercises',
+        'Build functions: definition, parameters, return values',
+        'Work on list and dictionary operations',
+        'Understand strings and string manipulation',
+        'Practice with 5-10 small coding challenges',
+        'Build a simple calculator program'
+    ],
+    'Web Development Basics (HTML/CSS)': [
+        'Learn HTML semantic elements and structure',
+        'Build a personal portfolio webpage',
+        'Master CSS selectors and styling',
+        'Create a multi-page website with navigation',
+        'Practice CSS flexbox and grid layout',
+        'Implement responsive design with media queries',
+        'Build a landing page with animations'
+    ],
+    'JavaScript & Frontend': [
+        'Learn JavaScript variables and data types',
+        'Master JavaScript DOM manipulation',
+        'Build interactive web components',
+        'Learn event handling and callbacks',
+        'Understand array methods and ES6 features',
+        'Build a todo app with JavaScript',
+        'Learn async/await and promises'
+    ],
+    'Backend & Databases': [
+        'Learn SQL basics: SELECT, INSERT, UPDATE, DELETE',
+        'Design database schemas and relationships',
+        'Build REST APIs with Flask/Django',
+        'Implement database migrations',
+        'Learn about authentication and security',
+        'Build a complete backend with user system'
+    ],
+    'Python & Data Manipulation': [
+        'Master Python NumPy arrays and operations',
+        'Learn Pandas data frames and series',
+        'Practice data cleaning and preprocessing',
+        'Work with CSV and JSON files',
+        'Create data visualizations with Matplotlib'
+    ],
+    'Machine Learning Algorithms': [
+        'Understand linear regression from scratch',
+        'Learn logistic regression and classification',
+        'Master decision trees and random forests',
+        'Study neural networks basics',
+        'Implement algorithms from scratch',
+        'Use scikit-learn for practical ML'
+    ]
+}
+
+
+def _match_templates(focus_area):
+    """Return the task list for a focus area, falling back to substring matching."""
+    if focus_area in TASK_TEMPLATES:
+        return TASK_TEMPLATES[focus_area]
+    lower_focus = focus_area.lower()
+    for tmpl_key, tasks in TASK_TEMPLATES.items():
+        if tmpl_key.lower() in lower_focus or lower_focus in tmpl_key.lower():
+            return tasks
+    return None
+
+
+def _parse_week_range(week_range):
+    """'weeks_3_4' -> (3, 4); malformed keys count as a single 2-week block."""
+    parts = week_range.split('_')
+    try:
+        return int(parts[1]), int(parts[2])
+    except Exception:
+        return 1, 2
+
+
+def _compile_phases(daily_distribution):
+    """Turn a daily_distribution dict into (focus, hours, days, tasks) rows."""
+    phases = []
+    for week_range, week_data in daily_distribution.items():
+        start_week, end_week = _parse_week_range(week_range)
+        focus = week_data['focus']
+        tasks = _match_templates(focus)
+        phases.append((
+            focus,
+            week_data['daily_hours'],
+            (end_week - start_week + 1) * 7,
+            tuple(tasks) if tasks else None
+        ))
+    return tuple(phases)
+
+
+# Week ranges parsed and focus areas resolved to task lists once, at import
+PHASE_TABLES = {key: _compile_phases(path['daily_distribution']) for key, path in PROFESSION_PATHS.items()}
+
+
+def _schedule_tables(version):
+    try:
+        return SCHEDULE_TABLES[version]
+    except KeyError:
+        raise ValueError(f"Unknown plan template version: {version}")
+
+
+@lru_cache(maxsize=256)
+def _plan_skeleton(profession_key, duration_months, experience_level, version):
+    """Day rows (day, task, focus, hours, difficulty) shared by every user with these inputs.
+
+    experience_level is part of the key so level-specific tasks can be added
+    without invalidating callers; it does not change the schedule today.
+    """
+    total_days = duration_months * 30  # Approximate
+    rows = []
+    current_day = 0
+    for focus, daily_hours, days_in_phase, tasks in _schedule_tables(version)['phases'][profession_key]:
+        for day in range(1, days_in_phase + 1):
+            current_day += 1
+            if current_day > total_days:
+                return tuple(rows)
+            task = tasks[(day - 1) % len(tasks)] if tasks else f"Work on {focus} - Day {day}"
+            rows.append((current_day, task, focus, daily_hours, calculate_difficulty(current_day, total_days)))
+    return tuple(rows)
+
+
 def generate_daily_plan(profession, duration_months, current_skills, experience_level):
     """
     Generate a detailed day-by-day learning plan
@@ -425,131 +555,68 @@ def generate_daily_plan(profession, duration_months, current_skills, experience_
         return generate_generic_plan(profession, duration_months)
     
     profession_data = PROFESSION_PATHS[profession_key]
-    total_days = duration_months * 30  # Approximate
-    
-    daily_tasks = []
+    skeleton = _plan_skeleton(profession_key, duration_months, (experience_level or '').lower(), TEMPLATE_VERSION)
+
+    # Only the skill filtering is per user; the schedule comes from the cached skeleton
     technologies_to_learn = [
         skill for skill in profession_data['skills_required']
         if skill not in current_skills
     ]
     
-    # Distribute tasks across days
-    task_distribution = profession_data['daily_distribution']
-    current_day = 0
-    
-    for week_range, week_data in task_distribution.items():
-        # week_range format: 'weeks_1_2', 'weeks_3_4', etc.
-        parts = week_range.split('_')
-        try:
-            start_week = int(parts[1])
-            end_week = int(parts[2])
-        except Exception:
-            # fallback: assume single 2-week block
-            start_week, end_week = 1, 2
-
-        weeks = end_week - start_week + 1
-        days_in_phase = weeks * 7
-        focus = week_data['focus']
-        daily_hours = week_data['daily_hours']
+    return {
+        'total_days': duration_months * 30,
+        'daily_tasks': [_day_dict(row) for row in skeleton],
+        'technologies': technologies_to_learn,
+        'milestones': [dict(m) for m in profession_data['milestones']]
+    }
 
-        for day in range(days_in_phase):
-            current_day += 1
 
-            # Generate specific task based on phase
-            task = generate_specific_task(
-                focus,
-                day + 1,
-                current_skills,
-                experience_level
-            )
-
-            daily_tasks.append({
-                'day': current_day,
-                'task': task,
-                'focus_area': focus,
-                'recommended_hours': daily_hours,
-                'difficulty': calculate_difficulty(current_day, total_days)
-            })
-    
+def _day_dict(row):
+    day, task, focus, hours, difficulty = row
     return {
-        'total_days': total_days,
-        'daily_tasks': daily_tasks[:total_days],  # Trim to exact duration
-        'technologies': technologies_to_learn,
-        'milestones': profession_data['milestones']
+        'day': day,
+        'task': task,
+        'focus_area': focus,
+        'recommended_hours': hours,
+        'difficulty': difficulty
     }
 
 
+def get_plan_days(profession, duration_months, experience_level, start_day=1, count=None, version=None):
+    """Days start_day.. of generate_daily_plan()['daily_tasks'] without building the rest.
+
+    ``version`` picks the template version the plan was generated from
+    (default: TEMPLATE_VERSION).
+    """
+    version = TEMPLATE_VERSION if version is None else version
+    tables = _schedule_tables(version)
+    start_day = max(start_day, 1)
+    profession_key = profession.lower()
+    if profession_key not in tables['phases']:
+        total_days = duration_months * 30
+        end_day = total_days if count is None else min(total_days, start_day + count - 1)
+        return [_generic_day(profession, day, total_days, tables['generic']) for day in range(start_day, end_day + 1)]
+
+    skeleton = _plan_skeleton(profession_key, duration_months, (experience_level or '').lower(), version)
+    rows = skeleton[start_day - 1:None if count is None else start_day - 1 + count]
+    return [_day_dict(row) for row in rows]
+
+
+def plan_length(profession, duration_months, experience_level, version=None):
+    """Number of days generate_daily_plan() would return (for template ``version``)."""
+    version = TEMPLATE_VERSION if version is None else version
+    profession_key = profession.lower()
+    if profession_key not in _schedule_tables(version)['phases']:
+        return duration_months * 30
+    return len(_plan_skeleton(profession_key, duration_months, (experience_level or '').lower(), version))
+
+
 def generate_specific_task(focus_area, day_in_phase, current_skills, experience_level):
     """Generate specific task based on focus area"""
-    
-    task_templates = {
-        'Python Fundamentals': [
-            'Learn variables, data types, and basic operations',
-            'Practice control flow: if/else statements',
-            'Master loops: for and while loops with exercises',
-            'Build functions: definition, parameters, return values',
-            'Work on list and dictionary operations',
-            'Understand strings and string manipulation',
-            'Practice with 5-10 small coding challenges',
-            'Build a simple calculator program'
-        ],
-        'Web Development Basics (HTML/CSS)': [
-            'Learn HTML semantic elements and structure',
-            'Build a personal portfolio webpage',
-            'Master CSS selectors and styling',
-            'Create a multi-page website with navigation',
-            'Practice CSS flexbox and grid layout',
-            'Implement responsive design with media queries',
-            'Build a landing page with animations'
-        ],
-        'JavaScript & Frontend': [
-            'Learn JavaScript variables and data types',
-            'Master JavaScript DOM manipulation',
-            'Build interactive web components',
-            'Learn event handling and callbacks',
-            'Understand array methods and ES6 features',
-            'Build a todo app with JavaScript',
-            'Learn async/await and promises'
-        ],
-        'Backend & Databases': [
-            'Learn SQL basics: SELECT, INSERT, UPDATE, DELETE',
-            'Design database schemas and relationships',
-            'Build REST APIs with Flask/Django',
-            'Implement database migrations',
-            'Learn about authentication and security',
-            'Build a complete backend with user system'
-        ],
-        'Python & Data Manipulation': [
-            'Master Python NumPy arrays and operations',
-            'Learn Pandas data frames and series',
-            'Practice data cleaning and preprocessing',
-            'Work with CSV and JSON files',
-            'Create data visualizations with Matplotlib'
-        ],
-        'Machine Learning Algorithms': [
-            'Understand linear regression from scratch',
-            'Learn logistic regression and classification',
-            'Master decision trees and random forests',
-            'Study neural networks basics',
-            'Implement algorithms from scratch',
-            'Use scikit-learn for practical ML'
-        ]
-    }
-    
-    if focus_area in task_templates:
-        tasks = task_templates[focus_area]
-        task_index = (day_in_phase - 1) % len(tasks)
-        return tasks[task_index]
-    else:
-        # Try to match focus_area to a known template by fuzzy/substring matching
-        lower_focus = focus_area.lower()
-        for tmpl_key in task_templates:
-            if tmpl_key.lower() in lower_focus or lower_focus in tmpl_key.lower():
-                tasks = task_templates[tmpl_key]
-                task_index = (day_in_phase - 1) % len(tasks)
-                return tasks[task_index]
-
-        return f"Work on {focus_area} - Day {day_in_phase}"
+    tasks = _match_templates(focus_area)
+    if tasks:
+        return tasks[(day_in_phase - 1) % len(tasks)]
+    return f"Work on {focus_area} - Day {day_in_phase}"
 
 
 def calculate_difficulty(current_day, total_days):
@@ -566,41 +633,40 @@ def calculate_difficulty(current_day, total_days):
         return 'very hard'
 
 
+# Cycled through by generic plans to avoid repeated identical tasks
+GENERIC_TEMPLATES = [
+    'Read a system design article or blog and summarize key takeaways',
+    'Study core principles: scalability, availability, consistency',
+    'Practice designing a component (APIs, data model, storage) on paper',
+    'Implement a small prototype or proof-of-concept for a subsystem',
+    'Review distributed systems patterns (load balancing, sharding, caching)',
+    'Analyze a real-world system case study and note trade-offs',
+    'Do a mock system design interview: sketch architecture and justify choices',
+    'Improve previous designs: add reliability and monitoring considerations',
+    'Write tests/specs for a designed component and think about scaling',
+    'Refactor a prototype to improve performance or simplicity'
+]
+
+
+def _generic_day(profession, day, total_days, templates=GENERIC_TEMPLATES):
+    template = templates[(day - 1) % len(templates)]
+    return {
+        'day': day,
+        # Add day-specific hint to keep clarity
+        'task': f"{template} (Day {day})",
+        'focus_area': profession,
+        'recommended_hours': 3 + ((day - 1) % 3),
+        'difficulty': calculate_difficulty(day, total_days)
+    }
+
+
 def generate_generic_plan(profession, duration_months):
     """Generate a generic plan if profession not found"""
     total_days = duration_months * 30
     
-    daily_tasks = []
-    # Use a set of varied generic templates to avoid repeated identical tasks
-    generic_templates = [
-        'Read a system design article or blog and summarize key takeaways',
-        'Study core principles: scalability, availability, consistency',
-        'Practice designing a component (APIs, data model, storage) on paper',
-        'Implement a small prototype or proof-of-concept for a subsystem',
-        'Review distributed systems patterns (load balancing, sharding, caching)',
-        'Analyze a real-world system case study and note trade-offs',
-        'Do a mock system design interview: sketch architecture and justify choices',
-        'Improve previous designs: add reliability and monitoring considerations',
-        'Write tests/specs for a designed component and think about scaling',
-        'Refactor a prototype to improve performance or simplicity'
-    ]
-
-    for day in range(1, total_days + 1):
-        template = generic_templates[(day - 1) % len(generic_templates)]
-        task_text = template
-        # Add day-specific hint to keep clarity
-        task_text = f"{task_text} (Day {day})"
-        daily_tasks.append({
-            'day': day,
-            'task': task_text,
-            'focus_area': profession,
-            'recommended_hours': 3 + ((day - 1) % 3),
-            'difficulty': calculate_difficulty(day, total_days)
-        })
-    
     return {
         'total_days': total_days,
-        'daily_tasks': daily_tasks,
+        'daily_tasks': [_generic_day(profession, day, total_days) for day in range(1, total_days + 1)],
         'technologies': [],
         'milestones': [
             {'week': 2, 'milestone': f'Complete Week 2 of {profession} learning'},
@@ -608,3 +674,11 @@ def generate_generic_plan(profession, duration_months):
             {'week': 26, 'milestone': f'Complete {profession} learning plan'}
         ]
     }
+
+
+# Schedule tables per template version: the phase tables (which hold the
+# resolved TASK_TEMPLATES) and the generic-plan templates. A new version gets
+# new tables here; existing entries must stay as they are.
+SCHEDULE_TABLES = {
+    1: {'phases': PHASE_TABLES, 'generic': tuple(GENERIC_TEMPLATES)},
+}
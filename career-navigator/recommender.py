@@ -3,37 +3,42 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from tech_monitor import get_trending_technologies, detect_new_technologies, generate_tech_recommendations
+from tech_monitor import detect_new_technologies, generate_tech_recommendations
+from .pipeline import PipelineContext
 
 
 class Recommender:
     """Produce incremental plan updates based on skill gaps."""
 
-    def recommend_for_user(self, user_id: int, assessment: Dict[str, Any]) -> Dict[str, Any]:
+    def recommend_for_user(self, user_id: int, assessment: Dict[str, Any], context=None) -> Dict[str, Any]:
         """Generate prioritized recommendations based on skill assessment.
         
         Args:
             user_id: User ID
             assessment: dict from SkillAssessor.assess_user()
+            context: PipelineContext shared with the other agents (optional)
         
         Returns: dict with prioritized learning recommendations
         """
         try:
-            from models import Plan
-            
+            context = context if context is not None else PipelineContext(user_id)
             plan_goal = assessment.get('plan_goal', 'Unknown')
-            current_skills = assessment.get('current_skills', [])
             skill_gaps = assessment.get('skill_gaps', [])
-            plan_skills = assessment.get('plan_skills', [])
+            plan_skills = assessment.get('plan_skills') or []
             
-            # Get trending tech for the profession
-            trending = get_trending_technologies(plan_goal, min_relevance=80)
+            # Get trending tech for the profession once; both steps below filter it
+            trending = context.trending(plan_goal, 75)
+            skills_key = (plan_goal, tuple(plan_skills))
             
             # Detect new technologies not in current plan
-            new_tech = detect_new_technologies(plan_skills, plan_goal, threshold=80)
+            new_tech = context.memo(('new_technologies',) + skills_key, lambda: detect_new_technologies(
+                plan_skills, plan_goal, threshold=80, trending=trending
+            ))
             
             # Generate detailed recommendations
-            recs = generate_tech_recommendations(plan_goal, plan_skills)
+            recs = context.memo(('tech_recommendations',) + skills_key, lambda: generate_tech_recommendations(
+                plan_goal, plan_skills, trending=trending
+            ))
             
             return {
                 'skill_gaps': skill_gaps,
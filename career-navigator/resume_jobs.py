@@ -0,0 +1,135 @@
+"""Asynchronous resume processing.
+
+When RESUME_ASYNC_PARSING is enabled, /api/upload-resume stores the file,
+records a ResumeJob row and returns immediately; a small pool of worker
+threads parses the file and writes the Resume row. Jobs live in the
+database, so this works without Redis and queued jobs survive a restart.
+Bulk imports (IngestJob, batch_ingest.process_ingest_job) run on a second
+queue of the same kind.
+"""
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeJobQueue:
+    """In-process worker pool backed by a job table (resume_jobs unless ``model`` is given).
+
+    ``process(job_id)`` runs each job in an app context (default process_job).
+    With ``requeue_stale=False`` abandoned jobs are marked failed instead of
+    run again, for jobs that commit as they go.
+    """
+
+    def __init__(self, app=None, workers=2, stale_after=600, process=None, model=None, requeue_stale=True):
+        self.app = app
+        self.workers = workers
+        self.stale_after = stale_after  # Seconds before a 'running' job is considered abandoned
+        self.process = process or process_job
+        self.model = model
+        self.requeue_stale = requeue_stale
+        self._queue = queue.Queue()
+        self._threads = []
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Start worker threads and re-enqueue unfinished jobs."""
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f'resume-job-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._recover()
+        logger.info(f"Resume job queue started with {self.workers} workers")
+
+    def stop(self):
+        """Stop worker threads after their current job."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def submit(self, job_id):
+        self._queue.put(job_id)
+
+    def _recover(self):
+        """Pick up jobs left queued (or stuck running) by a previous process."""
+        if not self.app:
+            return
+        try:
+            with self.app.app_context():
+                from models import db, ResumeJob
+                model = self.model or ResumeJob
+                stale = datetime.utcnow() - timedelta(seconds=self.stale_after)
+                if self.requeue_stale:
+                    values = {'status': 'queued'}
+                else:
+                    values = {'status': 'failed', 'error': 'Interrupted', 'finished_at': datetime.utcnow()}
+                model.query.filter(
+                    model.status == 'running', model.started_at < stale
+                ).update(values, synchronize_session=False)
+                db.session.commit()
+                for (job_id,) in model.query.with_entities(model.id).filter_by(status='queued'):
+                    self.submit(job_id)
+        except Exception as e:
+            logger.error(f"Error recovering resume jobs: {e}")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                job_id = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                with self.app.app_context():
+                    self.process(job_id)
+            except Exception as e:
+                logger.error(f"Resume job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Block until every submitted job was processed (used by tests)."""
+        self._queue.join()
+
+
+def process_job(job_id):
+    """Parse one queued job and create its Resume row. Requires an app context."""
+    from models import db, Resume, ResumeJob
+    import parse_cache
+    import suggestion_cache
+
+    # Claim the job atomically so two processes never parse the same one
+    claimed = ResumeJob.query.filter_by(id=job_id, status='queued').update(
+        {'status': 'running', 'started_at': datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    if not claimed:
+        return
+
+    job = ResumeJob.query.get(job_id)
+    try:
+        parsed_data, _cache_hit = parse_cache.get_or_parse(job.content_hash, job.file_path, job.file_ext)
+        resume = Resume.from_parsed_data(job.user_id, job.filename, job.file_path, parsed_data)
+        db.session.add(resume)
+        db.session.flush()
+        job.resume_id = resume.id
+        job.status = 'completed'
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        ResumeJob.query.filter_by(id=job_id).update(
+            {'status': 'failed', 'error': str(e), 'finished_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        logger.error(f"Resume job {job_id} failed: {e}")
+    else:
+        # The new resume changes the user's suggestions
+        suggestion_cache.invalidate(job.user_id)
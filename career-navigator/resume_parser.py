@@ -1,59 +1,73 @@
-import re
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
 from datetime import datetime
 
-# Try to use spaCy when available for improved entity/token extraction
-try:
-    import spacy
-    _SPACY_AVAILABLE = True
-    try:
-        _NLP = spacy.load('en_core_web_sm')
-    except Exception:
-        # Model not installed; fallback to None
-        _NLP = None
-except Exception:
-    _SPACY_AVAILABLE = False
-    _NLP = None
+import nlp_loader
+from field_extractor import ResumeFieldExtractor
+from skill_canon import canonical, canonical_set
+from skill_matcher import SkillMatcher
 
-def extract_skills_from_text(text):
-    """Extract common tech skills from resume text. Uses spaCy if available, otherwise regex lookup."""
-    text_lower = (text or '').lower()
+# Bump when parsing output changes so cached parse results are invalidated
+PARSER_VERSION = '3'
 
-    # Base keyword list for matching (extendable)
-    skill_keywords = [
-        'python', 'javascript', 'java', 'c++', 'sql', 'html', 'css', 'react', 'django', 'flask',
-        'nodejs', 'node.js', 'tensorflow', 'tf', 'pytorch', 'pandas', 'aws', 'docker', 'kubernetes',
-        'git', 'linux', 'machine learning', 'deep learning', 'data analysis'
-    ]
+# PDF extraction limits (see iter_pdf_pages and extract_pdf)
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '20'))
+PDF_PAGE_TIME_BUDGET = float(os.getenv('PDF_PAGE_TIME_BUDGET', '2.0'))  # seconds per page; 0 = no limit
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '200000'))
+PDF_WORKER_START_TIMEOUT = float(os.getenv('PDF_WORKER_START_TIMEOUT', '10.0'))  # extraction process startup
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', '2'))  # extraction processes shared by all threads
 
-    found = set()
+logger = logging.getLogger(__name__)
 
-    # If spaCy is available and model loaded, use noun chunks and entities to find skill-like tokens
-    if _SPACY_AVAILABLE and _NLP is not None:
-        try:
-            doc = _NLP(text)
-            # Check named entities and noun chunks
-            for ent in list(doc.ents) + list(doc.noun_chunks):
-                token_text = ent.text.lower()
-                for kw in skill_keywords:
-                    if kw in token_text:
-                        found.add(kw)
-            # Also check individual tokens for exact matches
-            for token in doc:
-                tok = token.text.lower()
-                for kw in skill_keywords:
-                    if tok == kw or tok.replace('.', '') == kw.replace('.', ''):
-                        found.add(kw)
-        except Exception:
-            pass
+# spaCy is loaded lazily on first use (see nlp_loader) rather than at import
+
+# Base keyword list for matching (extendable)
+SKILL_KEYWORDS = [
+    'python', 'javascript', 'java', 'c++', 'sql', 'html', 'css', 'react', 'django', 'flask',
+    'nodejs', 'node.js', 'tensorflow', 'tf', 'pytorch', 'pandas', 'aws', 'docker', 'kubernetes',
+    'git', 'linux', 'machine learning', 'deep learning', 'data analysis'
+]
 
-    # Fallback / additional regex matching
-    for kw in skill_keywords:
-        pattern = re.escape(kw)
-        if re.search(r'\b' + pattern + r'\b', text_lower):
-            found.add(kw)
+# Common job titles, in priority order when several appear
+ROLE_TITLES = [
+    'software engineer', 'data scientist', 'web developer', 'devops engineer',
+    'cloud engineer', 'ai engineer', 'machine learning engineer', 'senior developer',
+    'junior developer', 'full stack developer', 'frontend developer', 'backend developer'
+]
+
+# Compiled once at import; scanning is a single pass regardless of vocabulary size
+_SKILL_MATCHER = SkillMatcher(SKILL_KEYWORDS)
+_FIELD_EXTRACTOR = ResumeFieldExtractor(SKILL_KEYWORDS, ROLE_TITLES)
+
+
+def _skills_from_doc(text, doc, found=None):
+    """Combine the regex scan with spaCy token matches from an already-parsed doc."""
+    found = set(found) if found is not None else _SKILL_MATCHER.find(text or '')
+
+    # Also match individual tokens ignoring dots (e.g. 'nodejs' vs 'node.js').
+    # Entities and noun chunks are substrings of the text, so the single-pass
+    # scan above already covers them.
+    if doc is not None:
+        for token in doc:
+            found.update(_SKILL_MATCHER.find_token(token.text))
 
     # Normalize and title-case results
-    return [s.title().replace('Node.Js', 'Node.js').replace('Tf', 'TF').replace('C++', 'C++') for s in sorted(found)]
+    return _SKILL_MATCHER.display_names(found)
+
+
+def extract_skills_from_text(text):
+    """Extract common tech skills from resume text. Uses spaCy if available, otherwise regex lookup."""
+    doc = None
+    nlp = nlp_loader.get_nlp()
+    if nlp is not None:
+        try:
+            doc = nlp(text or '')
+        except Exception:
+            doc = None
+    return _skills_from_doc(text, doc)
 
 
 def estimate_experience_level(text, years=0):
@@ -68,22 +82,7 @@ def estimate_experience_level(text, years=0):
 
 def extract_years_of_experience(text):
     """Extract years of experience from text"""
-    patterns = [
-        r'(\d+)\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)',
-        r'(?:experience|exp).*?(\d+)\s*(?:years?|yrs?)',
-        r'total experience.*?(\d+)\s*(?:year|yrs?)'
-    ]
-    
-    text_lower = text.lower()
-    for pattern in patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            try:
-                return float(match.group(1))
-            except:
-                pass
-    
-    return 0.0
+    return _FIELD_EXTRACTOR.extract(text).years_of_experience
 
 
 def parse_resume_text(resume_text):
@@ -91,91 +90,340 @@ def parse_resume_text(resume_text):
     Parse resume text and extract key information
     Returns: dict with extracted data
     """
-    
+    doc = None
+    nlp = nlp_loader.get_nlp()
+    if nlp is not None:
+        try:
+            doc = nlp(resume_text or '')
+        except Exception:
+            doc = None
+    return _build_result(resume_text, doc)
+
+
+def parse_resume_texts(resume_texts, skill_index=None):
+    """
+    Parse a batch of resume texts, running spaCy over them with nlp.pipe
+
+    With a skill_index.SkillIndex, skills it matches fuzzily across the batch
+    ('Postgres' -> 'PostgreSQL') are added after the keyword matches.
+    Returns: list of dicts in the same schema as parse_resume_text
+    """
+    resume_texts = list(resume_texts)
+    try:
+        docs = list(nlp_loader.pipe(resume_texts))
+    except Exception:
+        docs = [None] * len(resume_texts)
+    results = [_build_result(text, doc) for text, doc in zip(resume_texts, docs)]
+    if skill_index is not None:
+        for result, matches in zip(results, skill_index.match_texts(resume_texts)):
+            result['skills'] = _merge_skills(result['skills'], matches)
+    return results
+
+
+def _merge_skills(skills, extra):
+    """``skills`` followed by the names in ``extra`` that are not the same skill as one already listed."""
+    known = set(canonical_set(skills))
+    merged = list(skills)
+    for name in extra:
+        key = canonical(name)
+        if key not in known:
+            known.add(key)
+            merged.append(name)
+    return merged
+
+
+def _build_result(resume_text, doc):
+    # One scan of the text fills every regex-based field
+    fields = _FIELD_EXTRACTOR.extract(resume_text)
     result = {
-        'skills': extract_skills_from_text(resume_text),
-        'years_of_experience': extract_years_of_experience(resume_text),
-        'education': extract_education(resume_text),
-        'current_role': extract_role(resume_text)
+        'skills': _skills_from_doc(resume_text, doc, found=fields.skills),
+        'years_of_experience': fields.years_of_experience,
+        'education': fields.education or "Not specified",
+        'current_role': fields.role or "Not specified"
     }
-    
+
     result['experience_level'] = estimate_experience_level(
-        resume_text, 
+        resume_text,
         result['years_of_experience']
     )
-    
+
     return result
 
 
 def extract_education(text):
     """Extract education from resume"""
-    patterns = [
-        r'(?:bachelor|b\.?s\.?|bs)',
-        r'(?:master|m\.?s\.?|ms)',
-        r'(?:phd|ph\.?d\.?)',
-        r'(?:diploma|certification)',
-    ]
-    
-    text_lower = text.lower()
-    for pattern in patterns:
-        if re.search(pattern, text_lower):
-            # Extract the degree and possible field
-            section = re.search(pattern + r'[^,\n]*(?:in|of)?[^,\n]*', text_lower)
-            if section:
-                return section.group(0).title()
-    
-    return "Not specified"
+    return _FIELD_EXTRACTOR.extract(text).education or "Not specified"
 
 
 def extract_role(text):
     """Extract current/last role from resume"""
-    # Look for common job titles
-    titles = [
-        'software engineer', 'data scientist', 'web developer', 'devops engineer',
-        'cloud engineer', 'ai engineer', 'machine learning engineer', 'senior developer',
-        'junior developer', 'full stack developer', 'frontend developer', 'backend developer'
-    ]
-    
-    text_lower = text.lower()
-    for title in titles:
-        if title in text_lower:
-            return title.title()
-    
-    return "Not specified"
+    return _FIELD_EXTRACTOR.extract(text).role or "Not specified"
 
 
-def parse_pdf_resume(file_path):
+def iter_pdf_pages(file_path, max_pages=None, max_chars=None):
     """
-    Parse PDF resume (requires pdfplumber or PyPDF2)
-    For now, returns empty - can be enhanced later
+    Yield the text of a PDF page by page (pdfplumber, falling back to PyPDF2 per page)
+
+    Extraction stops after `max_pages` pages or once `max_chars` characters were
+    yielded, so a huge PDF can't allocate the whole document. Pages are not
+    timed here; extract_pdf runs this in a child process to bound time per page.
     """
-    # Prefer pdfplumber for better layout extraction, fallback to PyPDF2
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+
+    fallback = {}
+
+    def pypdf2_reader():
+        if 'reader' not in fallback:
+            from PyPDF2 import PdfReader
+            fallback['reader'] = PdfReader(file_path)
+        return fallback['reader']
+
+    pdf = None
     try:
         import pdfplumber
-        with pdfplumber.open(file_path) as pdf:
-            text = ''
-            for page in pdf.pages:
-                page_text = page.extract_text() or ''
-                text += page_text + '\n'
-            return parse_resume_text(text)
+        # Only build page objects for the pages we may read
+        pdf = pdfplumber.open(file_path, pages=list(range(1, max_pages + 1)))
+        page_count = len(pdf.pages)
     except Exception:
+        # Not readable by pdfplumber at all: extract every page with PyPDF2
+        if pdf is not None:
+            pdf.close()
+        pdf = None
+        page_count = len(pypdf2_reader().pages)
+
+    remaining = max_chars
+    try:
+        for index in range(min(page_count, max_pages)):
+            try:
+                if pdf is None:
+                    raise RuntimeError('pdfplumber unavailable')
+                page = pdf.pages[index]
+                try:
+                    page_text = page.extract_text() or ''
+                finally:
+                    page.close()
+            except Exception:
+                # Fall back to PyPDF2 for this page only
+                try:
+                    page_text = pypdf2_reader().pages[index].extract_text() or ''
+                except Exception:
+                    page_text = ''
+
+            page_text = page_text[:remaining]
+            remaining -= len(page_text)
+            yield page_text
+
+            if remaining <= 0:
+                logger.info(f"PDF {file_path}: character cap ({max_chars}) reached at page {index + 1}")
+                break
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+
+def _serve_pages(conn, page_source):
+    """Extraction process: for each args tuple received, send ('page', text) per page, then ('done', None) or ('error', message)."""
+    while True:
         try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(file_path)
-            text = ''
-            for page in reader.pages:
-                page_text = page.extract_text() or ''
-                text += page_text + '\n'
-            return parse_resume_text(text)
-        except Exception:
-            return {'skills': [], 'years_of_experience': 0, 'education': 'Not available', 'current_role': 'Not available', 'experience_level': 'beginner'}
+            args = conn.recv()
+        except EOFError:
+            return
+        try:
+            for page_text in page_source(*args):
+                conn.send(('page', page_text))
+            conn.send(('done', None))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+
+class _PageWorker:
+    """A spawned extraction process, reused across files until it has to be killed.
+
+    Spawned rather than forked because callers run in threaded web and
+    job-queue workers; reused because starting one costs more than parsing a
+    typical resume. Workers live in a _PagePool.
+    """
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+        self.process = None
+        self.conn = None
+
+    def _start(self):
+        ctx = multiprocessing.get_context('spawn')
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_serve_pages, args=(child_conn, self.page_source), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        if self.conn is not None:
+            self.conn.close()
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process.join()
+        self.process = None
+        self.conn = None
+
+    def run(self, args, page_time_budget, start_timeout):
+        """(pages, truncated) for ``page_source(*args)``; the process is killed on a slow page."""
+        wait = page_time_budget
+        if self.process is None or not self.process.is_alive():
+            self.stop()
+            self._start()
+            wait += start_timeout
+        pages = []
+        try:
+            self.conn.send(args)
+            while True:
+                if not self.conn.poll(wait):
+                    logger.warning(f"PDF {args[0]}: page {len(pages) + 1} took over {page_time_budget}s, "
+                                   f"skipping remaining pages")
+                    self.stop()
+                    return pages, True
+                kind, value = self.conn.recv()
+                if kind == 'page':
+                    pages.append(value)
+                    wait = page_time_budget
+                elif kind == 'error':
+                    raise RuntimeError(value)
+                else:
+                    return pages, False
+        except (EOFError, OSError):
+            exitcode = self.process.exitcode if self.process is not None else None
+            self.stop()
+            raise RuntimeError(f"PDF extraction process exited with code {exitcode}")
+
+
+class _PagePool:
+    """At most ``size`` extraction processes for one page source, shared by all threads.
+
+    A thread takes an idle worker (or starts one while under the limit) and
+    waits when all are busy. shutdown_pdf_workers() stops them.
+    """
+
+    def __init__(self, page_source, size):
+        self.page_source = page_source
+        self.slots = threading.BoundedSemaphore(max(1, size))
+        self.lock = threading.Lock()
+        self.idle = []
+        self.workers = []
+
+    def run(self, args, page_time_budget, start_timeout):
+        with self.slots:
+            with self.lock:
+                if self.idle:
+                    worker = self.idle.pop()
+                else:
+                    worker = _PageWorker(self.page_source)
+                    self.workers.append(worker)
+            try:
+                return worker.run(args, page_time_budget, start_timeout)
+            finally:
+                with self.lock:
+                    self.idle.append(worker)
+
+    def shutdown(self):
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            worker.stop()
+
+
+# page source -> _PagePool
+_page_pools = {}
+_page_pools_lock = threading.Lock()
+
+
+def shutdown_pdf_workers():
+    """Stop every extraction process of this process; they restart on the next PDF."""
+    with _page_pools_lock:
+        pools = list(_page_pools.values())
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_pdf_workers)
+
+
+def _pages_within_budget(page_source, args, page_time_budget, start_timeout=None):
+    """
+    Run ``page_source(*args)`` in a shared extraction process and collect its pages
+
+    The process is killed when a page takes longer than ``page_time_budget``
+    seconds (the first file after a start may also take ``start_timeout``), so
+    a slow or hostile page can't hold the caller. Returns (pages, truncated).
+    """
+    start_timeout = PDF_WORKER_START_TIMEOUT if start_timeout is None else start_timeout
+    with _page_pools_lock:
+        pool = _page_pools.get(page_source)
+        if pool is None:
+            pool = _page_pools[page_source] = _PagePool(page_source, PDF_WORKERS)
+    return pool.run(args, page_time_budget, start_timeout)
+
+
+def extract_pdf(file_path, max_pages=None, page_time_budget=None, max_chars=None):
+    """
+    Extract raw text from a PDF within the configured page, time and size limits
+
+    Returns (text, truncated); truncated is True when a page ran over
+    `page_time_budget` and the remaining pages were skipped. That depends on
+    load, so such results should not be cached.
+    """
+    page_time_budget = PDF_PAGE_TIME_BUDGET if page_time_budget is None else page_time_budget
+    if page_time_budget > 0:
+        pages, truncated = _pages_within_budget(iter_pdf_pages, (file_path, max_pages, max_chars), page_time_budget)
+    else:
+        pages, truncated = list(iter_pdf_pages(file_path, max_pages, max_chars)), False
+    return ('\n'.join(pages) + '\n' if pages else ''), truncated
+
+
+def extract_pdf_text(file_path, max_pages=None, page_time_budget=None, max_chars=None):
+    """Extract raw text from a PDF within the configured page, time and size limits"""
+    return extract_pdf(file_path, max_pages, page_time_budget, max_chars)[0]
+
+
+def read_txt_resume(file_path):
+    """Read a plain text resume"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def extract_resume_text(file_path):
+    """Extract raw text from a .pdf or .txt resume based on its extension"""
+    if file_path.rsplit('.', 1)[-1].lower() == 'pdf':
+        return extract_pdf_text(file_path)
+    return read_txt_resume(file_path)
+
+
+def parse_pdf_resume(file_path):
+    """
+    Parse PDF resume (requires pdfplumber or PyPDF2)
+    """
+    try:
+        text, truncated = extract_pdf(file_path)
+    except Exception as e:
+        # Same schema as parse_txt_resume; 'error' keeps the fallback out of the parse cache
+        return {
+            'skills': [],
+            'years_of_experience': 0,
+            'education': 'Not available',
+            'current_role': 'Not available',
+            'experience_level': 'beginner',
+            'error': str(e)
+        }
+    result = parse_resume_text(text)
+    if truncated:
+        result['truncated'] = True
+    return result
 
 
 def parse_txt_resume(file_path):
     """Parse plain text resume"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        text = read_txt_resume(file_path)
         return parse_resume_text(text)
     except Exception as e:
         # Return consistent schema on error
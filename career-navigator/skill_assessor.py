@@ -1,29 +1,60 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from datetime import datetime, timedelta
 
+# Users per query in assess_users; keeps IN lists under SQLite's parameter limit
+BATCH_SIZE = 500
+
+_NO_USER = {'current_skills': [], 'skill_gaps': [], 'proficiency_estimate': 'unknown'}
+
+
+def _assessment(current_skills, experience_level, plan_goal, plan_skills, recent_progress):
+    # Assess skill gaps (what's in plan but not yet mastered)
+    known = {cs.lower() for cs in current_skills or []}
+    skill_gaps = [s for s in plan_skills or [] if s.lower() not in known]
+    return {
+        'current_skills': current_skills,
+        'plan_skills': plan_skills,
+        'skill_gaps': skill_gaps[:5],  # Top 5 gaps
+        'proficiency_estimate': experience_level,
+        'plan_goal': plan_goal,
+        'recent_tasks_completed': recent_progress
+    }
+
 
 class SkillAssessor:
     """Assess user skills from resume and progress data."""
 
-    def assess_user(self, user_id: int) -> Dict[str, Any]:
+    def assess_user(self, user_id: int, context=None) -> Dict[str, Any]:
         """Assess user skills from resume and recent progress.
         
+        With a PipelineContext the assessment and the rows it reads are
+        memoized for the rest of the orchestration.
+        
         Returns: dict with 'current_skills', 'skill_gaps', 'proficiency_estimate'
         """
+        if context is not None:
+            return context.memo(('assessment', user_id), lambda: self._assess_user(user_id, context.memo))
+        return self._assess_user(user_id, lambda key, compute: compute())
+
+    def _assess_user(self, user_id: int, memo) -> Dict[str, Any]:
         try:
             from models import db, User, Resume, Plan, DailyProgress
             
-            user = User.query.get(user_id)
+            user = memo(('user', user_id), lambda: User.query.get(user_id))
             if not user:
-                return {'current_skills': [], 'skill_gaps': [], 'proficiency_estimate': 'unknown'}
+                return dict(_NO_USER)
             
             # Get latest resume
-            resume = Resume.query.filter_by(user_id=user_id).order_by(Resume.uploaded_at.desc()).first()
+            resume = memo(('latest_resume', user_id), lambda: Resume.query.filter_by(user_id=user_id).order_by(
+                Resume.uploaded_at.desc(), Resume.id.desc()
+            ).first())
             current_skills = resume.skills if resume else []
             experience_level = resume.experience_level if resume else 'beginner'
             
             # Get active plan and assess progress
-            plan = Plan.query.filter_by(user_id=user_id, status='active').first()
+            plan = memo(('active_plan', user_id), lambda: Plan.query.filter_by(
+                user_id=user_id, status='active'
+            ).order_by(Plan.id).first())
             plan_goal = plan.goal if plan else 'Unknown'
             plan_skills = plan.technologies if plan else []
             
@@ -37,16 +68,84 @@ class SkillAssessor:
                     DailyProgress.completed_date >= thirty_days_ago
                 ).count()
             
-            # Assess skill gaps (what's in plan but not yet mastered)
-            skill_gaps = [s for s in plan_skills if s.lower() not in [cs.lower() for cs in current_skills]]
-            
-            return {
-                'current_skills': current_skills,
-                'plan_skills': plan_skills,
-                'skill_gaps': skill_gaps[:5],  # Top 5 gaps
-                'proficiency_estimate': experience_level,
-                'plan_goal': plan_goal,
-                'recent_tasks_completed': recent_progress
-            }
+            return _assessment(current_skills, experience_level, plan_goal, plan_skills, recent_progress)
         except Exception as e:
             return {'current_skills': [], 'skill_gaps': [], 'proficiency_estimate': 'error', 'error': str(e)}
+
+    def assess_users(self, user_ids: Iterable[int], context=None) -> Dict[int, Dict[str, Any]]:
+        """assess_user() for many users with four set-based queries per BATCH_SIZE users.
+
+        Latest resumes and active plans are picked with a row_number() window,
+        recent completions are counted with one grouped query. Returns
+        user_id -> assessment; unlike assess_user, database errors are raised.
+        With a PipelineContext, users it already holds an assessment for are
+        not queried again and the new assessments are memoized in it.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        results = {}
+        if context is not None:
+            known = {uid: context.peek(('assessment', uid)) for uid in user_ids}
+            results = {uid: assessment for uid, assessment in known.items() if assessment is not None}
+        pending = [uid for uid in user_ids if uid not in results]
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = self._assess_batch(pending[start:start + BATCH_SIZE])
+            if context is not None:
+                for uid, assessment in batch.items():
+                    context.memo(('assessment', uid), lambda: assessment)
+            results.update(batch)
+        return {uid: results[uid] for uid in user_ids}
+
+    def _assess_batch(self, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        from models import db, User, Resume, Plan, DailyProgress
+
+        existing = {uid for (uid,) in db.session.query(User.id).filter(User.id.in_(user_ids))}
+
+        # Latest resume per user
+        resume_rank = db.func.row_number().over(
+            partition_by=Resume.user_id, order_by=(Resume.uploaded_at.desc(), Resume.id.desc())
+        ).label('rank')
+        ranked = db.session.query(
+            Resume.user_id, Resume.skills, Resume.experience_level, resume_rank
+        ).filter(Resume.user_id.in_(user_ids)).subquery()
+        resumes = {
+            row.user_id: row
+            for row in db.session.query(ranked.c.user_id, ranked.c.skills, ranked.c.experience_level)
+            .filter(ranked.c.rank == 1)
+        }
+
+        # First active plan per user
+        plan_rank = db.func.row_number().over(partition_by=Plan.user_id, order_by=Plan.id).label('rank')
+        ranked = db.session.query(
+            Plan.id, Plan.user_id, Plan.goal, Plan.technologies, plan_rank
+        ).filter(Plan.user_id.in_(user_ids), Plan.status == 'active').subquery()
+        plans = {
+            row.user_id: row
+            for row in db.session.query(ranked.c.id, ranked.c.user_id, ranked.c.goal, ranked.c.technologies)
+            .filter(ranked.c.rank == 1)
+        }
+
+        # Tasks completed in the last 30 days, per plan
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        recent = {}
+        if plans:
+            recent = dict(db.session.query(DailyProgress.plan_id, db.func.count(DailyProgress.id)).filter(
+                DailyProgress.plan_id.in_([plan.id for plan in plans.values()]),
+                DailyProgress.is_completed == True,
+                DailyProgress.completed_date >= thirty_days_ago
+            ).group_by(DailyProgress.plan_id))
+
+        results = {}
+        for uid in user_ids:
+            if uid not in existing:
+                results[uid] = dict(_NO_USER)
+                continue
+            resume = resumes.get(uid)
+            plan = plans.get(uid)
+            results[uid] = _assessment(
+                resume.skills if resume else [],
+                resume.experience_level if resume else 'beginner',
+                plan.goal if plan else 'Unknown',
+                plan.technologies if plan else [],
+                recent.get(plan.id, 0) if plan else 0
+            )
+        return results
@@ -0,0 +1,94 @@
+"""Canonical skill names for exact, set-based skill comparison.
+
+'Node.js', 'nodejs' and 'Node JS' are the same skill, as are 'Postgres 16'
+and 'PostgreSQL', or 'React 18' and 'React'. canonical() maps every spelling
+to one key: lowercase, separators collapsed, then dots and trailing version
+numbers dropped ('GPT-4' -> 'gpt'), then looked up in the alias table. Two
+skills match when their keys are equal, so checking a list of technologies
+against a user's skills is a set lookup per technology instead of a substring
+scan (which also claimed that 'go' was known to anyone listing 'django').
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable
+
+_VERSION_RE = re.compile(r'(?:[\s\-_]+v?\d+(?:\.\d+)*)+$', re.IGNORECASE)
+_SEPARATORS = re.compile(r'[\-_/,()]')
+_SPLIT_RE = re.compile(r'[/,]')
+
+# canonical key -> other spellings (compared after normalize_phrase)
+ALIASES = {
+    'nodejs': ['node', 'node js'],
+    'postgresql': ['postgres', 'psql', 'pg'],
+    'javascript': ['js', 'ecmascript'],
+    'typescript': ['ts'],
+    'react': ['reactjs', 'react js'],
+    'react native': ['rn'],
+    'nextjs': ['next', 'next js'],
+    'vue': ['vuejs', 'vue js'],
+    'angular': ['angularjs', 'angular js'],
+    'go': ['golang'],
+    'kubernetes': ['k8s'],
+    'google cloud': ['gcp', 'google cloud platform'],
+    'aws': ['amazon web services'],
+    'azure': ['microsoft azure'],
+    'tensorflow': ['tf'],
+    'pytorch': ['torch'],
+    'hugging face': ['huggingface', 'hf transformers'],
+    'scikit learn': ['sklearn', 'scikitlearn'],
+    'mongodb': ['mongo'],
+    'tailwind css': ['tailwind', 'tailwindcss'],
+    'apache spark': ['spark', 'pyspark'],
+    'rag systems': ['rag', 'retrieval augmented generation'],
+    'fine tuning': ['finetuning'],
+    'machine learning': ['ml'],
+    'artificial intelligence': ['ai'],
+    'gpt': ['chatgpt', 'openai gpt'],
+    'claude': ['anthropic claude'],
+    'llama': ['llama2', 'meta llama'],
+    'c#': ['csharp', 'c sharp'],
+    'c++': ['cpp', 'cplusplus'],
+    'dbt': ['data build tool'],
+    'terraform': ['hashicorp terraform'],
+}
+
+_ALIAS_INDEX = {}
+for _canonical, _spellings in ALIASES.items():
+    for _spelling in [_canonical] + _spellings:
+        _ALIAS_INDEX[_spelling] = _canonical
+        _ALIAS_INDEX.setdefault(_spelling.replace(' ', ''), _canonical)
+
+
+def strip_version(name: str) -> str:
+    """Drop trailing version numbers: 'TensorFlow 2.14' -> 'TensorFlow', 'GPT-4' -> 'GPT'."""
+    return _VERSION_RE.sub('', name.strip()) or name.strip()
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase, split on separators, drop versions and dots: 'Node.js' -> 'nodejs', 'GPT-4' -> 'gpt'."""
+    # Separators first, so 'Python-3' and 'Python (3.12)' lose their version like 'Python 3'
+    text = ' '.join(_SEPARATORS.sub(' ', text.lower()).split())
+    return strip_version(text).replace('.', '')
+
+
+@lru_cache(maxsize=65536)
+def canonical(name: str) -> str:
+    """Canonical key of a skill or technology name ('' for blank names)."""
+    key = normalize_phrase(name or '')
+    return _ALIAS_INDEX.get(key) or _ALIAS_INDEX.get(key.replace(' ', ''), key)
+
+
+def skill_keys(skill: str) -> FrozenSet[str]:
+    """Keys a listed skill stands for: 'React/Vue' covers react and vue."""
+    keys = {canonical(skill)}
+    keys.update(canonical(part) for part in _SPLIT_RE.split(skill or ''))
+    keys.discard('')
+    return frozenset(keys)
+
+
+def canonical_set(skills: Iterable[str]) -> FrozenSet[str]:
+    """Every key of every skill, for ``canonical(name) in known`` checks."""
+    known = set()
+    for skill in skills or ():
+        known.update(skill_keys(skill))
+    return frozenset(known)
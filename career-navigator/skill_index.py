@@ -0,0 +1,161 @@
+"""Fuzzy skill matching against a sparse TF-IDF skill index.
+
+Skill names from the resume keyword list, the planner's profession paths and
+the trending-technology catalog being served (tech_monitor.get_catalog) are
+vectorized once with character n-gram TF-IDF. A batch of resumes is scored against every skill with one sparse
+matrix multiply over the batch's distinct candidate phrases, which gives
+fuzzy matches ("Postgres" vs "PostgreSQL", "huggingface" vs "Hugging Face")
+without a per-keyword regex loop. Batch ingestion adds these matches to the
+keyword skills of every resume it parses (resume_parser.parse_resume_texts).
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from skill_canon import normalize_phrase, strip_version
+
+try:
+    import numpy as np
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    _SKLEARN_AVAILABLE = True
+except Exception:
+    _SKLEARN_AVAILABLE = False
+
+DEFAULT_THRESHOLD = 0.78
+# A phrase must be about as long as the skill name: stops 'experience' matching 'user experience'
+MIN_LENGTH_RATIO = 0.7
+PHRASE_CACHE_SIZE = 500000
+
+_STOP_WORDS = frozenset(['a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'in', 'of', 'on', 'or', 'the', 'to', 'with'])
+_TOKEN_RE = re.compile(r'[a-z0-9+#][a-z0-9+#.]*')
+
+
+def is_available() -> bool:
+    """Whether scikit-learn (and so SkillIndex) can be used."""
+    return _SKLEARN_AVAILABLE
+
+
+def build_skill_taxonomy(catalog=None) -> List[str]:
+    """Collect skill names from the parser, planner and trend catalog (default: the one being served)."""
+    from resume_parser import SKILL_KEYWORDS
+    from skill_matcher import normalize_skill_name
+    from planner import PROFESSION_PATHS
+    from tech_monitor import get_catalog
+
+    names = [normalize_skill_name(kw) for kw in SKILL_KEYWORDS]
+    for path in PROFESSION_PATHS.values():
+        for skill in path.get('skills_required', []):
+            names.extend(part.strip() for part in skill.split('/'))
+    names.extend((get_catalog() if catalog is None else catalog).keys())
+
+    taxonomy, seen = [], set()
+    for name in names:
+        key = normalize_phrase(name)
+        if key and key not in seen:
+            seen.add(key)
+            taxonomy.append(strip_version(name))
+    return taxonomy
+
+
+class SkillIndex:
+    """Character n-gram TF-IDF index over a skill taxonomy."""
+
+    def __init__(self, skills: Sequence[str], threshold: float = DEFAULT_THRESHOLD,
+                 cache_size: int = PHRASE_CACHE_SIZE):
+        if not _SKLEARN_AVAILABLE:
+            raise RuntimeError('scikit-learn is required for the skill index')
+        self.skills = list(skills)
+        self.threshold = threshold
+        self.cache_size = cache_size
+        # phrase -> ((skill index, similarity), ...); resumes share most of their phrases
+        self._phrase_hits: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+        self._lock = threading.Lock()
+        keys = [normalize_phrase(s) for s in self.skills]
+        self._skill_lengths = np.array([len(k) for k in keys])
+        self.max_words = max((len(k.split()) for k in keys), default=1)
+        self._vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(3, 3), sublinear_tf=True)
+        # Rows are L2-normalized, so a dot product is the cosine similarity
+        self._skill_matrix = self._vectorizer.fit_transform(keys).T.tocsr()
+
+    def candidate_phrases(self, text: str) -> Iterable[str]:
+        """Word 1..max_words-grams of a resume, normalized like the skill names.
+
+        Multi-word phrases may not start or end with a stop word, so
+        'experience in' is never compared with 'User Experience'.
+        """
+        tokens = [t.rstrip('.').replace('.', '') for t in _TOKEN_RE.findall((text or '').lower())]
+        tokens = [t for t in tokens if t]
+        yield from tokens
+        for n in range(2, self.max_words + 1):
+            for gram in zip(*(tokens[k:] for k in range(n))):
+                if gram[0] not in _STOP_WORDS and gram[-1] not in _STOP_WORDS:
+                    yield ' '.join(gram)
+
+    def _score_phrases(self, phrases: List[str]):
+        """Score phrases against every skill with one sparse multiply and cache the hits."""
+        similarity = (self._vectorizer.transform(phrases) @ self._skill_matrix).tocoo()
+        phrase_lengths = np.array([len(p) for p in phrases])
+        lengths = np.stack([phrase_lengths[similarity.row], self._skill_lengths[similarity.col]])
+        keep = (similarity.data >= self.threshold) & (lengths.min(axis=0) >= MIN_LENGTH_RATIO * lengths.max(axis=0))
+
+        hits: Dict[str, List[Tuple[int, float]]] = {}
+        for p_idx, s_idx, score in zip(similarity.row[keep], similarity.col[keep], similarity.data[keep]):
+            hits.setdefault(phrases[p_idx], []).append((int(s_idx), float(score)))
+        for phrase in phrases:
+            self._phrase_hits[phrase] = tuple(hits.get(phrase, ()))
+
+    def score_texts(self, texts: Sequence[str]):
+        """Return a sparse (len(texts) x len(skills)) matrix of best phrase similarity.
+
+        Only similarities at or above the threshold are kept. Phrases already
+        scored by an earlier batch are not vectorized again.
+        """
+        phrase_sets = [set(self.candidate_phrases(text)) for text in texts]
+        with self._lock:
+            if len(self._phrase_hits) > self.cache_size:
+                self._phrase_hits.clear()
+            unseen = set().union(*phrase_sets).difference(self._phrase_hits)
+            if unseen:
+                self._score_phrases(sorted(unseen))
+
+        rows, cols, data = [], [], []
+        for row, phrases in enumerate(phrase_sets):
+            best: Dict[int, float] = {}
+            for phrase in phrases:
+                for skill_idx, score in self._phrase_hits.get(phrase, ()):
+                    if score > best.get(skill_idx, 0.0):
+                        best[skill_idx] = score
+            rows.extend([row] * len(best))
+            cols.extend(best.keys())
+            data.extend(best.values())
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(self.skills)), dtype=np.float32)
+
+    def match_texts(self, texts: Sequence[str]) -> List[List[str]]:
+        """Return the matched skill names for each text, best match first."""
+        scores = self.score_texts(texts)
+        matches = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            pairs = sorted(zip(scores.data[start:end], scores.indices[start:end]), key=lambda p: (-p[0], p[1]))
+            matches.append([self.skills[i] for _, i in pairs])
+        return matches
+
+
+_default_index = None
+_default_version = None
+_default_lock = threading.Lock()
+
+
+def get_default_index() -> SkillIndex:
+    """Return the shared index over build_skill_taxonomy(), rebuilt when the served catalog changes."""
+    global _default_index, _default_version
+    from tech_monitor import catalog_version
+
+    version = catalog_version()
+    if _default_index is None or _default_version != version:
+        with _default_lock:
+            if _default_index is None or _default_version != version:
+                _default_index = SkillIndex(build_skill_taxonomy())
+                _default_version = version
+    return _default_index
@@ -0,0 +1,86 @@
+"""Precompiled skill vocabulary matcher.
+
+The vocabulary is compiled once into a single trie-shaped regular expression,
+so scanning a resume costs one pass over the text regardless of how many
+skills are in the vocabulary.
+"""
+import re
+from typing import Dict, Iterable, List, Set
+
+
+def normalize_skill_name(keyword: str) -> str:
+    """Return the display form of a lowercased skill keyword."""
+    return keyword.title().replace('Node.Js', 'Node.js').replace('Tf', 'TF').replace('C++', 'C++')
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex alternation that shares common prefixes between keywords.
+
+    A flat ``a|b|c`` alternation makes the regex engine try every keyword at
+    every position; the trie form only branches on the next character, so the
+    cost per position is bounded by keyword length rather than vocabulary size.
+    """
+    trie: Dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if len(branches) == 1:
+            body = branches[0]
+            return '(?:' + body + ')?' if terminal else body
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if terminal else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Match a fixed skill vocabulary against free text in a single pass.
+
+    Keywords are matched case-insensitively on word boundaries. At each word
+    start the longest keyword wins, but keywords starting at later positions
+    inside a match are still reported.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(kw.lower().strip() for kw in keywords if kw and kw.strip()))
+        self._display = {kw: normalize_skill_name(kw) for kw in self.keywords}
+
+        # Token lookup used by the spaCy path: 'nodejs' and 'node.js' are the same token
+        self._token_index: Dict[str, List[str]] = {}
+        for kw in self.keywords:
+            self._token_index.setdefault(kw.replace('.', ''), []).append(kw)
+
+        if self.keywords:
+            # Zero-width lookahead so overlapping keywords at different word starts are all found
+            self._pattern = re.compile(r'(?<!\w)(?=(' + _trie_pattern(self.keywords) + r')(?!\w))')
+        else:
+            self._pattern = None
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of lowercased keywords found in ``text``."""
+        if not text or self._pattern is None:
+            return set()
+        return {m.group(1) for m in self._pattern.finditer(text.lower())}
+
+    def find_token(self, token: str) -> List[str]:
+        """Return keywords equal to a single token, ignoring dots."""
+        return self._token_index.get(token.lower().replace('.', ''), [])
+
+    def display_names(self, keywords: Iterable[str]) -> List[str]:
+        """Map matched keywords to sorted, normalized display names."""
+        return [self._display.get(kw) or normalize_skill_name(kw) for kw in sorted(keywords)]
+
+    def match(self, text: str) -> List[str]:
+        """Scan ``text`` once and return normalized skill names."""
+        return self.display_names(self.find(text))
@@ -0,0 +1,207 @@
+"""Cache of /api/agent/suggestions results, shared by every worker.
+
+Computing suggestions means a skill assessment (four queries) plus a
+catalog lookup per request. The result is stored in suggestion_cache, one
+row per user, with what it was computed from: the user's latest resume id,
+active plan id and version, and the trend catalog version. A lookup reads
+the row and the current key parts in one query; the entry serves the request
+while the key matches and it is younger than SUGGESTION_CACHE_TTL.
+
+Resume uploads and plan changes also delete the user's row (invalidate())
+because the key does not cover everything they change. The orchestrator's
+precompute_suggestions job refreshes the entries of recently active users
+before they expire, so the endpoint's hot path is a cache read.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+import tech_catalog
+from models import db, Plan, Progress, Resume, SuggestionCache
+
+_ttl = 300  # Seconds; set from SUGGESTION_CACHE_TTL by configure()
+
+# Per-process counters; the table holds the entries
+_counters = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidations': 0, 'precomputed': 0}
+_counters_lock = threading.Lock()
+
+
+def configure(ttl):
+    global _ttl
+    _ttl = ttl
+
+
+def _count(key, amount=1):
+    with _counters_lock:
+        _counters[key] += amount
+
+
+def _key_columns(user_id):
+    # Latest resume id, active plan id and version: the same rows SkillAssessor.assess_user reads
+    resume_id = select(Resume.id).where(Resume.user_id == user_id).order_by(
+        Resume.uploaded_at.desc(), Resume.id.desc()
+    ).limit(1).scalar_subquery()
+    plan_id = select(Plan.id).where(Plan.user_id == user_id, Plan.status == 'active').order_by(
+        Plan.id
+    ).limit(1).scalar_subquery()
+    plan_version = select(Plan.version).where(Plan.id == plan_id).scalar_subquery()
+    return resume_id, plan_id, plan_version
+
+
+def cache_key(user_id):
+    """(resume_id, plan_id, plan_version, catalog_version) suggestions for ``user_id`` depend on."""
+    row = db.session.execute(select(*_key_columns(user_id))).one()
+    return (row[0], row[1], row[2], tech_catalog.loaded_version())
+
+
+def _entry_key(entry):
+    return (entry.resume_id, entry.plan_id, entry.plan_version, entry.catalog_version)
+
+
+def _fetch(user_id):
+    """(entry, current key), or (None, None) without an entry. One query."""
+    row = db.session.execute(
+        select(SuggestionCache, *_key_columns(user_id)).where(SuggestionCache.user_id == user_id)
+    ).first()
+    if row is None:
+        return None, None
+    return row[0], (row[1], row[2], row[3], tech_catalog.loaded_version())
+
+
+def _lookup(user_id, now):
+    """(valid suggestions or None, current key or None if not known yet)."""
+    entry, key = _fetch(user_id)
+    if entry is None:
+        _count('misses')
+        return None, None
+    if entry.expires_at <= now or _entry_key(entry) != key:
+        _count('stale')
+        return None, key
+    _count('hits')
+    return entry.suggestions, key
+
+
+def get(user_id, now=None):
+    """Cached suggestions for ``user_id`` if still valid, else None."""
+    return _lookup(user_id, now or datetime.utcnow())[0]
+
+
+def put(user_id, key, suggestions, now=None, commit=True):
+    """Store suggestions computed for ``key``."""
+    now = now or datetime.utcnow()
+    resume_id, plan_id, plan_version, catalog_version = key
+    try:
+        entry = db.session.get(SuggestionCache, user_id)
+        if entry is None:
+            entry = SuggestionCache(user_id=user_id)
+            db.session.add(entry)
+        entry.resume_id = resume_id
+        entry.plan_id = plan_id
+        entry.plan_version = plan_version
+        entry.catalog_version = catalog_version
+        entry.suggestions = suggestions
+        entry.computed_at = now
+        entry.expires_at = now + timedelta(seconds=_ttl)
+        if commit:
+            db.session.commit()
+    except IntegrityError:
+        # Another worker stored the same user's entry first
+        db.session.rollback()
+
+
+def get_or_compute(user_id, compute):
+    """Cached suggestions, or ``compute(user_id)`` stored for next time. Returns (suggestions, hit).
+
+    A hit is one query.
+    """
+    suggestions, key = _lookup(user_id, datetime.utcnow())
+    if suggestions is not None:
+        return suggestions, True
+    # Key read before computing: a change made meanwhile makes the new entry stale, not wrong
+    key = key or cache_key(user_id)
+    suggestions = compute(user_id)
+    if 'error' not in suggestions:
+        put(user_id, key, suggestions)
+    return suggestions, False
+
+
+def invalidate(user_id):
+    """Drop the user's entry (resume uploaded, plan created or changed). Commits."""
+    deleted = SuggestionCache.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+    db.session.commit()
+    _count('invalidations', deleted)
+    return deleted
+
+
+def recently_active_users(since, limit):
+    """Users whose plan progress changed since ``since``, most recent first."""
+    last_active = db.func.max(Progress.last_updated)
+    rows = db.session.query(Progress.user_id, last_active).filter(
+        Progress.last_updated >= since
+    ).group_by(Progress.user_id).order_by(last_active.desc()).limit(limit)
+    return [user_id for user_id, _ in rows]
+
+
+def precompute(compute_many, active_within=86400, limit=500, refresh_within=60, keep_going=None,
+               now=None, batch_size=100):
+    """Refresh entries of users active in the last ``active_within`` seconds.
+
+    Entries still valid ``refresh_within`` seconds from now are left alone;
+    the rest are computed ``batch_size`` users at a time with
+    ``compute_many(user_ids) -> {user_id: suggestions}``. ``keep_going`` is
+    called between batches; the run stops when it returns False. Also
+    deletes long-expired entries. Returns the number computed.
+    """
+    # Scheduler threads skip the per-request catalog reload: load the stored
+    # version first, so entries are computed from and keyed to the current catalog
+    tech_catalog.maybe_refresh(0)
+    now = now or datetime.utcnow()
+    horizon = now + timedelta(seconds=refresh_within)
+    due = []
+    for user_id in recently_active_users(now - timedelta(seconds=active_within), limit):
+        entry, key = _fetch(user_id)
+        if entry is not None and entry.expires_at > horizon and _entry_key(entry) == key:
+            continue
+        due.append((user_id, key or cache_key(user_id)))
+
+    computed = 0
+    for start in range(0, len(due), batch_size):
+        if keep_going is not None and not keep_going():
+            break
+        batch = due[start:start + batch_size]
+        results = compute_many([user_id for user_id, _ in batch])
+        for user_id, key in batch:
+            suggestions = results.get(user_id)
+            if suggestions is not None and 'error' not in suggestions:
+                put(user_id, key, suggestions, now, commit=False)
+                computed += 1
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker stored some of these entries first
+            db.session.rollback()
+    SuggestionCache.query.filter(
+        SuggestionCache.expires_at < now - timedelta(seconds=active_within)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    _count('precomputed', computed)
+    return computed
+
+
+def stats():
+    """Counters for this process plus the number of stored entries."""
+    with _counters_lock:
+        counters = dict(_counters)
+    lookups = counters['hits'] + counters['misses'] + counters['stale']
+    counters['hit_rate'] = round(counters['hits'] / lookups, 3) if lookups else 0.0
+    counters['entries'] = SuggestionCache.query.count()
+    counters['ttl'] = _ttl
+    return counters
+
+
+def reset_counters():
+    with _counters_lock:
+        for key in _counters:
+            _counters[key] = 0
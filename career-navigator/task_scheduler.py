@@ -1,82 +1,157 @@
-"""Background task scheduler for agent orchestrator.
+"""Plan maintenance jobs for the background job scheduler.
 
-Runs agent tasks periodically (tech monitoring, plan updates).
-In production, replace with Celery + Redis.
+TaskScheduler registers its periodic plan jobs (counter repair, stale plan
+checks) on a job_scheduler.JobScheduler; app.py shares one scheduler with
+the agents orchestrator. start() runs them on a private scheduler instead.
 """
-import threading
 import time
 from datetime import datetime, timedelta
 import logging
 
+import job_scheduler
+from job_scheduler import JobScheduler
+
 logger = logging.getLogger(__name__)
 
 
 class TaskScheduler:
-    """Simple scheduler to run agent background tasks."""
+    """Periodic plan maintenance jobs."""
 
-    def __init__(self, app=None, interval=3600):
+    def __init__(self, app=None, interval=3600, chunk_size=1000, jitter=0, timeout=None):
         self.app = app
         self.interval = interval
-        self._thread = None
-        self._stop_event = threading.Event()
+        self.chunk_size = chunk_size  # Plans per keyset chunk in _check_and_update_plans
+        self.jitter = jitter
+        self.timeout = timeout  # Seconds; check_stale_plans stops between chunks once past it
+        self._scheduler = None
+
+    def register_jobs(self, scheduler):
+        """Register the plan jobs on a JobScheduler."""
+        scheduler.register('repair_plan_counters', self._repair_plan_counters, self.interval,
+                           jitter=self.jitter, timeout=self.timeout)
+        scheduler.register('check_stale_plans', self._check_and_update_plans, self.interval,
+                           jitter=self.jitter, timeout=self.timeout)
 
     def start(self):
-        """Start the background task scheduler."""
-        if self._thread and self._thread.is_alive():
-            return
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        """Run the jobs on a scheduler of their own."""
+        if self._scheduler is None:
+            self._scheduler = JobScheduler(self.app, workers=1)
+            self.register_jobs(self._scheduler)
+        self._scheduler.start()
         logger.info(f"Task scheduler started with interval={self.interval}s")
 
     def stop(self):
-        """Stop the background task scheduler."""
-        self._stop_event.set()
-        if self._thread:
-            self._thread.join(timeout=5)
+        """Stop the private scheduler started by start()."""
+        if self._scheduler:
+            self._scheduler.stop()
         logger.info("Task scheduler stopped")
 
-    def _run(self):
-        """Main scheduler loop."""
-        while not self._stop_event.is_set():
-            try:
-                self._check_and_update_plans()
-                time.sleep(0.5)
-            except Exception as e:
-                logger.error(f"Scheduler error: {e}")
-            self._stop_event.wait(self.interval)
+    def _repair_plan_counters(self):
+        """Fill in progress counters and summaries for plans created before they existed.
+
+        Returns the number of plans repaired.
+        """
+        if not self.app:
+            return 0
+
+        with self.app.app_context():
+            from models import db
+            import plan_store
+
+            repaired = plan_store.repair_plan_counters(only_missing=True)
+            created = plan_store.sync_progress_summaries(refresh=False)
+            db.session.commit()
+            if repaired or created:
+                logger.info(f"Initialized progress counters for {repaired} plans, {created} summaries")
+            return repaired
 
     def _check_and_update_plans(self):
-        """Check for plans that need tech updates."""
-        try:
-            if not self.app:
-                return
-
-            with self.app.app_context():
-                from models import db, Plan
-                from tech_monitor import should_update_plan
-                from datetime import datetime
-
-                # Find plans that haven't been checked in 7+ days
-                week_ago = datetime.utcnow() - timedelta(days=7)
-                plans = Plan.query.filter(
-                    Plan.status == 'active',
-                    (Plan.last_updated < week_ago) | (Plan.last_updated.is_(None))
-                ).all()
-
-                for plan in plans:
-                    days_old = (datetime.utcnow() - plan.created_at).days
-                    update_needed = should_update_plan(
-                        plan.technologies or [],
-                        plan.goal,
-                        days_old
-                    )
-
-                    if update_needed.get('should_update'):
-                        plan.status = 'update_available'
-                        plan.last_updated = datetime.utcnow()
-                        db.session.commit()
-                        logger.info(f"Plan {plan.id} marked for update review")
-
-        except Exception as e:
-            logger.error(f"Error checking plans: {e}")
+        """Check for plans that need tech updates. Returns the number of plans checked."""
+        if not self.app:
+            return 0
+
+        with self.app.app_context():
+            import tech_catalog
+
+            # Pick up catalog changes made by other workers before checking plans
+            tech_catalog.refresh()
+            # Between chunks: renew the job's lease and stop if it timed out or was taken over
+            stats = check_stale_plans(self.chunk_size, heartbeat=job_scheduler.keep_going)
+            logger.info(
+                f"Checked {stats['checked']} plans in {stats['seconds']:.1f}s "
+                f"({stats['plans_per_sec']:.0f} plans/s, {stats['signatures']} distinct signatures), "
+                f"{stats['marked']} marked for update review"
+            )
+            return stats['checked']
+
+
+def check_stale_plans(chunk_size=1000, now=None, heartbeat=None):
+    """Mark active plans unchecked for 7+ days as 'update_available' where needed.
+
+    Requires an app context. Plans are read in keyset chunks (id > last id,
+    LIMIT chunk_size) of only the columns the check needs, and each chunk's
+    status changes go out as one UPDATE and one commit. Keyset chunks rather
+    than yield_per: a yield_per stream keeps one cursor open across the
+    per-chunk commits, which server-side cursors do not survive and which
+    keeps SQLite's read snapshot pinned for the whole run.
+
+    should_update_plan() depends only on the goal, the plan's technologies
+    (compared by canonical name) and whether the plan is 7+ days old, so it
+    runs once per distinct signature per call. ``heartbeat`` is called after
+    each chunk's commit; when it returns False the run stops early.
+
+    Returns counts, elapsed seconds and plans/sec.
+    """
+    from models import db, Plan
+    from skill_canon import canonical_set
+    from tech_monitor import should_update_plan
+
+    now = now or datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+    plans = Plan.__table__
+    decisions = {}
+    checked = marked = 0
+    last_id = 0
+    started = time.perf_counter()
+
+    while True:
+        # Find plans that haven't been checked in 7+ days
+        chunk = db.session.query(Plan.id, Plan.goal, Plan.technologies, Plan.created_at).filter(
+            Plan.id > last_id,
+            Plan.status == 'active',
+            (Plan.last_updated < week_ago) | (Plan.last_updated.is_(None))
+        ).order_by(Plan.id).limit(chunk_size).all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        to_mark = []
+        for plan in chunk:
+            days_old = (now - plan.created_at).days if plan.created_at else 0
+            technologies = plan.technologies or []
+            signature = ((plan.goal or '').lower(), canonical_set(technologies), days_old >= 7)
+            if signature not in decisions:
+                decisions[signature] = should_update_plan(technologies, plan.goal, days_old).get('should_update', False)
+            if decisions[signature]:
+                to_mark.append(plan.id)
+
+        if to_mark:
+            db.session.execute(
+                plans.update()
+                .where(plans.c.id.in_(to_mark), plans.c.status == 'active')
+                .values(status='update_available', last_updated=now)
+            )
+        db.session.commit()
+        checked += len(chunk)
+        marked += len(to_mark)
+        if heartbeat is not None and not heartbeat():
+            break
+
+    seconds = time.perf_counter() - started
+    return {
+        'checked': checked,
+        'marked': marked,
+        'signatures': len(decisions),
+        'seconds': seconds,
+        'plans_per_sec': checked / seconds if seconds > 0 else 0.0
+    }
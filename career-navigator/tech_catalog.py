@@ -0,0 +1,147 @@
+"""Trend catalog stored in the tech_trends table and hot-reloaded by every worker.
+
+The catalog used to be the TRENDING_TECHNOLOGIES dict, so changing it meant
+redeploying. It now lives in TechTrend rows (seeded from the dict on first
+start) with a CatalogVersion counter that every write bumps. Each process
+keeps an immutable snapshot in tech_monitor (use_catalog) and, at most once
+per TECH_CATALOG_REFRESH_SECONDS, compares the stored version with its own
+with one primary-key lookup; only a changed version reloads the rows. Lookups
+never touch the database.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+import tech_monitor
+from models import db, CatalogVersion, TechTrend
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = 'tech_trends'
+
+_loaded_version = None
+_last_check = None  # time.monotonic() of the last version check
+_refresh_lock = threading.Lock()
+
+
+def seed_catalog(catalog=None):
+    """Fill an empty tech_trends table from TRENDING_TECHNOLOGIES. Returns rows added."""
+    if TechTrend.query.first() is not None:
+        return 0
+    catalog = catalog if catalog is not None else tech_monitor.TRENDING_TECHNOLOGIES
+    try:
+        for name, data in catalog.items():
+            db.session.add(TechTrend(
+                technology_name=name,
+                category=data['category'],
+                relevance_score=data['relevance'],
+                professions=list(data.get('professions', []))
+            ))
+        _bump_version()
+        db.session.commit()
+        return len(catalog)
+    except IntegrityError:
+        # Another worker seeded it first
+        db.session.rollback()
+        return 0
+
+
+def _bump_version():
+    """Increment the catalog version in the current transaction."""
+    updated = CatalogVersion.query.filter_by(name=CATALOG_NAME).update(
+        {'version': CatalogVersion.version + 1}, synchronize_session=False
+    )
+    if not updated:
+        db.session.add(CatalogVersion(name=CATALOG_NAME, version=1))
+
+
+def stored_version():
+    row = db.session.get(CatalogVersion, CATALOG_NAME)
+    return row.version if row else 0
+
+
+def loaded_version():
+    """Catalog version this process serves (0 = the built-in catalog)."""
+    return _loaded_version or 0
+
+
+def _relevance(score):
+    # Scores are stored as floats; keep whole numbers as ints like the built-in catalog
+    score = score or 0
+    return int(score) if float(score).is_integer() else score
+
+
+def load_catalog():
+    """Read every TechTrend row into a name -> data dict."""
+    return {
+        row.technology_name: {
+            'category': row.category,
+            'relevance': _relevance(row.relevance_score),
+            'professions': list(row.professions or [])
+        }
+        for row in TechTrend.query.order_by(TechTrend.id)
+    }
+
+
+def refresh(force=False):
+    """Reload the snapshot if the stored version changed. Returns True if it was reloaded."""
+    global _loaded_version
+    version = stored_version()
+    if version == 0 or (not force and version == _loaded_version):
+        return False  # Version 0: not seeded yet, keep serving the built-in catalog
+    catalog = load_catalog()
+    tech_monitor.use_catalog(catalog)
+    _loaded_version = version
+    logger.info(f"Loaded technology catalog version {version} ({len(catalog)} technologies)")
+    return True
+
+
+def maybe_refresh(interval):
+    """refresh() at most once per ``interval`` seconds per process. Needs an app context."""
+    global _last_check
+    now = time.monotonic()
+    if (_last_check is not None and now - _last_check < interval) or not _refresh_lock.acquire(blocking=False):
+        return False
+    try:
+        _last_check = now
+        return refresh()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error refreshing technology catalog: {e}")
+        return False
+    finally:
+        _refresh_lock.release()
+
+
+def upsert_technologies(technologies, remove=()):
+    """Insert or update catalog entries and delete ``remove``, as one new version.
+
+    ``technologies`` is a list of dicts with name, category, relevance and
+    professions. Returns the new version; this process reloads at once, the
+    others within their refresh interval.
+    """
+    names = [t['name'] for t in technologies]
+    existing = {row.technology_name: row for row in TechTrend.query.filter(TechTrend.technology_name.in_(names))}
+    try:
+        for tech in technologies:
+            row = existing.get(tech['name'])
+            if row is None:
+                row = existing[tech['name']] = TechTrend(technology_name=tech['name'])
+                db.session.add(row)
+            row.category = tech.get('category', row.category)
+            row.relevance_score = tech.get('relevance', row.relevance_score)
+            if 'professions' in tech:
+                row.professions = list(tech['professions'])
+            if 'description' in tech:
+                row.description = tech['description']
+        if remove:
+            TechTrend.query.filter(TechTrend.technology_name.in_(list(remove))).delete(synchronize_session=False)
+        _bump_version()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    refresh(force=True)
+    return _loaded_version
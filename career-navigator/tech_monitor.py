@@ -1,6 +1,11 @@
 import requests
 from datetime import datetime, timedelta
+import bisect
 import re
+import threading
+from types import MappingProxyType
+
+from skill_canon import canonical, canonical_set
 
 # Trending technologies database with relevance scores
 TRENDING_TECHNOLOGIES = {
@@ -68,6 +73,92 @@ TRENDING_TECHNOLOGIES = {
 }
 
 
+class TrendIndex:
+    """Technologies per profession (lowercased), sorted by descending relevance.
+
+    Lookups binary-search the relevance list for the min_relevance cut-off, so
+    they do not scan or re-sort the catalog.
+    """
+
+    def __init__(self, catalog, version=None):
+        self.version = version
+        entries = [
+            {
+                'name': tech,
+                'category': data['category'],
+                'relevance': data['relevance'],
+                'professions': data.get('professions', [])
+            }
+            for tech, data in catalog.items()
+        ]
+        entries.sort(key=lambda x: x['relevance'], reverse=True)  # Stable: ties keep catalog order
+
+        grouped = {None: entries}
+        for entry in entries:
+            for profession in dict.fromkeys(p.lower() for p in entry['professions']):
+                grouped.setdefault(profession, []).append(entry)
+        # profession -> (entries, negated relevances in ascending order for bisect)
+        self._lists = {
+            key: (tuple(group), [-entry['relevance'] for entry in group])
+            for key, group in grouped.items()
+        }
+
+    def lookup(self, profession=None, min_relevance=75):
+        found = self._lists.get(profession.lower() if profession is not None else None)
+        if not found:
+            return []
+        entries, negated = found
+        return list(entries[:bisect.bisect_right(negated, -min_relevance)])
+
+
+_catalog = TRENDING_TECHNOLOGIES  # Served catalog; replaced by use_catalog()
+_catalog_version = 0
+_trend_index = None
+_trend_index_lock = threading.Lock()
+
+
+def catalog_changed():
+    """Invalidate the trend index after the served catalog was modified in place."""
+    global _catalog_version
+    _catalog_version += 1
+
+
+def use_catalog(catalog, version=None):
+    """Serve lookups from a read-only snapshot of ``catalog`` (name -> data).
+
+    The index is built before the swap, so concurrent lookups see either the
+    old catalog or the new one, never a partial one.
+    """
+    global _catalog, _catalog_version, _trend_index
+    snapshot = MappingProxyType({name: MappingProxyType(dict(data)) for name, data in catalog.items()})
+    with _trend_index_lock:
+        _catalog_version = version if version is not None else _catalog_version + 1
+        index = TrendIndex(snapshot, _catalog_version)
+        _catalog, _trend_index = snapshot, index
+
+
+def get_catalog():
+    """The catalog lookups are served from (name -> category/relevance/professions)."""
+    return _catalog
+
+
+def catalog_version():
+    """Changes whenever the served catalog does (use_catalog or catalog_changed)."""
+    return _catalog_version
+
+
+def get_trend_index():
+    """Return the TrendIndex for the current catalog version, rebuilding it if stale."""
+    global _trend_index
+    index = _trend_index
+    if index is None or index.version != _catalog_version:
+        with _trend_index_lock:
+            index = _trend_index
+            if index is None or index.version != _catalog_version:
+                index = _trend_index = TrendIndex(_catalog, _catalog_version)
+    return index
+
+
 def get_trending_technologies(profession=None, min_relevance=75):
     """
     Get trending technologies filtered by profession and minimum relevance score
@@ -77,26 +168,14 @@ def get_trending_technologies(profession=None, min_relevance=75):
         min_relevance: int - Minimum relevance score (0-100)
     
     Returns:
-        list - Sorted list of trending technologies
+        list - Sorted list of trending technologies. The entries are shared
+        between calls; treat them as read-only.
     """
     
-    trending = []
-    for tech, data in TRENDING_TECHNOLOGIES.items():
-        if data['relevance'] >= min_relevance:
-            if profession is None or profession.lower() in [p.lower() for p in data.get('professions', [])]:
-                trending.append({
-                    'name': tech,
-                    'category': data['category'],
-                    'relevance': data['relevance'],
-                    'professions': data.get('professions', [])
-                })
-    
-    # Sort by relevance score
-    trending.sort(key=lambda x: x['relevance'], reverse=True)
-    return trending
+    return get_trend_index().lookup(profession, min_relevance)
 
 
-def detect_new_technologies(current_skills, profession, threshold=80):
+def detect_new_technologies(current_skills, profession, threshold=80, trending=None):
     """
     Detect new technologies that emerged for a profession
     
@@ -104,25 +183,23 @@ def detect_new_technologies(current_skills, profession, threshold=80):
         current_skills: list - Skills currently in the user's plan
         profession: str - User's target profession
         threshold: int - Relevance threshold for "new" tech
+        trending: list - Optional get_trending_technologies(profession, r) result
+            with r <= threshold, to reuse a lookup already made
     
     Returns:
         dict - Contains new_technologies, deprecated_technologies, recommendations
     """
     
-    trending = get_trending_technologies(profession, min_relevance=threshold)
+    if trending is None:
+        trending = get_trending_technologies(profession, min_relevance=threshold)
+    else:
+        trending = [tech_data for tech_data in trending if tech_data['relevance'] >= threshold]
     
-    # Skills in the plan
-    current_skills_lower = [skill.lower() for skill in current_skills]
+    # Skills in the plan, by canonical name ('React 18' == 'react', 'Postgres' == 'PostgreSQL')
+    known = canonical_set(current_skills)
     
-    new_technologies = []
-    for tech_data in trending:
-        tech_lower = tech_data['name'].lower()
-        # Check if technology is not in current skills
-        if not any(skill in tech_lower or tech_lower in skill for skill in current_skills_lower):
-            new_technologies.append(tech_data)
-    
-    # Sort by relevance
-    new_technologies.sort(key=lambda x: x['relevance'], reverse=True)
+    # Check if technology is not in current skills; trending is already sorted by relevance
+    new_technologies = [tech_data for tech_data in trending if canonical(tech_data['name']) not in known]
     
     return {
         'new_technologies': new_technologies[:5],  # Top 5 new tech
@@ -167,19 +244,24 @@ def should_update_plan(plan_technologies, profession, days_since_creation=30):
         }
 
 
-def generate_tech_recommendations(profession, current_technologies):
+def generate_tech_recommendations(profession, current_technologies, trending=None):
     """
     Generate personalized tech recommendations for a profession
     
     Args:
         profession: str - Target profession
         current_technologies: list - Technologies already in plan
+        trending: list - Optional get_trending_technologies(profession, r) result
+            with r <= 75, to reuse a lookup already made
     
     Returns:
         dict - Recommendations with details
     """
     
-    trending = get_trending_technologies(profession, min_relevance=75)
+    if trending is None:
+        trending = get_trending_technologies(profession, min_relevance=75)
+    else:
+        trending = [tech_data for tech_data in trending if tech_data['relevance'] >= 75]
     
     recommendations = {
         'must_learn': [],      # Core technologies (85+ relevance)
@@ -187,13 +269,11 @@ def generate_tech_recommendations(profession, current_technologies):
         'emerging': []         # Emerging tech (new but rising)
     }
     
-    current_lower = [t.lower() for t in current_technologies]
+    known = canonical_set(current_technologies)
     
     for tech_data in trending:
-        tech_lower = tech_data['name'].lower()
-        
         # Skip if already in plan
-        if any(skill in tech_lower or tech_lower in skill for skill in current_lower):
+        if canonical(tech_data['name']) in known:
             continue
         
         if tech_data['relevance'] >= 85:
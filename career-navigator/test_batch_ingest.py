@@ -0,0 +1,132 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from app import app, db, ingest_job_queue
+from models import User, Resume
+import resume_parser
+from batch_ingest import _extract_archive, _parse_worker, ingest_resumes
+
+
+@pytest.fixture
+def owner(tmp_path):
+    app.config['TESTING'] = True
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'uploads')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(name='Cohort Owner', email='owner@example.com')
+        user.set_password('secret123')
+        db.session.add(user)
+        db.session.commit()
+        yield user.id
+
+
+def _write_resumes(directory, count):
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(directory, f'resume_{i}.txt'), 'w', encoding='utf-8') as f:
+            f.write(f'Software Engineer with {i % 7} years of experience in Python, SQL and Docker.')
+    with open(os.path.join(directory, 'notes.docx'), 'w') as f:
+        f.write('ignored')
+
+
+def test_ingest_directory(tmp_path, owner):
+    _write_resumes(tmp_path / 'cohort', 12)
+    with app.app_context():
+        stats = ingest_resumes(str(tmp_path / 'cohort'), app.config['UPLOAD_FOLDER'],
+                               user_id=owner, workers=2, commit_every=5, chunk_size=4)
+        assert stats['files'] == 12
+        assert stats['inserted'] == 12
+        assert stats['failed'] == 0
+        assert stats['resumes_per_sec'] > 0
+        resumes = Resume.query.filter_by(user_id=owner).all()
+        assert len(resumes) == 12
+        assert all('Python' in r.skills for r in resumes)
+
+
+def test_worker_parses_chunk_in_one_batch(tmp_path, monkeypatch):
+    _write_resumes(tmp_path / 'cohort', 3)
+    batches = []
+    parse_resume_texts = resume_parser.parse_resume_texts
+    monkeypatch.setattr(resume_parser, 'parse_resume_texts',
+                        lambda texts, **kwargs: batches.append(list(texts)) or parse_resume_texts(batches[-1], **kwargs))
+    tasks = [(f'resume_{i}.txt', str(tmp_path / 'cohort' / f'resume_{i}.txt'), str(tmp_path / f'copy_{i}.txt'))
+             for i in range(3)]
+    tasks.insert(1, ('missing.txt', str(tmp_path / 'missing.txt'), str(tmp_path / 'copy_missing.txt')))
+    results, timings = _parse_worker(tasks)
+    assert [r['name'] for r in results] == ['resume_0.txt', 'missing.txt', 'resume_1.txt', 'resume_2.txt']
+    assert 'error' in results[1]
+    assert len(batches) == 1 and len(batches[0]) == 3
+    assert results[3]['parsed'] == resume_parser.parse_resume_text(open(tasks[3][1]).read())
+    assert set(timings) == {'copy', 'extract', 'parse'}
+
+
+def test_admin_ingest_archive_matches_email(tmp_path, owner):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('owner@example.com.txt', 'Data Scientist, 3 years of experience with Pandas')
+        zf.writestr('../unknown@example.com.txt', 'Web Developer')
+    buf.seek(0)
+
+    client = app.test_client()
+    auth = {'Authorization': 'Bearer ' + os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')}
+    ingest_job_queue.start()
+    rv = client.post('/api/admin/ingest-resumes',
+                     data={'archive': (buf, 'cohort.zip'), 'match_email': 'true', 'workers': '1'},
+                     headers=auth, content_type='multipart/form-data')
+    assert rv.status_code == 202
+    status_url = rv.get_json()['status_url']
+    assert client.get(status_url).status_code == 401
+
+    ingest_job_queue.join()
+    job = client.get(status_url, headers=auth).get_json()
+    assert job['status'] == 'completed'
+    assert job['stats']['inserted'] == 1
+    assert job['stats']['skipped_no_owner'] == 1
+    with app.app_context():
+        resume = Resume.query.filter_by(user_id=owner).one()
+        assert resume.current_role == 'Data Scientist'
+        assert os.path.dirname(resume.file_path) == app.config['UPLOAD_FOLDER']
+    # The saved archive is removed once imported
+    assert os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'ingest')) == []
+
+
+def test_admin_ingest_failure_is_reported(tmp_path, owner):
+    client = app.test_client()
+    auth = {'Authorization': 'Bearer ' + os.getenv('API_ADMIN_KEY', 'dev-key-change-in-production')}
+    ingest_job_queue.start()
+    rv = client.post('/api/admin/ingest-resumes',
+                     data={'archive': (io.BytesIO(b'not a zip'), 'cohort.zip'), 'user_id': str(owner)},
+                     headers=auth, content_type='multipart/form-data')
+    assert rv.status_code == 202
+    ingest_job_queue.join()
+    job = client.get(rv.get_json()['status_url'], headers=auth).get_json()
+    assert job['status'] == 'failed' and job['error']
+
+
+def test_archive_limits_checked_before_extraction(tmp_path):
+    archive = tmp_path / 'bomb.zip'
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for i in range(3):
+            zf.writestr(f'resume_{i}.txt', 'Python ' * 20000)
+    out = tmp_path / 'out'
+    out.mkdir()
+    with pytest.raises(ValueError, match='bytes'):
+        _extract_archive(str(archive), str(out), max_bytes=100000)
+    with pytest.raises(ValueError, match='files'):
+        _extract_archive(str(archive), str(out), max_files=2)
+    assert os.listdir(out) == []
+    assert len(_extract_archive(str(archive), str(out))) == 3
+
+
+def test_worker_adds_skill_index_matches(tmp_path, monkeypatch):
+    import batch_ingest
+    monkeypatch.setattr(batch_ingest, '_worker_skill_index', None)
+    source = tmp_path / 'pg.txt'
+    source.write_text('Backend developer: Python services on Postgres', encoding='utf-8')
+    batch_ingest._init_worker(['PostgreSQL'])
+    results, _timings = _parse_worker([('pg.txt', str(source), str(tmp_path / 'copy.txt'))])
+    assert results[0]['parsed']['skills'] == ['Python', 'PostgreSQL']
@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, text
+
+from db_config import configure_engine, engine_options, sqlite_pragmas
+
+
+def test_sqlite_connections_get_wal_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT_MS', '2500')
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    assert engine_options(url) == {'connect_args': {'timeout': 2.5}}
+
+    engine = create_engine(url, **engine_options(url))
+    configure_engine(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 2500
+    engine.dispose()
+
+
+def test_memory_database_skips_wal():
+    assert not any('journal_mode' in p or 'mmap_size' in p for p in sqlite_pragmas('sqlite://'))
+
+
+def test_server_database_gets_pool_settings(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '12')
+    monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+    options = engine_options('postgresql://user:pass@db/career')
+    assert options == {'pool_size': 12, 'max_overflow': 10, 'pool_timeout': 30,
+                       'pool_recycle': 1800, 'pool_pre_ping': False}
@@ -0,0 +1,62 @@
+import random
+import time
+
+from field_extractor import ResumeFieldExtractor
+from resume_parser import ROLE_TITLES, SKILL_KEYWORDS, parse_resume_text
+
+EXTRACTOR = ResumeFieldExtractor(SKILL_KEYWORDS, ROLE_TITLES)
+
+
+def test_all_fields_in_one_scan():
+    fields = EXTRACTOR.extract(
+        'Backend Developer, later Data Scientist. Machine learning.\n'
+        'B.S. in Computer Science, Stanford\n'
+        '6 years of experience with Python, SQL and node.js'
+    )
+    assert fields.skills == {'python', 'sql', 'node.js', 'machine learning'}
+    assert fields.role == 'Data Scientist'  # earlier in ROLE_TITLES wins, not earlier in text
+    assert fields.education == 'B.S. In Computer Science'
+    assert fields.years_of_experience == 6.0
+
+
+def test_years_fallback_is_line_bounded():
+    assert EXTRACTOR.extract('Experience: 7 yrs building APIs').years_of_experience == 7.0
+    assert EXTRACTOR.extract('Total experience - 3.5 years').years_of_experience == 3.5
+    assert EXTRACTOR.extract('Experience\nLived abroad 3 years').years_of_experience == 0.0
+    assert EXTRACTOR.extract('Expert in Go, 4 years at Acme').years_of_experience == 0.0
+
+
+def test_education_needs_word_boundaries():
+    assert EXTRACTOR.extract('Worked on jobs and systems').education is None
+    assert EXTRACTOR.extract('Diploma in design; Master of Arts').education == 'Master Of Arts'
+
+
+def test_parse_resume_text_defaults():
+    result = parse_resume_text('')
+    assert result['education'] == 'Not specified'
+    assert result['current_role'] == 'Not specified'
+    assert result['years_of_experience'] == 0.0
+
+
+def test_fuzz_worst_case_inputs_stay_linear():
+    rng = random.Random(1234)
+    pieces = ['experience ', 'exp ', '1', '12 ', ' ', '+', 'years', 'yrs ', 'of ', 'b.s', '.', 'master',
+              'machine ', 'learning', 'c++', 'node.', 'software ', 'engineer', '\n', ',', 'a']
+    inputs = [
+        'experience ' + '1 ' * 100000,            # old '.*?(\d+)' backtracked over the whole line per number
+        'exp' + ' ' * 200000 + 'x',
+        '9' * 200000,
+        'bachelor' + ' in' * 70000,
+        'machine ' * 25000 + 'learning',
+        ''.join(rng.choice(pieces) for _ in range(60000)),
+    ]
+    for text in inputs:
+        start = time.perf_counter()
+        EXTRACTOR.extract(text)
+        assert time.perf_counter() - start < 2.0, text[:40]
+
+    for _ in range(200):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+        fields = EXTRACTOR.extract(text)
+        assert fields.years_of_experience >= 0
+        assert fields.skills <= set(EXTRACTOR.skill_keywords)
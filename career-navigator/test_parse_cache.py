@@ -0,0 +1,86 @@
+import io
+import os
+
+import pytest
+
+import parse_cache
+import resume_parser
+from app import app, db
+from models import Resume, ResumeParseCache
+
+
+@pytest.fixture
+def client(tmp_path):
+    app.config['TESTING'] = True
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'uploads')
+    with app.test_client() as client:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+        parse_cache.reset_counters()
+        client.post('/register', json={
+            'name': 'Cache User',
+            'email': 'cache@example.com',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123'
+        })
+        yield client
+
+
+def _upload(client, content, name='resume.txt'):
+    token = client.get('/api/get-csrf-token').get_json()['csrf_token']
+    return client.post('/api/upload-resume',
+                       data={'resume': (io.BytesIO(content), name)},
+                       headers={'X-CSRFToken': token},
+                       content_type='multipart/form-data')
+
+
+def test_reupload_hits_cache_and_stores_file_once(client):
+    content = b'Data Scientist with 4 years of experience in Python and SQL'
+    first = _upload(client, content)
+    second = _upload(client, content, name='renamed.txt')
+    assert first.status_code == 200 and second.status_code == 200
+    assert first.get_json()['parsed_data'] == second.get_json()['parsed_data']
+
+    counters = parse_cache.stats()
+    assert counters['process_hits'] == 1
+    assert counters['process_misses'] == 1
+    assert counters['cached_entries'] == 1
+
+    with app.app_context():
+        paths = {r.file_path for r in Resume.query.all()}
+        assert len(paths) == 1
+        assert ResumeParseCache.query.one().hit_count == 1
+    stored = [f for _, _, files in os.walk(app.config['UPLOAD_FOLDER']) for f in files]
+    assert len(stored) == 1
+
+
+def test_different_content_misses(client):
+    _upload(client, b'Web Developer, JavaScript and React')
+    _upload(client, b'DevOps Engineer, Docker and Kubernetes')
+    assert parse_cache.stats()['process_misses'] == 2
+
+
+def test_failed_or_truncated_pdf_parse_is_not_cached(client, monkeypatch):
+    def broken(path, *args, **kwargs):
+        raise OSError('temporarily unreadable')
+
+    monkeypatch.setattr(resume_parser, 'extract_pdf', broken)
+    first = _upload(client, b'%PDF-1.4 resume', name='resume.pdf')
+    assert first.status_code == 200
+    assert first.get_json()['parsed_data']['error'] == 'temporarily unreadable'
+    with app.app_context():
+        assert ResumeParseCache.query.count() == 0
+
+    monkeypatch.setattr(resume_parser, 'extract_pdf', lambda path, *args, **kwargs: ('Python developer', True))
+    second = _upload(client, b'%PDF-1.4 resume', name='resume.pdf')
+    assert second.get_json()['parsed_data']['skills'] == ['Python']
+    assert second.get_json()['parsed_data']['truncated'] is True
+    with app.app_context():
+        assert ResumeParseCache.query.count() == 0
+
+    monkeypatch.setattr(resume_parser, 'extract_pdf', lambda path, *args, **kwargs: ('Python developer', False))
+    _upload(client, b'%PDF-1.4 resume', name='resume.pdf')
+    assert parse_cache.stats()['process_misses'] == 3
+    with app.app_context():
+        assert ResumeParseCache.query.count() == 1
@@ -1,5 +1,5 @@
 import pytest
-from planner import generate_daily_plan
+from planner import generate_daily_plan, generate_specific_task
 
 
 def test_generate_daily_plan_day_indexing_and_length():
@@ -22,3 +22,24 @@ def test_generate_daily_plan_day_indexing_and_length():
     assert daily_tasks[0]['day'] == 1
     for i, task in enumerate(daily_tasks, start=1):
         assert task['day'] == i
+
+
+def test_cached_skeleton_returns_fresh_plans():
+    first = generate_daily_plan('Software Engineer', 6, ['Python'], 'beginner')
+    first['daily_tasks'][0]['task'] = 'changed'
+    first['milestones'][0]['milestone'] = 'changed'
+
+    second = generate_daily_plan('software engineer', 6, ['SQL'], 'beginner')
+    assert second['daily_tasks'][0]['task'] == 'Learn variables, data types, and basic operations'
+    assert second['milestones'][0]['milestone'] != 'changed'
+    # Skill filtering is still per user
+    assert 'Python' not in first['technologies'] and 'Python' in second['technologies']
+    assert 'SQL' not in second['technologies']
+
+
+def test_phase_tasks_cycle_and_unknown_focus_falls_back():
+    plan = generate_daily_plan('Software Engineer', 6, [], 'intermediate')
+    # Python Fundamentals has 8 templates, so day 9 repeats day 1
+    assert plan['daily_tasks'][8]['task'] == plan['daily_tasks'][0]['task']
+    assert plan['daily_tasks'][14]['focus_area'] == 'Web Development Basics (HTML/CSS)'
+    assert generate_specific_task('Underwater Basket Weaving', 3, [], 'beginner') == 'Work on Underwater Basket Weaving - Day 3'
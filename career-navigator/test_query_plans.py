@@ -0,0 +1,68 @@
+"""EXPLAIN QUERY PLAN checks: hot dashboard/progress queries must use an index."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app import app, db
+from db_migrations import ensure_schema
+from models import DailyProgress, Plan, Progress, Resume
+
+
+@pytest.fixture
+def ctx():
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield
+
+
+def _hot_queries():
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    return {
+        'completed count': DailyProgress.query.filter_by(plan_id=1, is_completed=True),
+        'plan days in order': DailyProgress.query.filter_by(plan_id=1).order_by(DailyProgress.day_number),
+        'next open day': DailyProgress.query.filter_by(plan_id=1, is_completed=False)
+                                            .order_by(DailyProgress.day_number).limit(1),
+        'days after cursor': DailyProgress.query.filter(DailyProgress.plan_id == 1, DailyProgress.day_number > 40)
+                                                 .order_by(DailyProgress.day_number).limit(20),
+        'day lookup': DailyProgress.query.filter_by(plan_id=1, day_number=5),
+        'latest resume': Resume.query.filter_by(user_id=1).order_by(Resume.uploaded_at.desc()).limit(1),
+        'active plan': Plan.query.filter_by(user_id=1, status='active'),
+        'stale plans': Plan.query.filter(Plan.status == 'active',
+                                         (Plan.last_updated < week_ago) | (Plan.last_updated.is_(None))),
+        'user progress': Progress.query.filter_by(user_id=1),
+        'progress summary': db.session.query(Plan.goal, Progress.total_days_completed)
+                                      .join(Plan, Plan.id == Progress.plan_id).filter(Progress.user_id == 1),
+        'plan summary row': Progress.query.filter_by(plan_id=1),
+    }
+
+
+def _explain(query):
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with db.engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params)]
+
+
+def test_hot_queries_use_indexes(ctx):
+    for name, query in _hot_queries().items():
+        plan = _explain(query)
+        assert any(step.startswith('SEARCH') for step in plan), (name, plan)
+        assert not any(step.startswith('SCAN') for step in plan), (name, plan)
+        assert not any('TEMP B-TREE' in step for step in plan), (name, plan)
+
+
+def test_ensure_schema_creates_missing_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in ('daily_progress', 'resumes', 'plans', 'progress'):
+            for ix in inspect(engine).get_indexes(table):
+                conn.execute(text(f'DROP INDEX {ix["name"]}'))
+
+    added = ensure_schema(engine, db.metadata)
+    assert {'ix_daily_progress_plan_completed_day', 'ux_daily_progress_plan_day', 'ix_resumes_user_uploaded',
+            'ix_plans_user_status', 'ix_plans_status_updated', 'ix_progress_user', 'ux_progress_plan'} <= set(added)
+    assert ensure_schema(engine, db.metadata) == []
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from app import app, db, resume_job_queue
+from models import Resume, ResumeJob
+
+
+@pytest.fixture
+def client(tmp_path):
+    app.config['TESTING'] = True
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'uploads')
+    app.config['RESUME_ASYNC_PARSING'] = True
+    with app.test_client() as client:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+        client.post('/register', json={
+            'name': 'Async User',
+            'email': 'async@example.com',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123'
+        })
+        resume_job_queue.start()
+        yield client
+    resume_job_queue.stop()
+    app.config['RESUME_ASYNC_PARSING'] = False
+
+
+def test_async_upload_returns_job_and_completes(client):
+    token = client.get('/api/get-csrf-token').get_json()['csrf_token']
+    rv = client.post('/api/upload-resume',
+                     data={'resume': (io.BytesIO(b'Web Developer, 2 years of experience, JavaScript'), 'cv.txt')},
+                     headers={'X-CSRFToken': token},
+                     content_type='multipart/form-data')
+    assert rv.status_code == 202
+    body = rv.get_json()
+    assert body['status'] == 'queued'
+
+    resume_job_queue.join()
+
+    rv = client.get(body['status_url'])
+    assert rv.status_code == 200
+    job = rv.get_json()
+    assert job['status'] == 'completed'
+    assert job['parsed_data']['current_role'] == 'Web Developer'
+    with app.app_context():
+        assert Resume.query.get(job['resume_id']).filename == 'cv.txt'
+
+
+def test_job_status_requires_owner(client):
+    with app.app_context():
+        job = ResumeJob(user_id=999, filename='x.txt', file_path='x', content_hash='0' * 64, file_ext='txt')
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+    assert client.get(f'/api/resume-jobs/{job_id}').status_code == 403
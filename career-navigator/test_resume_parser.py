@@ -0,0 +1,170 @@
+import importlib
+import re
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import nlp_loader
+import resume_parser
+from resume_parser import extract_skills_from_text, parse_resume_text, parse_resume_texts, SKILL_KEYWORDS
+from resume_parser import _pages_within_budget, extract_pdf, extract_pdf_text, iter_pdf_pages, shutdown_pdf_workers
+from skill_matcher import SkillMatcher, normalize_skill_name
+
+
+def _naive_extract(text, keywords):
+    """Reference implementation: one regex search per keyword."""
+    text_lower = text.lower()
+    found = {kw for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', text_lower)}
+    return [normalize_skill_name(s) for s in sorted(found)]
+
+
+def test_extract_skills_matches_per_keyword_search():
+    text = (
+        "Senior engineer with Python, Django and Flask. Built ML pipelines in TensorFlow (tf) "
+        "and PyTorch, data analysis with Pandas. Deployed on AWS with Docker and Kubernetes. "
+        "Frontend in React, JavaScript, HTML/CSS; backend in Node.js and Java. Machine learning, deep learning."
+    )
+    assert extract_skills_from_text(text) == _naive_extract(text, SKILL_KEYWORDS)
+
+
+def test_extract_skills_word_boundaries():
+    # 'java' must not match inside 'javascript', and symbol-terminated keywords match before spaces
+    assert extract_skills_from_text('JavaScript developer') == ['Javascript']
+    assert extract_skills_from_text('Expert in C++ and Git') == ['C++', 'Git']
+    assert extract_skills_from_text('platform reactor') == []
+
+
+def test_skill_matcher_large_vocabulary():
+    vocab = ['skill%d' % i for i in range(5000)] + ['machine learning', 'learning']
+    matcher = SkillMatcher(vocab)
+    found = matcher.find('Knows skill42, skill4999 and machine learning; not skill50000.')
+    assert found == {'skill42', 'skill4999', 'machine learning', 'learning'}
+
+
+def test_spacy_not_loaded_at_import():
+    import resume_parser
+    nlp_loader.reset()
+    importlib.reload(resume_parser)
+    assert not nlp_loader.is_loaded()
+
+
+def test_batch_parse_matches_single(monkeypatch):
+    monkeypatch.setenv('RESUME_NLP_ENABLED', 'false')
+    texts = ['Python developer, 3 years of experience', 'Data scientist with SQL and Pandas']
+    assert parse_resume_texts(texts) == [parse_resume_text(t) for t in texts]
+
+
+def _make_pdf(path, pages, lines_per_page=40):
+    """Write a minimal multi-page PDF with one Helvetica text stream per page."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for n in range(pages):
+        lines = ''.join(f'({"Python SQL Docker page %d line %d" % (n + 1, i)}) Tj T* ' for i in range(lines_per_page))
+        stream = f'BT /F1 10 Tf 12 TL 40 800 Td {lines}ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {pages} >>'
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{i} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for off in offsets:
+        out += f'{off:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    path.write_bytes(bytes(out))
+    return str(path)
+
+
+def test_pdf_extraction_is_page_bounded(tmp_path):
+    path = _make_pdf(tmp_path / 'huge.pdf', pages=400)
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = extract_pdf_text(path, max_pages=10)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert 'page 10 line 0' in text
+    assert 'page 11 line 0' not in text
+    assert elapsed < 10
+    assert peak < 64 * 1024 * 1024
+
+
+def test_pdf_extraction_character_cap(tmp_path):
+    path = _make_pdf(tmp_path / 'long.pdf', pages=5)
+    pages = list(iter_pdf_pages(path, max_pages=50, max_chars=1500))
+    assert sum(len(p) for p in pages) == 1500
+    assert len(pages) < 5
+
+
+def test_pdf_page_falls_back_to_pypdf2(tmp_path, monkeypatch):
+    from pdfplumber.page import Page
+    original = Page.extract_text
+
+    def flaky_extract(self, *args, **kwargs):
+        if self.page_number == 2:
+            raise ValueError('broken page')
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Page, 'extract_text', flaky_extract)
+    path = _make_pdf(tmp_path / 'flaky.pdf', pages=3, lines_per_page=2)
+    pages = list(iter_pdf_pages(path))
+    assert len(pages) == 3
+    assert 'page 2 line 0' in pages[1]
+    assert 'page 3 line 0' in pages[2]
+
+
+def _slow_pages(path):
+    """Page source for the budget test: the second page of slow.pdf never finishes in time."""
+    yield f'{path} page 1'
+    if path == 'slow.pdf':
+        time.sleep(30)
+    yield f'{path} page 2'
+
+
+def test_pdf_page_budget_kills_slow_page():
+    assert _pages_within_budget(_slow_pages, ('fast.pdf',), page_time_budget=0.5) == (
+        ['fast.pdf page 1', 'fast.pdf page 2'], False
+    )
+    start = time.perf_counter()
+    pages, truncated = _pages_within_budget(_slow_pages, ('slow.pdf',), page_time_budget=0.5)
+    assert pages == ['slow.pdf page 1']
+    assert truncated
+    assert time.perf_counter() - start < 15
+    # The killed process is replaced on the next call
+    assert _pages_within_budget(_slow_pages, ('fast.pdf',), page_time_budget=0.5)[1] is False
+
+
+def _one_page(path):
+    yield f'{path} page 1'
+
+
+def test_pdf_workers_are_shared_and_stopped(monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_WORKERS', 1)
+    paths = [f'{i}.pdf' for i in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as threads:
+        results = list(threads.map(lambda path: _pages_within_budget(_one_page, (path,), 5), paths))
+    assert results == [([f'{path} page 1'], False) for path in paths]
+
+    pool = resume_parser._page_pools[_one_page]
+    assert len(pool.workers) == 1
+    process = pool.workers[0].process
+    assert process.is_alive()
+    shutdown_pdf_workers()
+    assert not process.is_alive() and pool.workers[0].process is None
+    # Started again on demand
+    assert _pages_within_budget(_one_page, ('again.pdf',), 5) == (['again.pdf page 1'], False)
+    shutdown_pdf_workers()
+
+
+def test_pdf_extraction_in_child_matches_in_process(tmp_path):
+    path = _make_pdf(tmp_path / 'small.pdf', pages=3, lines_per_page=2)
+    assert extract_pdf(path) == extract_pdf(path, page_time_budget=0)
+    assert extract_pdf(path)[1] is False
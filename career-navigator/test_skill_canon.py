@@ -0,0 +1,46 @@
+from skill_canon import canonical, canonical_set, skill_keys
+from tech_monitor import detect_new_technologies, generate_tech_recommendations
+
+
+def test_spellings_share_a_key():
+    assert canonical('Node.js') == canonical('nodejs') == canonical('Node JS') == 'nodejs'
+    assert canonical('Postgres 16') == canonical('PostgreSQL') == 'postgresql'
+    assert canonical('React 18') == canonical('react.js') == 'react'
+    assert canonical('Next.js 14') == canonical('NextJS') == 'nextjs'
+    assert canonical('Go 1.21') == canonical('golang') == 'go'
+    assert canonical('Kubernetes 1.28') == canonical('k8s')
+    assert canonical('Tailwind CSS') == canonical('tailwindcss')
+    assert canonical('Fine-tuning') == canonical('finetuning')
+    assert canonical('GPT-4') == canonical('GPT') == 'gpt'
+    assert canonical('Python-3') == canonical('Python (3.12)') == canonical('Python') == 'python'
+    assert canonical('  ') == ''
+
+
+def test_unrelated_names_do_not_match():
+    assert canonical('Django 5') != canonical('Go 1.21')
+    assert canonical('Java') != canonical('JavaScript')
+    assert canonical('C') != canonical('C++') != canonical('C#')
+    assert skill_keys('React/Vue') == {'react vue', 'react', 'vue'}
+    assert canonical('Vue 3') in canonical_set(['HTML', 'React/Vue'])
+
+
+def test_detection_uses_canonical_names():
+    skills = ['django', 'Postgres', 'React', 'nodejs', 'k8s']
+    result = detect_new_technologies(skills, 'Backend Engineer', threshold=0)
+    assert result['total_new'] == len(result['all_trending']) - 2  # Postgres 16 and Django 5 are known
+
+    recs = generate_tech_recommendations('Backend Engineer', skills)
+    listed = {t['name'] for group in recs.values() for t in group}
+    assert 'Go 1.21' in listed  # Not hidden by 'django'
+    assert not {'Postgres 16', 'Django 5'} & listed
+
+    recs = generate_tech_recommendations('Frontend Developer', ['React 17', 'Tailwind'])
+    listed = {t['name'] for group in recs.values() for t in group}
+    assert 'React 18' not in listed and 'Tailwind CSS' not in listed and 'Next.js 14' in listed
+
+
+def test_hyphenated_versions_are_known():
+    result = detect_new_technologies(['GPT', 'Python'], 'AI Engineer', threshold=0,
+                                     trending=[{'name': 'GPT-4', 'relevance': 99}, {'name': 'Python-3', 'relevance': 90},
+                                               {'name': 'LangChain', 'relevance': 80}])
+    assert [t['name'] for t in result['new_technologies']] == ['LangChain']
@@ -0,0 +1,63 @@
+from resume_parser import parse_resume_texts
+from skill_index import SkillIndex, build_skill_taxonomy, get_default_index, normalize_phrase, strip_version
+from tech_monitor import get_catalog, use_catalog
+
+
+def test_taxonomy_includes_planner_and_trend_skills():
+    keys = {normalize_phrase(s) for s in build_skill_taxonomy()}
+    assert {'python', 'kubernetes', 'hugging face', 'nextjs', 'academic writing'} <= keys
+
+
+def test_version_numbers_are_stripped():
+    assert strip_version('TensorFlow 2.14') == 'TensorFlow'
+    assert strip_version('Python v3') == 'Python'
+    assert normalize_phrase('Node.js') == 'nodejs'
+
+
+def test_fuzzy_spellings_match():
+    index = get_default_index()
+    matches = index.match_texts([
+        'Built APIs on Postgres with node.js; fine-tuned models with huggingface',
+        'Scikit learn and Pytorch 2.1 for machine-learning'
+    ])
+    assert {'Postgres', 'Nodejs', 'Hugging Face'} <= set(matches[0])
+    assert {'Scikit-learn', 'Pytorch', 'Machine Learning'} <= set(matches[1])
+
+
+def test_no_matches_from_filler_words():
+    index = SkillIndex(['Java', 'User Experience', 'Go'])
+    matches = index.match_texts(['JavaScript engineer with experience in Google products', '', None])
+    assert matches == [[], [], []]
+
+
+def test_batch_scores_are_per_text():
+    index = SkillIndex(['PostgreSQL', 'Docker'])
+    scores = index.score_texts(['postgres', 'docker and postgresql', 'nothing here'])
+    assert scores.shape == (3, 2)
+    assert scores[0, 0] >= index.threshold and scores[0, 1] == 0
+    assert scores[1, 0] == 1.0 and scores[1, 1] == 1.0
+    assert scores[2].nnz == 0
+
+
+def test_taxonomy_follows_served_catalog():
+    original = get_catalog()
+    catalog = dict(original)
+    catalog['Zig Language'] = {'category': 'Language', 'relevance': 99, 'professions': ['Systems Engineer']}
+    before = get_default_index()
+    try:
+        use_catalog(catalog)
+        assert 'Zig Language' in build_skill_taxonomy()
+        index = get_default_index()
+        assert index is not before
+        assert index.match_texts(['wrote a compiler in zig language']) == [['Zig Language']]
+    finally:
+        use_catalog(original)
+    assert 'Zig Language' not in get_default_index().skills
+
+
+def test_batch_parse_adds_fuzzy_matches():
+    index = SkillIndex(['PostgreSQL', 'Python'])
+    texts = ['Python services on Postgres', 'Python only']
+    parsed = parse_resume_texts(texts, skill_index=index)
+    assert parsed[0]['skills'] == parse_resume_texts(texts)[0]['skills'] + ['PostgreSQL']
+    assert parsed[1]['skills'] == ['Python']
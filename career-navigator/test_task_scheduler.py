@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import app, db
+from models import Plan, Resume, User
+from task_scheduler import check_stale_plans
+from tech_monitor import should_update_plan
+
+NOW = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def ctx():
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(name='Sched', email='sched@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        resume = Resume(user_id=user.id, filename='cv.txt', file_path='cv.txt')
+        db.session.add(resume)
+        db.session.flush()
+        yield user.id, resume.id
+        db.session.remove()
+
+
+def _plan(ids, goal, technologies, age_days, checked_days_ago=None, status='active'):
+    user_id, resume_id = ids
+    created = NOW - timedelta(days=age_days)
+    return Plan(user_id=user_id, resume_id=resume_id, goal=goal, duration_months=6, end_date=created,
+                technologies=technologies, created_at=created, status=status,
+                last_updated=NOW - timedelta(days=checked_days_ago if checked_days_ago is not None else age_days))
+
+
+def test_check_stale_plans_matches_per_plan_evaluation(ctx):
+    cases = [
+        ('Backend Engineer', [], 30, None, 'active'),
+        ('backend engineer', [], 30, None, 'active'),
+        ('Backend Engineer', ['AWS', 'Docker', 'TypeScript', 'Rust', 'FastAPI', 'GraphQL', 'Postgres'], 30, None, 'active'),
+        ('AI Engineer', ['gpt-4'], 30, None, 'active'),
+        ('AI Engineer', [], 3, 30, 'active'),       # Too new, never checked
+        ('AI Engineer', [], 30, 2, 'active'),       # Checked recently
+        ('AI Engineer', [], 30, None, 'paused'),
+        ('Astronaut', [], 30, None, 'active'),
+    ]
+    db.session.add_all([_plan(ctx, *case) for case in cases])
+    db.session.commit()
+    plans = Plan.query.order_by(Plan.id).all()
+    expected = {
+        p.id for p in plans
+        if p.status == 'active' and p.last_updated < NOW - timedelta(days=7)
+        and should_update_plan(p.technologies, p.goal, (NOW - p.created_at).days)['should_update']
+    }
+    assert expected  # The cases include plans to mark
+
+    stats = check_stale_plans(chunk_size=3, now=NOW)
+    db.session.expire_all()
+    marked = {p.id for p in Plan.query.filter_by(status='update_available')}
+    assert marked == expected
+    assert all(db.session.get(Plan, pid).last_updated == NOW for pid in marked)
+    assert stats['checked'] == 6 and stats['marked'] == len(expected)
+    assert stats['signatures'] == 5  # Goals compare case-insensitively
+    assert stats['plans_per_sec'] > 0
+
+    assert check_stale_plans(chunk_size=3, now=NOW)['marked'] == 0
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import tech_monitor
+from tech_monitor import (TRENDING_TECHNOLOGIES, TrendIndex, catalog_changed, get_catalog,
+                          get_trending_technologies, use_catalog)
+
+
+def _scan(catalog, profession=None, min_relevance=75):
+    """Reference: the linear scan the index replaced."""
+    trending = [
+        {'name': tech, 'category': data['category'], 'relevance': data['relevance'],
+         'professions': data.get('professions', [])}
+        for tech, data in catalog.items()
+        if data['relevance'] >= min_relevance
+        and (profession is None or profession.lower() in [p.lower() for p in data.get('professions', [])])
+    ]
+    trending.sort(key=lambda x: x['relevance'], reverse=True)
+    return trending
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(3)
+    professions = ['AI Engineer', 'Web Developer', 'data engineer', 'DevOps Engineer']
+    catalog = {
+        f'Tech {i}': {'category': 'X', 'relevance': rng.randint(50, 100),
+                      'professions': rng.sample(professions, rng.randint(0, 3))}
+        for i in range(500)
+    }
+    index = TrendIndex(catalog)
+    for profession in professions + [None, 'DATA ENGINEER', 'Astronaut', '']:
+        for min_relevance in (0, 50, 75, 80.5, 100, 101):
+            assert index.lookup(profession, min_relevance) == _scan(catalog, profession, min_relevance)
+
+
+def test_builtin_catalog_lookup():
+    assert get_trending_technologies('machine learning engineer', 90) == _scan(
+        get_catalog(), 'Machine Learning Engineer', 90)
+    assert get_trending_technologies(min_relevance=0) == _scan(get_catalog(), None, 0)
+
+
+def test_use_catalog_swaps_snapshot():
+    original = get_catalog()
+    catalog = dict(TRENDING_TECHNOLOGIES)
+    catalog['Zig'] = {'category': 'Language', 'relevance': 99, 'professions': ['Systems Engineer']}
+    try:
+        use_catalog(catalog)
+        del catalog['Zig']  # The snapshot is a copy
+        assert get_trending_technologies('Systems Engineer', 90)[0]['name'] == 'Zig'
+        with pytest.raises(TypeError):
+            get_catalog()['Zig']['relevance'] = 1
+    finally:
+        use_catalog(original)
+    assert 'Zig' not in [t['name'] for t in get_trending_technologies('Systems Engineer', 0)]
+
+
+def test_catalog_change_invalidates_index(monkeypatch):
+    monkeypatch.setattr(tech_monitor, '_catalog', dict(TRENDING_TECHNOLOGIES))
+    get_trending_technologies()
+    get_catalog()['Zig'] = {'category': 'Language', 'relevance': 99, 'professions': ['Systems Engineer']}
+    catalog_changed()
+    assert get_trending_technologies('Systems Engineer', 90)[0]['name'] == 'Zig'
+    assert tech_monitor.get_trend_index() is tech_monitor.get_trend_index()
+    monkeypatch.undo()
+    catalog_changed()
+    assert 'Zig' not in [t['name'] for t in get_trending_technologies('Systems Engineer', 0)]